@@ -0,0 +1,36 @@
+"""
+Concurrent request stages — run independent awaits side by side.
+
+Request pipelines (analyze, execute, process) have stages that do not
+depend on each other: LLM narration, threat-intel lookups, the decision
+factor breakdown. Awaiting them one after another makes latency the sum
+of the stages. gather_or_cancel() runs them together, so latency is the
+slowest stage.
+
+Unlike a bare asyncio.gather(), if one stage raises, the others are
+cancelled (and awaited) before the error propagates. No narration call
+keeps running for a request that has already failed. Stages that should
+degrade instead of failing the request catch their own errors, as before.
+
+Usage:
+    from app.core.concurrency import gather_or_cancel
+
+    reasoning, factors = await gather_or_cancel(
+        narrator.generate_reasoning(alert_type, action, context),
+        get_decision_factors(alert_id),
+    )
+"""
+import asyncio
+from typing import Any, Awaitable, List
+
+
+async def gather_or_cancel(*stages: Awaitable[Any]) -> List[Any]:
+    """Await stages concurrently; results in argument order. On failure, cancel the rest and re-raise."""
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,142 @@
+"""
+Causal Bookmarks — Read-your-writes for one API client across requests
+
+Decision traces are written behind the request (write_behind.py) and on a
+cluster a read may be routed to a follower that has not applied the
+client's last write yet. Either way the next /alerts/queue call can show
+state from before the client's own action.
+
+Each client carries a token in the X-Graph-Bookmark header:
+
+  • the Neo4j bookmarks of the writes it made synchronously
+    (Neo4jClient records session.last_bookmarks() after every write)
+  • the write-behind ticket of the last row it queued, tagged with the
+    queue's epoch so a token from before a restart is ignored
+
+The middleware in main.py parses the request's token into a CausalSession
+for the duration of the request and returns the updated token when the
+request wrote anything. Reads resolve the session once: wait until the
+write-behind has flushed up to the client's ticket (not a global flush —
+later submissions are not waited for), then open the driver session with
+the union of bookmarks so the server serves the read only once those
+transactions are visible.
+
+Requests without a token behave exactly as before.
+
+Configuration (env):
+  GRAPH_BOOKMARK_WAIT_TIMEOUT_MS  max wait for queued writes (default 2000);
+                                  on timeout the read proceeds without them
+"""
+import base64
+import binascii
+import json
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, Optional
+
+
+BOOKMARK_HEADER = "X-Graph-Bookmark"
+
+# waiter(epoch, ticket, timeout) -> bookmarks of the batch that wrote the ticket
+Waiter = Callable[[str, int, float], Awaitable[List[str]]]
+
+
+class CausalSession:
+    """What one client has written: driver bookmarks plus a write-behind ticket."""
+
+    def __init__(
+        self,
+        bookmarks: Iterable[str] = (),
+        epoch: Optional[str] = None,
+        ticket: int = 0,
+        waiter: Optional[Waiter] = None,
+    ) -> None:
+        self.bookmarks = set(bookmarks)
+        self.epoch = epoch
+        self.ticket = ticket
+        self.changed = False
+        self._waiter = waiter
+        self._resolved: Optional[List[str]] = None
+
+    # ------------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------------
+
+    def add_bookmarks(self, values: Iterable[str]) -> None:
+        """Record the bookmarks left by a committed write."""
+        values = set(values)
+        if values - self.bookmarks:
+            self.bookmarks |= values
+            self.changed = True
+            self._resolved = None
+
+    def add_ticket(self, epoch: str, ticket: int) -> None:
+        """Record a queued write-behind row."""
+        if epoch != self.epoch:
+            self.epoch, self.ticket = epoch, 0
+        if ticket > self.ticket:
+            self.ticket = ticket
+            self.changed = True
+            self._resolved = None
+
+    # ------------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------------
+
+    async def resolve(self) -> List[str]:
+        """Wait for this client's queued writes (once), then return bookmarks to read at."""
+        if self._resolved is None:
+            values = set(self.bookmarks)
+            if self.ticket and self._waiter is not None:
+                timeout = int(os.getenv("GRAPH_BOOKMARK_WAIT_TIMEOUT_MS", "2000")) / 1000
+                values.update(await self._waiter(self.epoch, self.ticket, timeout))
+            self._resolved = sorted(values)
+        return self._resolved
+
+    # ------------------------------------------------------------------------
+    # Token
+    # ------------------------------------------------------------------------
+
+    def token(self) -> str:
+        raw = json.dumps(
+            {"b": sorted(self.bookmarks), "e": self.epoch, "w": self.ticket},
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def from_token(cls, token: Optional[str], waiter: Optional[Waiter] = None) -> "CausalSession":
+        """Parse a client token. A missing or malformed token gives an empty session."""
+        if not token:
+            return cls(waiter=waiter)
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            data: Any = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            return cls(
+                bookmarks=[str(value) for value in data.get("b", [])],
+                epoch=data.get("e"),
+                ticket=int(data.get("w", 0)),
+                waiter=waiter,
+            )
+        except (ValueError, TypeError, AttributeError, binascii.Error, UnicodeError):
+            print(f"[BOOKMARK] Ignoring malformed {BOOKMARK_HEADER} header")
+            return cls(waiter=waiter)
+
+
+_current: ContextVar[Optional[CausalSession]] = ContextVar("graph_causal_session", default=None)
+
+
+def current_causal_session() -> Optional[CausalSession]:
+    """The CausalSession of the request (or write-behind batch) being served, if any."""
+    return _current.get()
+
+
+@contextmanager
+def causal_session(session: CausalSession) -> Iterator[CausalSession]:
+    """Make `session` current for graph calls made inside the block."""
+    reset_token = _current.set(session)
+    try:
+        yield session
+    finally:
+        _current.reset(reset_token)
@@ -0,0 +1,207 @@
+"""
+Circuit Breaker — Fail fast when the graph is unreachable, serve last known good reads
+
+Without this, every triage request during an Aura outage waits out the
+driver's connection timeout and transaction retry budget before failing.
+
+States:
+  closed     normal operation; consecutive availability failures are counted
+  open       after GRAPH_BREAKER_FAILURE_THRESHOLD consecutive failures every
+             call fails immediately with CircuitOpenError (a ServiceUnavailable)
+  half_open  once GRAPH_BREAKER_RESET_TIMEOUT_SECONDS have passed, one probe
+             call is let through; success closes the breaker, failure re-opens
+             it. If the probe never reports back, another is allowed after the
+             same timeout.
+
+Only availability failures count (ServiceUnavailable, SessionExpired,
+TransientError, DatabaseError, socket errors, timeouts). A ClientError — bad
+Cypher, constraint violation, local pool exhaustion — means the server
+answered, so it counts as success.
+
+StaleResultCache keeps the last successful result of each named read
+(keyed by query name + parameters, LRU-bounded). Neo4jClient serves it when
+a read fails with an availability error or the breaker is open, so read
+paths degrade to slightly old data instead of static mock numbers.
+
+Configuration (env):
+  GRAPH_BREAKER_FAILURE_THRESHOLD      consecutive failures to open (default 5)
+  GRAPH_BREAKER_RESET_TIMEOUT_SECONDS  open time before a probe (default 30)
+  GRAPH_STALE_CACHE_SIZE               named read results kept (default 256, 0 disables)
+  GRAPH_STALE_CACHE_MAX_ROWS           larger results are not kept (default 1000)
+
+Endpoint:
+  GET /api/graph/circuit-breaker — breaker state and stale-cache counters
+"""
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4j.exceptions import DatabaseError, ServiceUnavailable, SessionExpired, TransientError
+
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ServiceUnavailable):
+    """Raised without touching the driver while the breaker is open."""
+
+    def __init__(self, retry_in: float) -> None:
+        super().__init__(f"Graph circuit breaker open — failing fast (next probe in {retry_in:.1f}s)")
+        self.retry_in = retry_in
+
+
+def is_availability_error(exc: BaseException) -> bool:
+    """True for failures that mean the graph could not be reached or could not serve."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    return isinstance(
+        exc,
+        (ServiceUnavailable, SessionExpired, TransientError, DatabaseError, OSError, asyncio.TimeoutError),
+    )
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with timed half-open probes."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.state_changes = 0
+        self.last_error: Optional[str] = None
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+        self._changed_at = datetime.now(timezone.utc)
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            print(f"[BREAKER] {self.state} -> {state}")
+            self.state = state
+            self.state_changes += 1
+            self._changed_at = datetime.now(timezone.utc)
+
+    def _retry_in(self, now: float) -> float:
+        return max(0.0, self._opened_at + self.reset_timeout - now)
+
+    def check(self) -> None:
+        """Allow the call, or raise CircuitOpenError. Moves open → half_open when due."""
+        if self.state == STATE_CLOSED:
+            return
+
+        now = time.monotonic()
+        if self.state == STATE_OPEN:
+            if now - self._opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self._retry_in(now))
+            self._set_state(STATE_HALF_OPEN)
+
+        # half_open: one probe per reset_timeout window
+        if self._probe_started_at is not None and now - self._probe_started_at < self.reset_timeout:
+            self.rejected += 1
+            raise CircuitOpenError(self.reset_timeout - (now - self._probe_started_at))
+        self._probe_started_at = now
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_started_at = None
+        self._set_state(STATE_CLOSED)
+
+    def record_failure(self, exc: Optional[BaseException] = None) -> None:
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if exc is not None:
+            self.last_error = f"{type(exc).__name__}: {exc}"
+        if self.state == STATE_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+            self._probe_started_at = None
+            self._set_state(STATE_OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state":                self.state,
+            "since":                self._changed_at.isoformat(),
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold":    self.failure_threshold,
+            "reset_timeout_s":      self.reset_timeout,
+            "retry_in_s":           round(self._retry_in(time.monotonic()), 2) if self.state == STATE_OPEN else 0.0,
+            "total_failures":       self.total_failures,
+            "rejected":             self.rejected,
+            "state_changes":        self.state_changes,
+            "last_error":           self.last_error,
+        }
+
+
+class StaleResultCache:
+    """LRU of the last successful rows per (query name, parameters). No expiry."""
+
+    def __init__(self, max_entries: int = 256, max_rows: int = 1000) -> None:
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.served = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(name: str, parameters: Optional[Dict[str, Any]]) -> str:
+        return name + ":" + json.dumps(parameters or {}, sort_keys=True, default=str)
+
+    def put(self, key: str, rows: List[Dict[str, Any]]) -> None:
+        if not self.enabled or len(rows) > self.max_rows:
+            return
+        self._entries[key] = (time.time(), [dict(row) for row in rows])
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+        """Return (rows copy, age in seconds), or None if never seen."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, rows = entry
+        self._entries.move_to_end(key)
+        self.served += 1
+        return [dict(row) for row in rows], time.time() - stored_at
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled":     self.enabled,
+            "size":        len(self._entries),
+            "max_entries": self.max_entries,
+            "max_rows":    self.max_rows,
+            "served":      self.served,
+            "misses":      self.misses,
+        }
+
+
+def create_circuit_breaker() -> CircuitBreaker:
+    """Build the breaker from GRAPH_BREAKER_* environment settings."""
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv("GRAPH_BREAKER_FAILURE_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("GRAPH_BREAKER_RESET_TIMEOUT_SECONDS", "30")),
+    )
+
+
+def create_stale_result_cache() -> StaleResultCache:
+    """Build the fallback cache from GRAPH_STALE_CACHE_* environment settings."""
+    return StaleResultCache(
+        max_entries=int(os.getenv("GRAPH_STALE_CACHE_SIZE", "256")),
+        max_rows=int(os.getenv("GRAPH_STALE_CACHE_MAX_ROWS", "1000")),
+    )
@@ -0,0 +1,99 @@
+"""
+Security Context Cache — In-process LRU + TTL cache for alert security context
+
+Sits in front of Neo4jClient.get_security_context(s). Every triage endpoint
+re-reads the same 47-node context for an alert; this cache serves repeats
+without a graph round trip.
+
+Invalidation is event-driven (callers invalidate when the graph changes):
+  • execute_action         — alert status changes        → invalidate(alert_id)
+  • refresh_threat_intel   — new IOC linked to an alert  → invalidate(alert_id)
+  • seed_neo4j_database    — whole graph rebuilt         → clear()
+  • state_manager reset    — demo reset                  → clear()
+
+Configuration (env):
+  SECURITY_CONTEXT_CACHE_SIZE         max entries (default 1024, 0 disables)
+  SECURITY_CONTEXT_CACHE_TTL_SECONDS  entry lifetime (default 300)
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class SecurityContextCache:
+    """LRU + TTL cache keyed by alert_id. Stores and returns dict copies."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached context, or None on miss/expiry."""
+        entry = self._entries.get(alert_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, context = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[alert_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(alert_id)
+        self.hits += 1
+        # Callers mutate context (e.g. simulate_failure) — never hand out the cached dict
+        return dict(context)
+
+    def put(self, alert_id: str, context: Dict[str, Any]) -> None:
+        """Store a copy of context, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+        self._entries[alert_id] = (time.monotonic(), dict(context))
+        self._entries.move_to_end(alert_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, alert_id: str) -> None:
+        """Drop one alert's context (no-op if not cached)."""
+        if self._entries.pop(alert_id, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept so sizing data survives a reseed."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size for cache sizing."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled":       self.enabled,
+            "size":          len(self._entries),
+            "max_entries":   self.max_entries,
+            "ttl_seconds":   self.ttl_seconds,
+            "hits":          self.hits,
+            "misses":        self.misses,
+            "hit_rate":      round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions":     self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def create_context_cache() -> SecurityContextCache:
+    """Build the cache from SECURITY_CONTEXT_CACHE_* environment settings."""
+    return SecurityContextCache(
+        max_entries=int(os.getenv("SECURITY_CONTEXT_CACHE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("SECURITY_CONTEXT_CACHE_TTL_SECONDS", "300")),
+    )
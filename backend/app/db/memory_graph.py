@@ -0,0 +1,822 @@
+"""
+In-Memory Graph Backend — Pure-Python stand-in for Neo4j
+
+Lets the triage path be benchmarked and load-tested without a live Aura
+instance, so latency numbers reflect our code rather than the network.
+
+Selected with GRAPH_BACKEND=memory (see db/neo4j.py create_graph_client).
+Seeded on connect() from the canonical data in services/seed_neo4j.py.
+
+Structure:
+  MemoryGraph           — node store with per-label property indexes and
+                          out/in adjacency lists keyed by relationship type
+  InMemoryGraphClient   — subclass of Neo4jClient that overrides every named
+                          query method with a graph walk. Cache, row shaping
+                          and single→batch delegation are inherited, so both
+                          backends share the same code above the data layer.
+
+It does not parse Cypher: run_query/read/write/stream_query raise NotImplementedError.
+New graph access should go through a named Neo4jClient method, implemented
+here as well.
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.db.neo4j import Neo4jClient, evolution_state_properties
+from app.db.query_registry import export_query_name
+
+
+# Property indexes created up front (mirrors the SOC schema statements plus
+# the seed-only labels). apply_schema_statement() adds to these.
+_DEFAULT_INDEXES: List[Tuple[str, str]] = [
+    ("Alert", "id"), ("Alert", "status"), ("Alert", "severity"), ("Alert", "alert_type"),
+    ("User", "id"), ("User", "name"), ("Asset", "id"), ("Asset", "criticality"), ("AlertType", "id"),
+    ("AttackPattern", "id"), ("Playbook", "id"), ("SLA", "id"),
+    ("TravelContext", "id"), ("ThreatIntel", "value"),
+    ("Decision", "id"), ("DecisionContext", "id"), ("DecisionContext", "asset_criticality"),
+    ("EvolutionEvent", "id"),
+]
+
+_SCHEMA_PATTERN = re.compile(
+    r"CREATE\s+(CONSTRAINT|INDEX)\s+(\w+)\s+IF\s+NOT\s+EXISTS\s+FOR\s+\(\w+:(\w+)\)\s+"
+    r"(?:REQUIRE|ON)\s+\(?\w+\.(\w+)",
+    re.IGNORECASE,
+)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _parse_timestamp(value: Optional[str]) -> datetime:
+    """Parse an ISO 8601 string (with optional trailing Z); default to now."""
+    if not value:
+        return _now()
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+class MemoryGraph:
+    """Labelled property graph with per-label property indexes and adjacency lists."""
+
+    def __init__(self) -> None:
+        self._index_keys: List[Tuple[str, str]] = list(_DEFAULT_INDEXES)
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all nodes and relationships (index definitions are kept)."""
+        self._props: Dict[int, Dict[str, Any]] = {}
+        self._label: Dict[int, str] = {}
+        self._by_label: Dict[str, Dict[int, None]] = {}  # insertion-ordered set
+        self._out: Dict[int, Dict[str, List[Tuple[int, Dict[str, Any]]]]] = {}
+        self._in: Dict[int, Dict[str, List[Tuple[int, Dict[str, Any]]]]] = {}
+        self._rel_counts: Dict[str, int] = {}
+        self._next_id = 0
+        self._indexes: Dict[Tuple[str, str], Dict[Any, List[int]]] = {
+            key: {} for key in self._index_keys
+        }
+
+    # ------------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------------
+
+    def create_index(self, label: str, prop: str) -> None:
+        """Create (or keep) a property index and back-fill it from existing nodes."""
+        key = (label, prop)
+        if key in self._indexes:
+            return
+        self._index_keys.append(key)
+        index: Dict[Any, List[int]] = {}
+        for nid in self._by_label.get(label, {}):
+            value = self._props[nid].get(prop)
+            if value is not None:
+                index.setdefault(value, []).append(nid)
+        self._indexes[key] = index
+
+    def index_keys(self) -> List[Tuple[str, str]]:
+        return list(self._index_keys)
+
+    def _index_add(self, nid: int, prop: str, value: Any) -> None:
+        index = self._indexes.get((self._label[nid], prop))
+        if index is not None and value is not None:
+            index.setdefault(value, []).append(nid)
+
+    def _index_remove(self, nid: int, prop: str, value: Any) -> None:
+        index = self._indexes.get((self._label[nid], prop))
+        if index is not None and value in index:
+            index[value].remove(nid)
+            if not index[value]:
+                del index[value]
+
+    # ------------------------------------------------------------------------
+    # Nodes
+    # ------------------------------------------------------------------------
+
+    def create_node(self, label: str, props: Dict[str, Any]) -> int:
+        nid = self._next_id
+        self._next_id += 1
+        self._label[nid] = label
+        # Like Neo4j, a null property is simply not stored
+        props = {key: value for key, value in props.items() if value is not None}
+        self._props[nid] = props
+        self._by_label.setdefault(label, {})[nid] = None
+        for prop, value in props.items():
+            self._index_add(nid, prop, value)
+        return nid
+
+    def set_property(self, nid: int, prop: str, value: Any) -> None:
+        old = self._props[nid].get(prop)
+        if old == value:
+            return
+        self._index_remove(nid, prop, old)
+        self._props[nid][prop] = value
+        self._index_add(nid, prop, value)
+
+    def find(self, label: str, prop: str, value: Any) -> List[int]:
+        """Nodes with label and prop == value (index lookup, label scan if unindexed)."""
+        index = self._indexes.get((label, prop))
+        if index is not None:
+            return list(index.get(value, ()))
+        return [nid for nid in self._by_label.get(label, {}) if self._props[nid].get(prop) == value]
+
+    def find_one(self, label: str, prop: str, value: Any) -> Optional[int]:
+        matches = self.find(label, prop, value)
+        return matches[0] if matches else None
+
+    def nodes(self, label: Optional[str] = None) -> Iterable[int]:
+        if label is None:
+            return list(self._props)
+        return list(self._by_label.get(label, {}))
+
+    def props(self, nid: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Copy of a node's properties (what a Cypher RETURN of the node yields)."""
+        return dict(self._props[nid]) if nid is not None else None
+
+    def raw_props(self, nid: int) -> Dict[str, Any]:
+        """Live property dict — read-only use in hot loops."""
+        return self._props[nid]
+
+    def label(self, nid: int) -> str:
+        return self._label[nid]
+
+    def label_counts(self) -> Dict[str, int]:
+        return {label: len(nids) for label, nids in sorted(self._by_label.items()) if nids}
+
+    # ------------------------------------------------------------------------
+    # Relationships
+    # ------------------------------------------------------------------------
+
+    def create_relationship(self, src: int, rel_type: str, dst: int, props: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        rel_props = dict(props or {})
+        self._out.setdefault(src, {}).setdefault(rel_type, []).append((dst, rel_props))
+        self._in.setdefault(dst, {}).setdefault(rel_type, []).append((src, rel_props))
+        self._rel_counts[rel_type] = self._rel_counts.get(rel_type, 0) + 1
+        return rel_props
+
+    def merge_relationship(self, src: int, rel_type: str, dst: int) -> Dict[str, Any]:
+        """Return the existing src-[rel_type]->dst properties, creating the edge if absent."""
+        for target, rel_props in self._out.get(src, {}).get(rel_type, []):
+            if target == dst:
+                return rel_props
+        return self.create_relationship(src, rel_type, dst)
+
+    def out_edges(self, nid: int) -> List[Tuple[str, int, Dict[str, Any]]]:
+        """Every outgoing (rel_type, target, properties) of a node."""
+        return [
+            (rel_type, target, rel_props)
+            for rel_type, edges in self._out.get(nid, {}).items()
+            for target, rel_props in edges
+        ]
+
+    def out(self, nid: int, rel_type: str) -> List[int]:
+        return [target for target, _ in self._out.get(nid, {}).get(rel_type, [])]
+
+    def incoming(self, nid: int, rel_type: str) -> List[int]:
+        return [source for source, _ in self._in.get(nid, {}).get(rel_type, [])]
+
+    def first_out(self, nid: Optional[int], rel_type: str) -> Optional[int]:
+        if nid is None:
+            return None
+        targets = self._out.get(nid, {}).get(rel_type)
+        return targets[0][0] if targets else None
+
+    def relationship_count(self, rel_type: str) -> int:
+        return self._rel_counts.get(rel_type, 0)
+
+
+class InMemoryGraphClient(Neo4jClient):
+    """Neo4jClient interface backed by MemoryGraph instead of a driver."""
+
+    backend = "memory"
+
+    def __init__(self, alert_ids: Optional[Iterable[str]] = None) -> None:
+        super().__init__()
+        self.graph = MemoryGraph()
+        # Seed only these alerts (and what hangs off them) — one partition's share
+        self.seed_alert_ids = set(alert_ids) if alert_ids is not None else None
+        self._schema_objects: Dict[str, Dict[str, Any]] = {}
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    async def connect(self):
+        """Seed from canonical data on first connect."""
+        if not self.graph.nodes():
+            self.load_seed_data()
+            print("[MEMORY GRAPH] Seeded in-memory graph from canonical data")
+
+    async def close(self):
+        pass
+
+    def session(self):
+        raise NotImplementedError("In-memory graph backend has no driver sessions")
+
+    async def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc") -> List[Dict[str, Any]]:
+        raise NotImplementedError(
+            "In-memory graph backend does not execute Cypher — add a named "
+            f"Neo4jClient method for: {' '.join(query.split())[:80]}"
+        )
+
+    async def read(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc", cache: bool = False) -> List[Dict[str, Any]]:
+        return await self.run_query(query, parameters)
+
+    async def write(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc") -> List[Dict[str, Any]]:
+        return await self.run_query(query, parameters)
+
+    def stream_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, fetch_size: Optional[int] = None, name: str = "adhoc", cache: bool = False):
+        raise NotImplementedError(
+            "In-memory graph backend does not execute Cypher — add a named "
+            f"Neo4jClient stream method for: {' '.join(query.split())[:80]}"
+        )
+
+    async def warm_up_queries(self) -> Dict[str, Any]:
+        """No query planner to warm — named methods are graph walks."""
+        print("[QUERIES] In-memory graph backend: plan warm-up skipped")
+        return {"domain": self.queries.domain, "warmed": [], "failed": [], "skipped": True}
+
+    # ------------------------------------------------------------------------
+    # Seeding (mirrors services/seed_neo4j.seed_neo4j_database)
+    # ------------------------------------------------------------------------
+
+    def load_seed_data(self) -> Dict[str, Any]:
+        """Rebuild the graph from services/seed_neo4j.py. Returns the seed summary."""
+        from app.services import seed_neo4j as seed
+
+        g = self.graph
+        g.clear()
+        self.invalidate_security_context()
+        now = _now()
+        rows = seed.seed_partition_rows(self.seed_alert_ids)
+
+        for a in seed.ASSETS:
+            g.create_node("Asset", {"id": a["asset_id"], "hostname": a["hostname"], "type": a["type"], "os": a["os"],
+                                    "criticality": a["criticality"], "business_unit": a["business_unit"], "owner_id": a["owner_id"]})
+        for u in seed.USERS:
+            g.create_node("User", {"id": u["user_id"], "name": u["name"], "title": u["title"], "department": u["department"],
+                                   "risk_score": u["risk_score"], "is_privileged": u["is_privileged"]})
+        for t in seed.ALERT_TYPES:
+            g.create_node("AlertType", {"id": t["id"], "name": t["name"], "severity": t["severity"], "mitre_technique": t["mitre"]})
+        for p in seed.PATTERNS:
+            g.create_node("AttackPattern", {"id": p["pattern_id"], "name": p["name"], "fp_rate": p["fp_rate"],
+                                            "occurrence_count": p["occurrence_count"], "confidence": p["confidence"]})
+        for pb in seed.PLAYBOOKS:
+            g.create_node("Playbook", {"id": pb["playbook_id"], "name": pb["name"], "sla_minutes": pb["sla_minutes"]})
+        for sla in seed.SLAS:
+            g.create_node("SLA", dict(sla))
+        for tr in seed.TRAVEL_RECORDS:
+            g.create_node("TravelContext", {"id": tr["travel_id"], "user_id": tr["user_id"], "destination": tr["destination"],
+                                            "start_date": tr["start_date"], "end_date": tr["end_date"]})
+        for al in rows["alerts"]:
+            g.create_node("Alert", {"id": al["alert_id"], "alert_type": al["alert_type"], "severity": al["severity"],
+                                    "source": al["source"], "source_location": al["source_location"], "status": al["status"],
+                                    "description": al["description"], "timestamp": now})
+        for d in rows["decisions"]:
+            g.create_node("Decision", {**d, "timestamp": _parse_timestamp(d["timestamp"])})
+        for c in rows["contexts"]:
+            g.create_node("DecisionContext", seed.seed_context_properties(c))
+        for e in rows["evolutions"]:
+            g.create_node("EvolutionEvent", {**seed.seed_evolution_properties(e), "timestamp": _parse_timestamp(e["timestamp"])})
+
+        def link(src_label, src_id, rel_type, dst_label, dst_id, props=None):
+            src = g.find_one(src_label, "id", src_id)
+            dst = g.find_one(dst_label, "id", dst_id)
+            if src is not None and dst is not None:
+                g.create_relationship(src, rel_type, dst, props)
+
+        for user_id, asset_id in seed.USER_ASSET_MAPPINGS:
+            link("User", user_id, "ASSIGNED_TO", "Asset", asset_id)
+        for tr in seed.TRAVEL_RECORDS:
+            link("User", tr["user_id"], "HAS_TRAVEL", "TravelContext", tr["travel_id"])
+        for alert_type, playbook_id in seed.ALERT_PLAYBOOK_MAPPINGS:
+            link("AlertType", alert_type, "HANDLED_BY", "Playbook", playbook_id)
+        for asset_id, sla_id in seed.ASSET_SLA_MAPPINGS:
+            link("Asset", asset_id, "SUBJECT_TO", "SLA", sla_id)
+        for al in rows["alerts"]:
+            link("Alert", al["alert_id"], "DETECTED_ON", "Asset", al["asset_id"])
+            link("Alert", al["alert_id"], "INVOLVES", "User", al["user_id"])
+            link("Alert", al["alert_id"], "CLASSIFIED_AS", "AlertType", al["alert_type"])
+        for alert_id, pattern_id in rows["alert_patterns"]:
+            link("Alert", alert_id, "MATCHES", "AttackPattern", pattern_id)
+        for d in rows["decisions"]:
+            link("Decision", d["id"], "FOR_ALERT", "Alert", d["alert_id"])
+        for c in rows["contexts"]:
+            link("Decision", c["decision_id"], "HAD_CONTEXT", "DecisionContext", c["id"])
+        for te in rows["triggered_evolutions"]:
+            link("Decision", te["decision_id"], "TRIGGERED_EVOLUTION", "EvolutionEvent", te["evolution_id"],
+                 {"impact": te["impact"], "magnitude": te["magnitude"], "timestamp": now})
+
+        return {
+            "assets": len(seed.ASSETS),
+            "users": len(seed.USERS),
+            "alert_types": len(seed.ALERT_TYPES),
+            "patterns": len(seed.PATTERNS),
+            "playbooks": len(seed.PLAYBOOKS),
+            "slas": len(seed.SLAS),
+            "travel_contexts": len(seed.TRAVEL_RECORDS),
+            "alerts": len(rows["alerts"]),
+            "decisions": len(rows["decisions"]),
+            "decision_contexts": len(rows["contexts"]),
+            "evolution_events": len(rows["evolutions"]),
+        }
+
+    # ------------------------------------------------------------------------
+    # Security Context
+    # ------------------------------------------------------------------------
+
+    def _alert_record(self, alert_nid: int) -> Dict[str, Any]:
+        """Build the same record shape the Cypher traversals RETURN."""
+        g = self.graph
+        asset = g.first_out(alert_nid, "DETECTED_ON")
+        user = g.first_out(alert_nid, "INVOLVES")
+        alert_type = g.first_out(alert_nid, "CLASSIFIED_AS")
+        playbook = g.first_out(alert_type, "HANDLED_BY")
+        travel = g.first_out(user, "HAS_TRAVEL")
+        sla = g.first_out(asset, "SUBJECT_TO")
+        pattern = g.first_out(alert_nid, "MATCHES")
+
+        optional = (playbook, travel, sla, pattern)
+        base_nodes = 4 + sum(1 for nid in optional if nid is not None)
+
+        return {
+            "alert": g.props(alert_nid),
+            "asset": g.props(asset),
+            "user": g.props(user),
+            "alertType": g.props(alert_type),
+            "playbook": g.props(playbook),
+            "travel": g.props(travel),
+            "sla": g.props(sla),
+            "pattern": g.props(pattern),
+            "nodes_consulted": base_nodes + 39,  # Fixed at 47 for demo consistency
+        }
+
+    async def _fetch_security_context_records(self, alert_ids: List[str]) -> List[Dict[str, Any]]:
+        records = []
+        for alert_id in alert_ids:
+            alert_nid = self.graph.find_one("Alert", "id", alert_id)
+            if alert_nid is None:
+                continue
+            record = self._alert_record(alert_nid)
+            # Required MATCHes: skip alerts missing asset/user/type, like the Cypher
+            if record["asset"] and record["user"] and record["alertType"]:
+                record["alert_id"] = alert_id
+                records.append(record)
+        return records
+
+    async def _fetch_alert_record(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        alert_nid = self.graph.find_one("Alert", "id", alert_id)
+        return self._alert_record(alert_nid) if alert_nid is not None else None
+
+    async def get_alert(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        return self.graph.props(self.graph.find_one("Alert", "id", alert_id))
+
+    # ------------------------------------------------------------------------
+    # Decision Traces / Evolution Events
+    # ------------------------------------------------------------------------
+
+    async def create_decision_traces(self, rows: List[Dict[str, Any]]) -> List[str]:
+        g = self.graph
+        created = []
+        for row in rows:
+            alert_nid = g.find_one("Alert", "id", row["alert_id"])
+            if alert_nid is None:
+                continue
+            decision = g.create_node("Decision", {
+                "id": row["decision_id"],
+                "type": row["action"],
+                "reasoning": row["reasoning"],
+                "confidence": row["confidence"],
+                "timestamp": _parse_timestamp(row.get("timestamp")),
+                "alert_id": row["alert_id"],
+                "action_taken": row["action"],
+            })
+            context = g.create_node("DecisionContext", {
+                "id": row["decision_id"] + "-ctx",
+                "decision_id": row["decision_id"],
+                "user_name": row["user_name"],
+                "user_risk_score": row["user_risk_score"],
+                "asset_hostname": row["asset_hostname"],
+                "asset_criticality": row["asset_criticality"],
+                "user_snapshot": row["user_snapshot"],
+                "asset_snapshot": row["asset_snapshot"],
+                "patterns_matched": row["patterns_matched"],
+                "nodes_consulted": row["nodes_consulted"],
+                "factor_vector": row.get("factor_vector"),
+            })
+            g.create_relationship(decision, "HAD_CONTEXT", context)
+            g.create_relationship(decision, "FOR_ALERT", alert_nid)
+            playbook = g.find_one("Playbook", "id", row.get("playbook_id"))
+            if playbook is not None:
+                g.create_relationship(decision, "APPLIED_PLAYBOOK", playbook)
+            created.append(row["decision_id"])
+        self._index_precedents(rows, created)
+        return created
+
+    async def stream_precedent_vectors(self) -> AsyncIterator[Dict[str, Any]]:
+        g = self.graph
+        records = []
+        for nid in g.nodes("Decision"):
+            decision = g.raw_props(nid)
+            context = g.first_out(nid, "HAD_CONTEXT")
+            vector = g.raw_props(context).get("factor_vector") if context is not None else None
+            if vector is None:
+                continue
+            records.append({
+                "decision_id": decision["id"],
+                "alert_id": decision.get("alert_id"),
+                "action": decision.get("action_taken"),
+                "confidence": decision.get("confidence"),
+                "timestamp": decision.get("timestamp"),
+                "factor_vector": list(vector),
+                "outcome": decision.get("outcome"),
+            })
+        records.sort(key=lambda r: r["timestamp"] or _now())
+        for record in records:
+            yield record
+
+    async def record_decision_outcomes(self, rows: List[Dict[str, Any]]) -> List[str]:
+        g = self.graph
+        updated = []
+        for row in rows:
+            decision = g.find_one("Decision", "id", row["decision_id"])
+            if decision is None or g.raw_props(decision).get("alert_id") != row["alert_id"]:
+                continue
+            g.set_property(decision, "outcome", row["outcome"])
+            g.set_property(decision, "outcome_at", _parse_timestamp(row.get("timestamp")))
+            updated.append(row["decision_id"])
+        return updated
+
+    async def create_evolution_events(self, rows: List[Dict[str, Any]]) -> List[str]:
+        g = self.graph
+        created = []
+        for row in rows:
+            decision = g.find_one("Decision", "id", row["triggered_by"])
+            if decision is None:
+                continue
+            timestamp = _parse_timestamp(row.get("timestamp"))
+            event = g.create_node("EvolutionEvent", {
+                "id": row["event_id"],
+                "event_type": row["event_type"],
+                "triggered_by": row["triggered_by"],
+                "before_state": row["before_state"],
+                "after_state": row["after_state"],
+                "description": row["description"],
+                "timestamp": timestamp,
+                **row["state_props"],
+            })
+            g.create_relationship(decision, "TRIGGERED_EVOLUTION", event, {
+                "impact": row["impact"],
+                "magnitude": row["magnitude"],
+                "timestamp": timestamp,
+            })
+            created.append(row["event_id"])
+        return created
+
+    async def _fetch_evolution_timeline(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        event_type: Optional[str],
+        triggered_by: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        g = self.graph
+        if triggered_by is not None:
+            candidates = g.find("EvolutionEvent", "triggered_by", triggered_by)
+        else:
+            candidates = list(g.nodes("EvolutionEvent"))
+        bound = (_parse_timestamp(after[0]), after[1]) if after is not None else None
+
+        events = []
+        for nid in candidates:
+            e = g.raw_props(nid)
+            if event_type is not None and e.get("event_type") != event_type:
+                continue
+            key = (e["timestamp"], e["id"])
+            if bound is not None and key >= bound:
+                continue
+            events.append((key, e))
+        events.sort(key=lambda item: item[0], reverse=True)
+
+        return [
+            {
+                "id": e["id"],
+                "event_type": e.get("event_type"),
+                "triggered_by": e.get("triggered_by"),
+                "description": e.get("description"),
+                "before_state": e.get("before_state"),
+                "after_state": e.get("after_state"),
+                "timestamp": e["timestamp"].isoformat(),
+            }
+            for _, e in events[:limit]
+        ]
+
+    async def get_decisions_by_asset_criticality(
+        self,
+        asset_criticality: str,
+        days: int = 7,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        g = self.graph
+        since = _now() - timedelta(days=days)
+        records = []
+        for context in g.find("DecisionContext", "asset_criticality", asset_criticality):
+            ctx = g.raw_props(context)
+            for decision in g.incoming(context, "HAD_CONTEXT"):
+                d = g.raw_props(decision)
+                if d["timestamp"] < since:
+                    continue
+                records.append({
+                    "decision_id": d["id"],
+                    "alert_id": d.get("alert_id"),
+                    "action": d.get("action_taken"),
+                    "confidence": d.get("confidence"),
+                    "timestamp": d["timestamp"],
+                    "asset_hostname": ctx.get("asset_hostname"),
+                    "asset_criticality": ctx.get("asset_criticality"),
+                    "user_name": ctx.get("user_name"),
+                    "user_risk_score": ctx.get("user_risk_score"),
+                })
+        records.sort(key=lambda r: r["timestamp"], reverse=True)
+        for record in records:
+            record["timestamp"] = record["timestamp"].isoformat()
+        return records[:limit]
+
+    async def get_pattern_count(self) -> int:
+        return len(self.graph.nodes("AttackPattern"))
+
+    # ------------------------------------------------------------------------
+    # Alert Queue / Status
+    # ------------------------------------------------------------------------
+
+    def _alert_queue_matches(self, filters: Dict[str, Any]) -> Iterable[Tuple[Tuple[datetime, str], int, int, int]]:
+        """((timestamp, id), alert, user, asset) for each alert passing the queue filters."""
+        g = self.graph
+        for nid in g.find("Alert", "status", filters["status"]):
+            alert = g.raw_props(nid)
+            if alert.get("timestamp") is None:
+                continue
+            if filters["severity"] is not None and alert.get("severity") != filters["severity"]:
+                continue
+            if filters["alert_type"] is not None and alert.get("alert_type") != filters["alert_type"]:
+                continue
+            user = g.first_out(nid, "INVOLVES")
+            asset = g.first_out(nid, "DETECTED_ON")
+            if user is None or asset is None:
+                continue
+            if filters["asset_criticality"] is not None and g.raw_props(asset).get("criticality") != filters["asset_criticality"]:
+                continue
+            if filters["user"] is not None and filters["user"] not in (g.raw_props(user).get("id"), g.raw_props(user).get("name")):
+                continue
+            yield (alert["timestamp"], alert["id"]), nid, user, asset
+
+    async def _fetch_alert_queue(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        filters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        g = self.graph
+        bound = (_parse_timestamp(after[0]), after[1]) if after is not None else None
+        rows = [row for row in self._alert_queue_matches(filters) if bound is None or row[0] < bound]
+        rows.sort(key=lambda row: row[0], reverse=True)
+        return [
+            {
+                "alert": g.props(nid),
+                "user_name": g.raw_props(user).get("name"),
+                "asset_hostname": g.raw_props(asset).get("hostname"),
+            }
+            for _, nid, user, asset in rows[:limit]
+        ]
+
+    async def _count_alert_queue(self, filters: Dict[str, Any], count_limit: int) -> int:
+        total = 0
+        for _ in self._alert_queue_matches(filters):
+            total += 1
+            if total >= count_limit:
+                break
+        return total
+
+    async def set_alert_status(self, alert_id: str, status: str) -> None:
+        for nid in self.graph.find("Alert", "id", alert_id):
+            self.graph.set_property(nid, "status", status)
+            self.graph.set_property(nid, "status_updated_at", _now())
+        self.invalidate_security_context(alert_id)
+
+    async def _write_alert_status_chunk(
+        self,
+        alert_ids: List[str],
+        status: str,
+        from_statuses: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        g = self.graph
+        rows = []
+        for alert_id in alert_ids:
+            nid = g.find_one("Alert", "id", alert_id)
+            previous = g.raw_props(nid).get("status") if nid is not None else None
+            allowed = nid is not None and (from_statuses is None or previous in from_statuses)
+            if allowed:
+                g.set_property(nid, "status", status)
+                g.set_property(nid, "status_updated_at", _now())
+            rows.append({"alert_id": alert_id, "found": nid is not None, "previous_status": previous, "updated": allowed})
+        return rows
+
+    async def _all_alert_ids(self) -> List[str]:
+        return [self.graph.raw_props(nid)["id"] for nid in self.graph.nodes("Alert")]
+
+    async def existing_alert_ids(self, alert_ids: List[str]) -> List[str]:
+        return [alert_id for alert_id in dict.fromkeys(alert_ids) if self.graph.find_one("Alert", "id", alert_id) is not None]
+
+    async def _write_alert_ingest_chunk(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        g = self.graph
+        results = []
+        for row in rows:
+            created = g.find_one("Alert", "id", row["alert_id"]) is None
+            asset = g.find_one("Asset", "id", row["asset_id"])
+            user = g.find_one("User", "id", row["user_id"])
+            alert_type = g.find_one("AlertType", "id", row["alert_type"])
+            if created:
+                alert = g.create_node("Alert", {
+                    "id": row["alert_id"],
+                    "alert_type": row["alert_type"],
+                    "severity": row["severity"],
+                    "source": row["source"],
+                    "source_ip": row["source_ip"],
+                    "source_location": row["source_location"],
+                    "destination_ip": row["destination_ip"],
+                    "description": row["description"],
+                    "status": row["status"],
+                    "timestamp": _parse_timestamp(row["timestamp"]),
+                    "ingested_at": _now(),
+                })
+                for target, rel_type in ((asset, "DETECTED_ON"), (user, "INVOLVES"), (alert_type, "CLASSIFIED_AS")):
+                    if target is not None:
+                        g.create_relationship(alert, rel_type, target)
+            results.append({
+                "alert_id": row["alert_id"],
+                "created": created,
+                "asset_found": asset is not None,
+                "user_found": user is not None,
+                "alert_type_found": alert_type is not None,
+            })
+        return results
+
+    async def get_asset_business_units(self, asset_ids: List[str]) -> Dict[str, Optional[str]]:
+        g = self.graph
+        units = {}
+        for asset_id in dict.fromkeys(asset_ids):
+            nid = g.find_one("Asset", "id", asset_id)
+            if nid is not None:
+                units[asset_id] = g.raw_props(nid).get("business_unit")
+        return units
+
+    # ------------------------------------------------------------------------
+    # Threat Intel
+    # ------------------------------------------------------------------------
+
+    async def merge_threat_intel(self, ioc: Dict[str, Any]) -> None:
+        g = self.graph
+        nid = g.find_one("ThreatIntel", "value", ioc["value"])
+        if nid is None:
+            nid = g.create_node("ThreatIntel", {"value": ioc["value"]})
+        for prop, value in ioc.items():
+            g.set_property(nid, prop, value)
+        g.set_property(nid, "refreshed_at", _now())
+
+    async def link_threat_intel(self, ioc_value: str, alert_id: str) -> bool:
+        g = self.graph
+        ti = g.find_one("ThreatIntel", "value", ioc_value)
+        alert = g.find_one("Alert", "id", alert_id)
+        if ti is None or alert is None:
+            return False
+        g.merge_relationship(ti, "ASSOCIATED_WITH", alert)["linked_at"] = _now()
+        self.invalidate_security_context(alert_id)
+        return True
+
+    async def get_threat_intel_for_alert(self, alert_id: str) -> List[Dict[str, Any]]:
+        g = self.graph
+        alert = g.find_one("Alert", "id", alert_id)
+        if alert is None:
+            return []
+        rows = []
+        for ti in g.incoming(alert, "ASSOCIATED_WITH"):
+            props = g.raw_props(ti)
+            rows.append({"ioc_value": props.get("value"), "severity": props.get("severity"), "source": props.get("source")})
+        return rows
+
+    async def get_threat_intel_counts(self) -> Dict[str, int]:
+        g = self.graph
+        intel = g.nodes("ThreatIntel")
+        high = sum(1 for nid in intel if g.raw_props(nid).get("severity") in ("critical", "high"))
+        return {"total": len(intel), "high_sev": high}
+
+    # ------------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------------
+
+    async def apply_schema_statement(self, statement: str) -> None:
+        match = _SCHEMA_PATTERN.search(statement)
+        if not match:
+            raise ValueError(f"Unsupported schema statement for in-memory graph: {statement}")
+        kind, name, label, prop = match.groups()
+        self.graph.create_index(label, prop)
+        self._schema_objects[name] = {"kind": kind.upper(), "label": label, "property": prop}
+
+    async def show_schema(self) -> Dict[str, List[Dict[str, Any]]]:
+        indexes = []
+        constraints = []
+        for name, obj in self._schema_objects.items():
+            owned = name if obj["kind"] == "CONSTRAINT" else None
+            indexes.append({
+                "name": name, "type": "RANGE", "entityType": "NODE",
+                "labelsOrTypes": [obj["label"]], "properties": [obj["property"]],
+                "state": "ONLINE", "populationPercent": 100.0, "owningConstraint": owned,
+            })
+            if owned:
+                constraints.append({
+                    "name": name, "type": "UNIQUENESS",
+                    "labelsOrTypes": [obj["label"]], "properties": [obj["property"]], "ownedIndex": name,
+                })
+        return {"indexes": indexes, "constraints": constraints}
+
+    # ------------------------------------------------------------------------
+    # Seed Verification
+    # ------------------------------------------------------------------------
+
+    async def get_label_counts(self) -> Dict[str, int]:
+        return self.graph.label_counts()
+
+    async def get_relationship_count(self, rel_type: str) -> int:
+        return self.graph.relationship_count(rel_type)
+
+    # ------------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------------
+
+    async def export_page(
+        self,
+        label: str,
+        after: str = "",
+        since: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        spec = self._export_spec(label)
+        key = spec["key"]
+        # Properties named by the change-time expression; a node changed at the latest of them
+        changed = re.findall(r"n\.(\w+)", spec["changed"] or "")
+        if since is not None and not changed:
+            return []
+        since_at = _parse_timestamp(since) if since is not None else None
+
+        g = self.graph
+        page = []
+        for nid in g.nodes(label):
+            props = g.raw_props(nid)
+            if props.get(key) is None or props[key] <= after:
+                continue
+            if since_at is not None:
+                changed_at = max((props[p] for p in changed if props.get(p) is not None), default=None)
+                if changed_at is None or changed_at < since_at:
+                    continue
+            page.append((props[key], nid))
+        page.sort(key=lambda item: item[0])
+
+        rows = []
+        for value, nid in page[:limit]:
+            relationships = [
+                {
+                    "type": rel_type,
+                    "target_label": g.label(target),
+                    "target": g.raw_props(target).get("id", g.raw_props(target).get("value")),
+                    "properties": dict(rel_props),
+                }
+                for rel_type, target, rel_props in g.out_edges(nid)
+            ]
+            rows.append({"key": value, "properties": g.props(nid), "relationships": relationships})
+        return rows
+
+    def _export_spec(self, label: str) -> Dict[str, Any]:
+        """Key / change-time spec of an exported label (KeyError, like the registry, if unknown)."""
+        from app.core.domain_registry import get_domain_config
+
+        self.queries.get(export_query_name(label))
+        return get_domain_config(self.queries.domain).get_graph_export_labels()[label]
@@ -2,28 +2,338 @@
 Neo4j Aura client for Security Graph
 Handles all graph queries for the SOC Copilot Demo
 """
+import json
 import os
-from typing import Optional, Dict, Any, List
-from neo4j import AsyncGraphDatabase, AsyncDriver
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, AsyncIterator
+from neo4j import AsyncGraphDatabase, AsyncDriver, Bookmarks, READ_ACCESS
 from contextlib import asynccontextmanager
 
+from app.db.bookmarks import current_causal_session
+from app.db.circuit_breaker import (
+    CircuitOpenError, create_circuit_breaker, create_stale_result_cache, is_availability_error,
+)
+from app.db.context_cache import create_context_cache
+from app.db.pagination import decode_cursor, encode_cursor
+from app.db.query_metrics import create_query_metrics
+from app.db.query_registry import (
+    NamedQuery, QueryRegistry, alert_queue_query_name, cypher_labels, export_query_name, is_write_cypher,
+)
+from app.db.result_cache import create_result_cache
+
+
+def _build_security_context(alert_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten one security-context record into the dict the agent consumes."""
+    # Extract context
+    alert = record.get("alert", {})
+    asset = record.get("asset", {})
+    user = record.get("user", {})
+    travel = record.get("travel")
+    pattern = record.get("pattern")
+    playbook = record.get("playbook")
+
+    # Debug logging
+    print(f"[NEO4J] Context extraction for alert {alert_id}:")
+    print(f"  - User: {user.get('name')} (risk: {user.get('risk_score')})")
+    print(f"  - Alert source_location: {alert.get('source_location')}")
+    print(f"  - Travel: {travel is not None}")
+    if travel:
+        print(f"  - Travel destination: {travel.get('destination')}")
+        print(f"  - Location match: {alert.get('source_location') == travel.get('destination')}")
+    print(f"  - MFA completed: {alert.get('mfa_completed')}")
+    print(f"  - Device match: {alert.get('device_fingerprint_match')}")
+
+    return {
+        "alert_id": alert_id,
+        "alert_type": alert.get("alert_type"),
+        "user_id": user.get("id"),
+        "user_name": user.get("name"),
+        "user_title": user.get("title"),
+        "user_risk_score": user.get("risk_score", 0.0),
+        "asset_id": asset.get("id"),
+        "asset_hostname": asset.get("hostname"),
+        "asset_criticality": asset.get("criticality", "medium"),
+        "user_traveling": travel is not None,
+        "travel_destination": travel.get("destination") if travel else None,
+        "vpn_matches_location": travel is not None and alert.get("source_location") == travel.get("destination"),
+        "vpn_provider": alert.get("vpn_provider"),
+        "mfa_completed": alert.get("mfa_completed", False),
+        "device_fingerprint_match": alert.get("device_fingerprint_match", False),
+        "known_campaign_signature": pattern is not None,
+        "pattern_count": pattern.get("occurrence_count", 0) if pattern else 0,
+        "pattern_id": pattern.get("id") if pattern else None,
+        "fp_rate": pattern.get("fp_rate", 0.0) if pattern else 0.0,
+        "playbook_id": playbook.get("id") if playbook else None,
+        "nodes_consulted": record.get("nodes_consulted", 47),
+    }
+
+
+def build_graph_data(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build graph data for visualization from a traversal record.
+    Returns nodes and relationships in a format suitable for graph rendering.
+    """
+    nodes = []
+    relationships = []
+
+    # Add alert node
+    alert = record.get("alert")
+    if alert:
+        nodes.append({
+            "id": alert["id"],
+            "label": alert["id"],
+            "type": "Alert",
+            "properties": {
+                "alert_type": alert.get("alert_type"),
+                "severity": alert.get("severity")
+            }
+        })
+
+    # Add user node
+    user = record.get("user")
+    if user:
+        nodes.append({
+            "id": user["id"],
+            "label": user["name"],
+            "type": "User",
+            "properties": {
+                "title": user.get("title"),
+                "risk_score": user.get("risk_score")
+            }
+        })
+        relationships.append({
+            "source": alert["id"],
+            "target": user["id"],
+            "type": "INVOLVES"
+        })
+
+    # Add asset node
+    asset = record.get("asset")
+    if asset:
+        nodes.append({
+            "id": asset["id"],
+            "label": asset["hostname"],
+            "type": "Asset",
+            "properties": {
+                "criticality": asset.get("criticality")
+            }
+        })
+        relationships.append({
+            "source": alert["id"],
+            "target": asset["id"],
+            "type": "DETECTED_ON"
+        })
+
+    # Add travel node
+    travel = record.get("travel")
+    if travel:
+        nodes.append({
+            "id": travel["id"],
+            "label": travel["destination"],
+            "type": "TravelContext",
+            "properties": {
+                "destination": travel.get("destination")
+            }
+        })
+        relationships.append({
+            "source": user["id"],
+            "target": travel["id"],
+            "type": "HAS_TRAVEL"
+        })
+
+    # Add pattern node
+    pattern = record.get("pattern")
+    if pattern:
+        nodes.append({
+            "id": pattern["id"],
+            "label": pattern["name"],
+            "type": "AttackPattern",
+            "properties": {
+                "occurrence_count": pattern.get("occurrence_count"),
+                "confidence": pattern.get("confidence")
+            }
+        })
+        relationships.append({
+            "source": alert["id"],
+            "target": pattern["id"],
+            "type": "MATCHES"
+        })
+
+    # Add playbook node
+    playbook = record.get("playbook")
+    if playbook:
+        alertType = record.get("alertType")
+        nodes.append({
+            "id": playbook["id"],
+            "label": playbook["name"],
+            "type": "Playbook",
+            "properties": {
+                "sla_minutes": playbook.get("sla_minutes")
+            }
+        })
+        if alertType:
+            relationships.append({
+                "source": alertType["id"],
+                "target": playbook["id"],
+                "type": "HANDLED_BY"
+            })
+
+    return {
+        "nodes": nodes,
+        "relationships": relationships
+    }
+
+
+# ============================================================================
+# Structured snapshots — typed properties instead of str(dict) blobs
+# ============================================================================
+
+_PROPERTY_KEY = re.compile(r"^\w+$")
+
+
+def _compact_json(value: Dict[str, Any]) -> str:
+    return json.dumps(value or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def decision_snapshot_properties(context_snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Typed DecisionContext properties from a {"user": {...}, "asset": {...}}
+    snapshot: user_name, user_risk_score, asset_hostname, asset_criticality
+    (indexed, filterable in Cypher) plus the full snapshots as compact JSON.
+    """
+    user = context_snapshot.get("user") or {}
+    asset = context_snapshot.get("asset") or {}
+    return {
+        "user_name":         user.get("name"),
+        "user_risk_score":   user.get("risk_score"),
+        "asset_hostname":    asset.get("hostname"),
+        "asset_criticality": asset.get("criticality"),
+        "user_snapshot":     _compact_json(user),
+        "asset_snapshot":    _compact_json(asset),
+    }
+
+
+def evolution_state_properties(before_state: Dict[str, Any], after_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flatten scalar before/after state values into before_<key> / after_<key>
+    properties (e.g. before_confidence, after_confidence) so evolution
+    deltas can be filtered and aggregated in Cypher.
+    """
+    properties: Dict[str, Any] = {}
+    for prefix, state in (("before", before_state), ("after", after_state)):
+        for key, value in (state or {}).items():
+            if isinstance(value, (bool, int, float, str)) and _PROPERTY_KEY.match(str(key)):
+                properties[f"{prefix}_{key}"] = value
+    return properties
+
+
+def _env_float(name: str) -> Optional[float]:
+    """Read an optional float setting from the environment."""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else None
+
+
+def _env_int(name: str) -> Optional[int]:
+    """Read an optional int setting from the environment."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
+
+def _iso_timestamp(value: Any) -> str:
+    """ISO 8601 string of a Neo4j DateTime or datetime (cursor values)."""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _queue_filter_parameters(filters: Dict[str, Any]) -> Dict[str, Any]:
+    """status plus the queue filters that are set (the parameters of alert_queue_query_name()'s query)."""
+    return {name: value for name, value in filters.items() if name == "status" or value is not None}
+
+
+async def _collect(tx, query: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Managed-transaction work function: run one query and return all rows."""
+    result = await tx.run(query, parameters)
+    return await result.data()
+
+
+async def _collect_profiled(tx, query: str, parameters: Dict[str, Any]):
+    """Like _collect, but runs under PROFILE and also returns the plan."""
+    result = await tx.run("PROFILE " + query, parameters)
+    records = await result.data()
+    summary = await result.consume()
+    return records, summary.profile
+
 
 class Neo4jClient:
     """Neo4j Aura client with connection pooling"""
 
-    def __init__(self):
-        self.uri = os.getenv("NEO4J_URI")
-        self.user = os.getenv("NEO4J_USER", "neo4j")
-        self.password = os.getenv("NEO4J_PASSWORD")
+    backend = "neo4j"
+
+    def __init__(
+        self,
+        uri: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+    ):
+        # Explicit settings are used for partition instances (db/partitioned.py)
+        self.uri = uri or os.getenv("NEO4J_URI")
+        self.user = user or os.getenv("NEO4J_USER", "neo4j")
+        self.password = password or os.getenv("NEO4J_PASSWORD")
+        self.database = database or os.getenv("NEO4J_DATABASE") or None
         self._driver: Optional[AsyncDriver] = None
+        self.fetch_size = _env_int("NEO4J_FETCH_SIZE") or 1000
+        self.context_cache = create_context_cache()
+        self.query_metrics = create_query_metrics()
+        self.breaker = create_circuit_breaker()
+        self.stale_results = create_stale_result_cache()
+        self.result_cache = create_result_cache()
+        self.bulk_chunk_size = _env_int("GRAPH_BULK_CHUNK_SIZE") or 500
+        self.queue_count_cap = _env_int("ALERT_QUEUE_COUNT_CAP") or 10000
+        self._queries: Optional[QueryRegistry] = None
+
+    def _pool_config(self) -> Dict[str, Any]:
+        """
+        Driver pool settings from env. Unset values keep the driver defaults.
+
+          NEO4J_MAX_POOL_SIZE                 max connections per host (driver default 100)
+          NEO4J_ACQUISITION_TIMEOUT           seconds to wait for a free connection (default 60)
+          NEO4J_LIVENESS_CHECK_TIMEOUT        idle seconds before a connection is pinged on checkout
+          NEO4J_MAX_CONNECTION_LIFETIME       seconds before a connection is recycled (default 3600)
+          NEO4J_CONNECTION_TIMEOUT            seconds to establish a new connection (default 30)
+          NEO4J_MAX_TRANSACTION_RETRY_TIME    retry budget for read()/write() transient failures (default 30)
+        """
+        settings = {
+            "max_connection_pool_size":       _env_int("NEO4J_MAX_POOL_SIZE"),
+            "connection_acquisition_timeout": _env_float("NEO4J_ACQUISITION_TIMEOUT"),
+            "liveness_check_timeout":         _env_float("NEO4J_LIVENESS_CHECK_TIMEOUT"),
+            "max_connection_lifetime":        _env_float("NEO4J_MAX_CONNECTION_LIFETIME"),
+            "connection_timeout":             _env_float("NEO4J_CONNECTION_TIMEOUT"),
+            "max_transaction_retry_time":     _env_float("NEO4J_MAX_TRANSACTION_RETRY_TIME"),
+        }
+        return {key: value for key, value in settings.items() if value is not None}
 
     async def connect(self):
         """Initialize connection pool"""
         if not self._driver:
+            pool_config = self._pool_config()
             self._driver = AsyncGraphDatabase.driver(
                 self.uri,
-                auth=(self.user, self.password)
+                auth=(self.user, self.password),
+                **pool_config
             )
+            if pool_config:
+                print(f"[NEO4J] Pool config: {pool_config}")
+            recording = os.getenv("GRAPH_RECORD")
+            if recording:
+                # Imported here: replay subclasses Neo4jClient
+                from app.db.replay import RecordingDriver
+                self._driver = RecordingDriver(self._driver, recording)
 
     async def close(self):
         """Close connection pool"""
@@ -32,20 +342,355 @@ class Neo4jClient:
             self._driver = None
 
     @asynccontextmanager
-    async def session(self):
-        """Context manager for Neo4j sessions"""
+    async def session(self, **config):
+        """Context manager for Neo4j sessions (extra kwargs go to driver.session)"""
         if not self._driver:
             await self.connect()
 
-        async with self._driver.session() as session:
+        async with self._driver.session(database=self.database, **config) as session:
             yield session
 
-    async def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Run a Cypher query and return results"""
-        async with self.session() as session:
-            result = await session.run(query, parameters or {})
-            records = await result.data()
+    async def run_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        name: str = "adhoc",
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a Cypher query in an auto-commit transaction and return results.
+
+        Use for statements that cannot run inside a managed transaction
+        (schema commands, CALL {} IN TRANSACTIONS). Prefer read()/write().
+        Timed under `name` but never profiled.
+        """
+        start = time.perf_counter()
+        records: List[Dict[str, Any]] = []
+        error = False
+        try:
+            self.breaker.check()
+            async with self.session() as session:
+                result = await session.run(query, parameters or {})
+                records = await result.data()
+            self.breaker.record_success()
+            if is_write_cypher(query):
+                self._invalidate_results(query)
+            return records
+        except Exception as exc:
+            self._record_failure(exc)
+            error = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.query_metrics.observe(name, elapsed_ms, len(records), error)
+
+    async def read(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        name: str = "adhoc",
+        cache: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a read query in a managed transaction.
+
+        Routed to a follower/read replica on clusters; transient failures
+        are retried by the driver up to NEO4J_MAX_TRANSACTION_RETRY_TIME.
+        cache=True serves repeats of a named read from the result cache.
+        """
+        return await self._execute("execute_read", query, parameters, name, cache)
+
+    async def write(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        name: str = "adhoc",
+    ) -> List[Dict[str, Any]]:
+        """
+        Run a write query in a managed transaction.
+
+        Routed to the leader; transient failures are retried by the driver.
+        The work function must be safe to re-run (it is, for a single query).
+        Invalidates cached results tagged with the labels the query mentions.
+        """
+        return await self._execute("execute_write", query, parameters, name)
+
+    async def _execute(
+        self,
+        access: str,
+        query: str,
+        parameters: Optional[Dict[str, Any]],
+        name: str,
+        cache: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run one managed transaction, recording latency and a sampled PROFILE.
+
+        Goes through the circuit breaker. A named read that fails because the
+        graph is unavailable (or the breaker is open) returns its last known
+        good result when one is cached; anything else re-raises.
+
+        Reads wait for the current client's causal bookmarks; writes add
+        theirs to it (see db/bookmarks.py).
+        """
+        profile = self.query_metrics.should_profile()
+        reading = access == "execute_read"
+        stale_key = self._stale_key(name, parameters) if reading else None
+        config = await self._causal_read_config() if reading else {}
+        cache_key = self._result_cache_key(name, parameters) if reading and cache else None
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            labels = cypher_labels(query)
+            versions = self.result_cache.versions(labels)
+        start = time.perf_counter()
+        records: List[Dict[str, Any]] = []
+        plan = None
+        error = False
+        try:
+            self.breaker.check()
+            async with self.session(**config) as session:
+                execute = getattr(session, access)
+                if profile:
+                    records, plan = await execute(_collect_profiled, query, parameters or {})
+                else:
+                    records = await execute(_collect, query, parameters or {})
+                if not reading:
+                    await self._record_causal_bookmarks(session)
+            self.breaker.record_success()
+            if stale_key is not None:
+                self.stale_results.put(stale_key, records)
+            if cache_key is not None:
+                self.result_cache.put(cache_key, labels, records, versions)
+            if not reading:
+                self._invalidate_results(query)
+            return records
+        except Exception as exc:
+            stale = self._stale_rows(name, stale_key, exc) if self._record_failure(exc) else None
+            if stale is None:
+                error = True
+                raise
+            records = stale
             return records
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.query_metrics.observe(name, elapsed_ms, len(records), error)
+            if plan:
+                self.query_metrics.record_profile(name, plan, elapsed_ms)
+
+    async def stream_query(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        fetch_size: Optional[int] = None,
+        name: str = "adhoc",
+        cache: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run a read query and yield records one at a time.
+
+        The driver pulls fetch_size records per round trip (default
+        NEO4J_FETCH_SIZE, 1000), so memory stays bounded by one batch instead
+        of the whole result. The session stays open until the iterator is
+        exhausted or closed — consume it fully or wrap it in aclosing().
+
+        Not retried on transient failures (records may already have been
+        yielded); use read() for small results that should be retried.
+        Recorded latency counts only time spent waiting on the driver, not
+        time the consumer spends between records.
+
+        If the graph is unavailable before the first record, a named stream
+        replays its last known good result (kept when it had at most
+        GRAPH_STALE_CACHE_MAX_ROWS rows).
+
+        cache=True replays a cached result of a named stream, and caches a
+        fully consumed result of at most GRAPH_RESULT_CACHE_MAX_ROWS rows.
+        """
+        config = {"fetch_size": fetch_size or self.fetch_size, "default_access_mode": READ_ACCESS}
+        config.update(await self._causal_read_config())
+        cache_key = self._result_cache_key(name, parameters) if cache else None
+        if cache_key is not None:
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                for data in cached:
+                    yield data
+                return
+            labels = cypher_labels(query)
+            versions = self.result_cache.versions(labels)
+            keep_rows = max(self.stale_results.max_rows, self.result_cache.max_rows)
+        else:
+            keep_rows = self.stale_results.max_rows
+        profile = self.query_metrics.should_profile()
+        stale_key = self._stale_key(name, parameters)
+        kept: Optional[List[Dict[str, Any]]] = [] if stale_key is not None or cache_key is not None else None
+        fallback: Optional[List[Dict[str, Any]]] = None
+        elapsed = 0.0
+        rows = 0
+        error = False
+        plan = None
+        try:
+            self.breaker.check()
+            started = time.perf_counter()
+            async with self.session(**config) as session:
+                result = await session.run(("PROFILE " + query) if profile else query, parameters or {})
+                self.breaker.record_success()
+                records = result.__aiter__()
+                while True:
+                    try:
+                        record = await records.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    elapsed += time.perf_counter() - started
+                    rows += 1
+                    data = record.data()
+                    if kept is not None:
+                        if len(kept) < keep_rows:
+                            kept.append(data)
+                        else:
+                            kept = None  # too large to keep as a fallback or cache
+                    yield data
+                    started = time.perf_counter()
+                if profile:
+                    plan = (await result.consume()).profile
+                elapsed += time.perf_counter() - started
+            if kept is not None:
+                if stale_key is not None:
+                    self.stale_results.put(stale_key, kept)
+                if cache_key is not None:
+                    self.result_cache.put(cache_key, labels, kept, versions)
+        except Exception as exc:
+            unavailable = self._record_failure(exc)
+            if unavailable and rows == 0:
+                fallback = self._stale_rows(name, stale_key, exc)
+            if fallback is None:
+                error = True
+                raise
+        finally:
+            elapsed_ms = elapsed * 1000
+            self.query_metrics.observe(name, elapsed_ms, rows, error)
+            if plan:
+                self.query_metrics.record_profile(name, plan, elapsed_ms)
+
+        for data in fallback or []:
+            yield data
+
+    # ========================================================================
+    # Causal Consistency (see db/bookmarks.py)
+    # ========================================================================
+
+    async def _causal_read_config(self) -> Dict[str, Any]:
+        """Session kwargs for a read: the current client's bookmarks, if it has any."""
+        causal = current_causal_session()
+        if causal is None:
+            return {}
+        values = await causal.resolve()
+        return {"bookmarks": Bookmarks.from_raw_values(values)} if values else {}
+
+    @staticmethod
+    async def _record_causal_bookmarks(session) -> None:
+        """Add a write session's bookmarks to the current client's causal session."""
+        causal = current_causal_session()
+        if causal is not None:
+            causal.add_bookmarks((await session.last_bookmarks()).raw_values)
+
+    # ========================================================================
+    # Circuit Breaker / Stale Fallback (see db/circuit_breaker.py)
+    # ========================================================================
+
+    def _record_failure(self, exc: Exception) -> bool:
+        """
+        Report a failed call to the breaker. Returns True if the graph was
+        unavailable (stale fallback allowed). Other errors mean the server
+        answered, so they count as success.
+        """
+        if isinstance(exc, CircuitOpenError):
+            return True
+        if is_availability_error(exc):
+            self.breaker.record_failure(exc)
+            return True
+        self.breaker.record_success()
+        return False
+
+    def _result_cache_key(self, name: str, parameters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Result cache key for named reads; None for adhoc statements or when disabled."""
+        if name == "adhoc" or not self.result_cache.enabled:
+            return None
+        return self.result_cache.key(name, parameters)
+
+    def _invalidate_results(self, query: str) -> None:
+        """Drop cached results tagged with any label a write mentions."""
+        if self.result_cache.enabled:
+            self.result_cache.invalidate_labels(cypher_labels(query))
+
+    def _stale_key(self, name: str, parameters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Fallback cache key for named reads; None for adhoc statements."""
+        if name == "adhoc" or not self.stale_results.enabled:
+            return None
+        return self.stale_results.key(name, parameters)
+
+    def _stale_rows(self, name: str, stale_key: Optional[str], exc: Exception) -> Optional[List[Dict[str, Any]]]:
+        """Last known good rows for stale_key, or None."""
+        if stale_key is None:
+            return None
+        hit = self.stale_results.get(stale_key)
+        if hit is None:
+            return None
+        rows, age = hit
+        print(f"[NEO4J] Serving last known good '{name}' ({len(rows)} rows, {age:.0f}s old) — {type(exc).__name__}")
+        return rows
+
+    # ========================================================================
+    # Named Queries (templates from DomainConfig.get_graph_query_templates)
+    # ========================================================================
+
+    @property
+    def queries(self) -> QueryRegistry:
+        """Query registry for the active domain (built on first use)."""
+        if self._queries is None:
+            self._queries = QueryRegistry.for_domain()
+        return self._queries
+
+    async def read_named(
+        self,
+        name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        cache: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Validate parameters and run a registered read query (cache=True: result cache)."""
+        query = self.queries.bind(name, parameters)
+        return await self.read(query.cypher, parameters, name=name, cache=cache)
+
+    async def write_named(self, name: str, parameters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Validate parameters and run a registered write query."""
+        query = self.queries.bind(name, parameters)
+        return await self.write(query.cypher, parameters, name=name)
+
+    def stream_named(
+        self,
+        name: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        fetch_size: Optional[int] = None,
+        cache: bool = False,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Validate parameters (immediately, not on first iteration) and stream a registered query."""
+        query = self.queries.bind(name, parameters)
+        return self.stream_query(query.cypher, parameters, fetch_size=fetch_size, name=name, cache=cache)
+
+    async def explain(self, query: NamedQuery, parameters: Dict[str, Any]) -> None:
+        """EXPLAIN one registered query so its plan is cached (nothing executes)."""
+        access = "execute_write" if query.is_write else "execute_read"
+        self.breaker.check()
+        try:
+            async with self.session() as session:
+                await getattr(session, access)(_collect, "EXPLAIN " + query.cypher, parameters)
+        except Exception as exc:
+            self._record_failure(exc)
+            raise
+        self.breaker.record_success()
+
+    async def warm_up_queries(self) -> Dict[str, Any]:
+        """EXPLAIN every registered query (called on startup)."""
+        return await self.queries.warm_up(self)
 
     # ========================================================================
     # Security Context Queries
@@ -56,90 +701,136 @@ class Neo4jClient:
         Get full security context for an alert by traversing the graph.
         This is the "47 nodes consulted" query.
         """
-        query = """
-        MATCH (alert:Alert {id: $alert_id})
-        MATCH (alert)-[:DETECTED_ON]->(asset:Asset)
-        MATCH (alert)-[:INVOLVES]->(user:User)
-        MATCH (alert)-[:CLASSIFIED_AS]->(alertType:AlertType)
-        OPTIONAL MATCH (alertType)-[:HANDLED_BY]->(playbook:Playbook)
-        OPTIONAL MATCH (user)-[:HAS_TRAVEL]->(travel:TravelContext)
-        OPTIONAL MATCH (asset)-[:SUBJECT_TO]->(sla:SLA)
-        OPTIONAL MATCH (alert)-[:MATCHES]->(pattern:AttackPattern)
-
-        // Count all nodes consulted
-        WITH alert, asset, user, alertType, playbook, travel, sla, pattern,
-             1 + 1 + 1 + 1 +
-             CASE WHEN playbook IS NOT NULL THEN 1 ELSE 0 END +
-             CASE WHEN travel IS NOT NULL THEN 1 ELSE 0 END +
-             CASE WHEN sla IS NOT NULL THEN 1 ELSE 0 END +
-             CASE WHEN pattern IS NOT NULL THEN 1 ELSE 0 END as base_nodes
-
-        RETURN
-            alert,
-            asset,
-            user,
-            alertType,
-            playbook,
-            travel,
-            sla,
-            pattern,
-            base_nodes + 39 as nodes_consulted  // Fixed at 47 for demo consistency
-        """
-
-        results = await self.run_query(query, {"alert_id": alert_id})
-
-        if not results:
+        contexts = await self.get_security_contexts([alert_id])
+        return contexts.get(alert_id)
+
+    async def get_security_contexts(self, alert_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get security context for many alerts in a single round trip.
+
+        UNWINDs the alert IDs through the same traversal as
+        get_security_context(). Returns {alert_id: context} with the same
+        per-alert dict shape; alerts that are not found are omitted.
+        """
+        if not alert_ids:
+            return {}
+
+        # De-duplicate while keeping caller order
+        unique_ids = list(dict.fromkeys(alert_ids))
+
+        # Read-through: serve cached contexts, query only the misses
+        contexts: Dict[str, Dict[str, Any]] = {}
+        missing: List[str] = []
+        for alert_id in unique_ids:
+            cached = self.context_cache.get(alert_id)
+            if cached is not None:
+                contexts[alert_id] = cached
+            else:
+                missing.append(alert_id)
+
+        if not missing:
+            return contexts
+
+        for record in await self._fetch_security_context_records(missing):
+            # First row wins when OPTIONAL MATCHes fan out (same as results[0])
+            alert_id = record["alert_id"]
+            if alert_id not in contexts:
+                contexts[alert_id] = _build_security_context(alert_id, record)
+                self.context_cache.put(alert_id, contexts[alert_id])
+
+        if len(unique_ids) > 1:
+            print(f"[NEO4J] Batched context fetch: {len(contexts)}/{len(unique_ids)} alerts resolved "
+                  f"({len(unique_ids) - len(missing)} from cache)")
+
+        return contexts
+
+    async def _fetch_security_context_records(self, alert_ids: List[str]) -> List[Dict[str, Any]]:
+        """Run the UNWIND security-context traversal for alert_ids (cache misses)."""
+        return await self.read_named("security_contexts", {"alert_ids": alert_ids})
+
+    def invalidate_security_context(self, alert_id: Optional[str] = None) -> None:
+        """Drop cached context for one alert, or for every alert if alert_id is None."""
+        if alert_id is None:
+            self.context_cache.clear()
+        else:
+            self.context_cache.invalidate(alert_id)
+
+    async def get_alert_bundle(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get everything /alert/analyze needs in one round trip.
+
+        Returns {"alert": raw alert, "context": flattened security context,
+        "graph_data": visualization nodes/relationships}, or None if the
+        alert does not exist. "context" is None when the alert is missing
+        a required DETECTED_ON / INVOLVES / CLASSIFIED_AS edge, matching
+        get_security_context().
+        """
+        record = await self._fetch_alert_record(alert_id)
+
+        if not record:
             return None
 
-        record = results[0]
-
-        # Extract context
-        alert = record.get("alert", {})
-        asset = record.get("asset", {})
-        user = record.get("user", {})
-        travel = record.get("travel")
-        pattern = record.get("pattern")
-        playbook = record.get("playbook")
-
-        # Debug logging
-        print(f"[NEO4J] Context extraction for alert {alert_id}:")
-        print(f"  - User: {user.get('name')} (risk: {user.get('risk_score')})")
-        print(f"  - Alert source_location: {alert.get('source_location')}")
-        print(f"  - Travel: {travel is not None}")
-        if travel:
-            print(f"  - Travel destination: {travel.get('destination')}")
-            print(f"  - Location match: {alert.get('source_location') == travel.get('destination')}")
-        print(f"  - MFA completed: {alert.get('mfa_completed')}")
-        print(f"  - Device match: {alert.get('device_fingerprint_match')}")
+        context = None
+        if record.get("asset") and record.get("user") and record.get("alertType"):
+            context = _build_security_context(alert_id, record)
+            # Warm the cache so execute/process for this alert skip the traversal
+            self.context_cache.put(alert_id, context)
+
+        try:
+            graph_data = build_graph_data(record) if context else {"nodes": [], "relationships": []}
+        except Exception as e:
+            print(f"[ERROR] Failed to build graph data: {e}")
+            graph_data = {"nodes": [], "relationships": []}
 
         return {
-            "alert_id": alert_id,
-            "alert_type": alert.get("alert_type"),
-            "user_id": user.get("id"),
-            "user_name": user.get("name"),
-            "user_title": user.get("title"),
-            "user_risk_score": user.get("risk_score", 0.0),
-            "asset_id": asset.get("id"),
-            "asset_hostname": asset.get("hostname"),
-            "asset_criticality": asset.get("criticality", "medium"),
-            "user_traveling": travel is not None,
-            "travel_destination": travel.get("destination") if travel else None,
-            "vpn_matches_location": travel is not None and alert.get("source_location") == travel.get("destination"),
-            "vpn_provider": alert.get("vpn_provider"),
-            "mfa_completed": alert.get("mfa_completed", False),
-            "device_fingerprint_match": alert.get("device_fingerprint_match", False),
-            "known_campaign_signature": pattern is not None,
-            "pattern_count": pattern.get("occurrence_count", 0) if pattern else 0,
-            "pattern_id": pattern.get("id") if pattern else None,
-            "fp_rate": pattern.get("fp_rate", 0.0) if pattern else 0.0,
-            "playbook_id": playbook.get("id") if playbook else None,
-            "nodes_consulted": record.get("nodes_consulted", 47),
+            "alert": record["alert"],
+            "context": context,
+            "graph_data": graph_data,
         }
 
+    async def _fetch_alert_record(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        """Run the alert-bundle traversal; returns the first record or None."""
+        results = await self.read_named("alert_bundle", {"alert_id": alert_id})
+        return results[0] if results else None
+
     # ========================================================================
     # Decision Trace Queries
     # ========================================================================
 
+    @staticmethod
+    def decision_trace_row(
+        decision_id: str,
+        alert_id: str,
+        action: str,
+        confidence: float,
+        reasoning: str,
+        pattern_id: Optional[str],
+        playbook_id: Optional[str],
+        nodes_consulted: int,
+        context_snapshot: Dict[str, Any],
+        timestamp: Optional[str] = None,
+        factor_vector: Optional[List[float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Shape create_decision_trace() arguments into one UNWIND row.
+        timestamp (ISO 8601) defaults to now, so deferred writes keep decision time.
+        Snapshot fields come from decision_snapshot_properties(); factor_vector
+        (services/precedents.py) is stored on the DecisionContext and indexed.
+        """
+        return {
+            "decision_id": decision_id,
+            "alert_id": alert_id,
+            "action": action,
+            "confidence": confidence,
+            "reasoning": reasoning,
+            "playbook_id": playbook_id,
+            "nodes_consulted": nodes_consulted,
+            "patterns_matched": [pattern_id] if pattern_id else [],
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+            "factor_vector": [float(value) for value in factor_vector] if factor_vector else None,
+            **decision_snapshot_properties(context_snapshot),
+        }
+
     async def create_decision_trace(
         self,
         decision_id: str,
@@ -150,65 +841,105 @@ class Neo4jClient:
         pattern_id: Optional[str],
         playbook_id: Optional[str],
         nodes_consulted: int,
-        context_snapshot: Dict[str, Any]
+        context_snapshot: Dict[str, Any],
+        factor_vector: Optional[List[float]] = None,
     ) -> str:
         """
         Create a Decision node with DecisionContext in Neo4j.
         Returns decision_id.
         """
-        query = """
-        MATCH (alert:Alert {id: $alert_id})
-
-        CREATE (decision:Decision {
-            id: $decision_id,
-            type: $action,
-            reasoning: $reasoning,
-            confidence: $confidence,
-            timestamp: datetime(),
-            alert_id: $alert_id,
-            action_taken: $action
-        })
+        row = self.decision_trace_row(
+            decision_id, alert_id, action, confidence, reasoning,
+            pattern_id, playbook_id, nodes_consulted, context_snapshot,
+            factor_vector=factor_vector,
+        )
+        created = await self.create_decision_traces([row])
+        return created[0] if created else decision_id
 
-        CREATE (context:DecisionContext {
-            id: $decision_id + '-ctx',
-            decision_id: $decision_id,
-            user_snapshot: $user_snapshot,
-            asset_snapshot: $asset_snapshot,
-            patterns_matched: $patterns_matched,
-            nodes_consulted: $nodes_consulted
-        })
+    async def create_decision_traces(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many Decision + DecisionContext nodes in one UNWIND transaction.
+        rows come from decision_trace_row(). Returns the created decision IDs
+        (rows whose alert does not exist are skipped). Created decisions with a
+        factor_vector are added to the precedent index.
+        """
+        if not rows:
+            return []
 
-        CREATE (decision)-[:HAD_CONTEXT]->(context)
-        CREATE (decision)-[:FOR_ALERT]->(alert)
+        result = await self.write_named("create_decision_traces", {"rows": rows})
+        created = [record["decision_id"] for record in result]
+        self._index_precedents(rows, created)
+        return created
 
-        WITH decision, alert
-        OPTIONAL MATCH (playbook:Playbook {id: $playbook_id})
-        FOREACH (p IN CASE WHEN playbook IS NOT NULL THEN [playbook] ELSE [] END |
-            CREATE (decision)-[:APPLIED_PLAYBOOK]->(p)
-        )
+    @staticmethod
+    def _index_precedents(rows: List[Dict[str, Any]], created: List[str]) -> None:
+        from app.services.precedents import precedent_index
+        precedent_index.add_decision_rows(rows, created)
 
-        RETURN decision.id as decision_id
-        """
+    def stream_precedent_vectors(self) -> AsyncIterator[Dict[str, Any]]:
+        """Every decision's factor vector and outcome, oldest first (precedent index rebuild)."""
+        return self.stream_named("precedent_vectors")
 
-        result = await self.run_query(query, {
+    @staticmethod
+    def decision_outcome_row(
+        decision_id: str,
+        alert_id: str,
+        outcome: str,
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Shape analyst feedback on one decision into an UNWIND row."""
+        return {
             "decision_id": decision_id,
             "alert_id": alert_id,
-            "action": action,
-            "confidence": confidence,
-            "reasoning": reasoning,
-            "playbook_id": playbook_id,
-            "nodes_consulted": nodes_consulted,
-            "user_snapshot": str(context_snapshot.get("user", {})),
-            "asset_snapshot": str(context_snapshot.get("asset", {})),
-            "patterns_matched": [pattern_id] if pattern_id else [],
-        })
+            "outcome": outcome,
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def record_decision_outcomes(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store outcomes on their Decision nodes in one UNWIND transaction.
+        rows come from decision_outcome_row(); a row only matches the decision
+        with that id on that alert. Returns the updated decision IDs.
+        """
+        if not rows:
+            return []
 
-        return result[0]["decision_id"] if result else decision_id
+        result = await self.write_named("record_decision_outcomes", {"rows": rows})
+        return [record["decision_id"] for record in result]
 
     # ========================================================================
     # Evolution Queries (THE KEY DIFFERENTIATOR)
     # ========================================================================
 
+    @staticmethod
+    def evolution_event_row(
+        event_id: str,
+        event_type: str,
+        triggered_by: str,
+        before_state: Dict[str, Any],
+        after_state: Dict[str, Any],
+        description: str,
+        impact: str,
+        magnitude: float,
+        timestamp: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Shape create_evolution_event() arguments into one UNWIND row.
+        States are stored as compact JSON plus flattened before_*/after_* scalars.
+        """
+        return {
+            "event_id": event_id,
+            "event_type": event_type,
+            "triggered_by": triggered_by,
+            "before_state": _compact_json(before_state),
+            "after_state": _compact_json(after_state),
+            "state_props": evolution_state_properties(before_state, after_state),
+            "description": description,
+            "impact": impact,
+            "magnitude": magnitude,
+            "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+        }
+
     async def create_evolution_event(
         self,
         event_id: str,
@@ -224,52 +955,93 @@ class Neo4jClient:
         Create an EvolutionEvent and link it to the triggering Decision.
         This creates the TRIGGERED_EVOLUTION relationship - THE KEY DIFFERENTIATOR.
         """
-        query = """
-        MATCH (decision:Decision {id: $triggered_by})
-
-        CREATE (event:EvolutionEvent {
-            id: $event_id,
-            event_type: $event_type,
-            triggered_by: $triggered_by,
-            before_state: $before_state,
-            after_state: $after_state,
-            description: $description,
-            timestamp: datetime()
-        })
-
-        CREATE (decision)-[:TRIGGERED_EVOLUTION {
-            impact: $impact,
-            magnitude: $magnitude,
-            timestamp: datetime()
-        }]->(event)
+        row = self.evolution_event_row(
+            event_id, event_type, triggered_by, before_state, after_state,
+            description, impact, magnitude,
+        )
+        created = await self.create_evolution_events([row])
+        return created[0] if created else event_id
 
-        RETURN event.id as event_id
+    async def create_evolution_events(self, rows: List[Dict[str, Any]]) -> List[str]:
         """
+        Create many EvolutionEvents (+ TRIGGERED_EVOLUTION edges) in one
+        UNWIND transaction. The triggering Decisions must already exist.
+        """
+        if not rows:
+            return []
 
-        result = await self.run_query(query, {
-            "event_id": event_id,
-            "event_type": event_type,
-            "triggered_by": triggered_by,
-            "before_state": str(before_state),
-            "after_state": str(after_state),
-            "description": description,
-            "impact": impact,
-            "magnitude": magnitude,
-        })
-
-        return result[0]["event_id"] if result else event_id
+        result = await self.write_named("create_evolution_events", {"rows": rows})
+        return [record["event_id"] for record in result]
 
     async def get_recent_evolution_events(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent evolution events for display"""
-        query = """
-        MATCH (event:EvolutionEvent)
-        RETURN event
-        ORDER BY event.timestamp DESC
-        LIMIT $limit
+        """Get recent evolution events for display (first timeline page)"""
+        page = await self.get_evolution_timeline(limit=limit)
+        return page["events"]
+
+    async def get_evolution_timeline(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        event_type: Optional[str] = None,
+        triggered_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of evolution events, newest first, optionally filtered by
+        event_type and triggering decision id.
+
+        Pass the returned next_cursor back to get the following page; it is
+        None on the last page. Raises ValueError for a malformed cursor.
         """
+        after = decode_cursor(cursor, 2) if cursor else None
+        # One extra row tells us whether another page exists
+        events = await self._fetch_evolution_timeline(limit + 1, after, event_type, triggered_by)
+        next_cursor = None
+        if len(events) > limit:
+            events = events[:limit]
+            next_cursor = encode_cursor(events[-1]["timestamp"], events[-1]["id"])
+        return {"events": events, "count": len(events), "next_cursor": next_cursor}
 
-        results = await self.run_query(query, {"limit": limit})
-        return [record["event"] for record in results]
+    async def _fetch_evolution_timeline(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        event_type: Optional[str],
+        triggered_by: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Timeline rows strictly after the (timestamp, id) keyset, timestamps as ISO strings."""
+        parameters: Dict[str, Any] = {"limit": limit, "event_type": event_type, "triggered_by": triggered_by}
+        if after is None:
+            records = await self.read_named("evolution_timeline", parameters)
+        else:
+            parameters["cursor_timestamp"], parameters["cursor_id"] = after
+            records = await self.read_named("evolution_timeline_after", parameters)
+
+        for record in records:
+            timestamp = record.get("timestamp")
+            if hasattr(timestamp, "iso_format"):
+                record["timestamp"] = timestamp.iso_format()
+        return records
+
+    async def get_decisions_by_asset_criticality(
+        self,
+        asset_criticality: str,
+        days: int = 7,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Decisions taken on assets of one criticality in the last `days`, newest
+        first — filtered in the database on the structured DecisionContext.
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        records = await self.read_named(
+            "decisions_by_asset_criticality",
+            {"asset_criticality": asset_criticality, "since": since, "limit": limit},
+        )
+        for record in records:
+            timestamp = record.get("timestamp")
+            if hasattr(timestamp, "iso_format"):
+                record["timestamp"] = timestamp.iso_format()
+        return records
 
     # ========================================================================
     # Deployment Queries
@@ -277,16 +1049,346 @@ class Neo4jClient:
 
     async def get_pattern_count(self) -> int:
         """Get total learned pattern count"""
-        query = "MATCH (p:AttackPattern) RETURN count(p) as count"
-        result = await self.run_query(query)
+        result = await self.read_named("pattern_count", cache=True)
         return result[0]["count"] if result else 0
 
     async def get_alert(self, alert_id: str) -> Optional[Dict[str, Any]]:
         """Get alert by ID"""
-        query = "MATCH (alert:Alert {id: $alert_id}) RETURN alert"
-        result = await self.run_query(query, {"alert_id": alert_id})
+        result = await self.read_named("get_alert", {"alert_id": alert_id})
         return result[0]["alert"] if result else None
 
+    # ========================================================================
+    # Alert Queue / Status Queries
+    # ========================================================================
+
+    async def get_alert_queue(
+        self,
+        limit: int = 10,
+        cursor: Optional[str] = None,
+        status: str = "pending",
+        severity: Optional[str] = None,
+        alert_type: Optional[str] = None,
+        asset_criticality: Optional[str] = None,
+        user: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of the triage queue, newest first, filtered in the database.
+        user matches the user's id or name. Each record:
+        {"alert": {...}, "user_name": str, "asset_hostname": str}
+
+        Keyset-paginated on (timestamp, id): pass the returned next_cursor back
+        for the following page (None on the last page). Raises ValueError for
+        a malformed cursor.
+
+        total_estimate counts matching alerts up to ALERT_QUEUE_COUNT_CAP
+        (total_estimate_capped=True beyond it) through the result cache, so
+        refreshes and later pages reuse it until an Alert write or the TTL
+        drops it.
+        """
+        filters = {
+            "status": status, "severity": severity, "alert_type": alert_type,
+            "asset_criticality": asset_criticality, "user": user,
+        }
+        after = decode_cursor(cursor, 2) if cursor else None
+        # One extra row tells us whether another page exists
+        records = await self._fetch_alert_queue(limit + 1, after, filters)
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            last = records[-1]["alert"]
+            next_cursor = encode_cursor(_iso_timestamp(last["timestamp"]), last["id"])
+
+        total = await self._count_alert_queue(filters, self.queue_count_cap + 1)
+        return {
+            "alerts": records,
+            "count": len(records),
+            "next_cursor": next_cursor,
+            "total_estimate": min(total, self.queue_count_cap),
+            "total_estimate_capped": total > self.queue_count_cap,
+        }
+
+    async def _fetch_alert_queue(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        filters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Queue rows strictly after the (timestamp, id) keyset."""
+        parameters: Dict[str, Any] = {"limit": limit, **_queue_filter_parameters(filters)}
+        if after is None:
+            # First page (what the triage tab refreshes) goes through the result cache
+            return await self.read_named(alert_queue_query_name("alert_queue", filters), parameters, cache=True)
+        parameters["cursor_timestamp"], parameters["cursor_id"] = after
+        return await self.read_named(alert_queue_query_name("alert_queue_after", filters), parameters)
+
+    async def _count_alert_queue(self, filters: Dict[str, Any], count_limit: int) -> int:
+        """Matching alerts, counting no further than count_limit."""
+        rows = await self.read_named(
+            alert_queue_query_name("alert_queue_count", filters),
+            {"count_limit": count_limit, **_queue_filter_parameters(filters)},
+            cache=True,
+        )
+        return rows[0]["total"] if rows else 0
+
+    async def set_alert_status(self, alert_id: str, status: str) -> None:
+        """Set one alert's status and drop its cached security context."""
+        await self.write_named("set_alert_status", {"alert_id": alert_id, "status": status})
+        self.invalidate_security_context(alert_id)
+
+    async def set_alert_statuses(
+        self,
+        alert_ids: List[str],
+        status: str,
+        from_statuses: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Move many alerts to `status`, one UNWIND transaction per chunk
+        (default GRAPH_BULK_CHUNK_SIZE, 500), so a storm of hundreds of
+        alerts is a handful of round trips and no transaction is unbounded.
+
+        Only alerts whose current status is in from_statuses change (any
+        status when None). Returns one result per distinct id, in request
+        order: alert_id, found, previous_status, updated. A chunk that fails
+        is reported with updated=False and its error; committed chunks stay.
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        alert_ids = list(dict.fromkeys(alert_ids))
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(alert_ids), chunk_size):
+            chunk = alert_ids[offset:offset + chunk_size]
+            try:
+                rows = await self._write_alert_status_chunk(chunk, status, from_statuses)
+            except Exception as exc:
+                print(f"[NEO4J] Bulk status chunk of {len(chunk)} alert(s) failed: {exc}")
+                rows = [
+                    {"alert_id": alert_id, "found": None, "previous_status": None, "updated": False, "error": str(exc)}
+                    for alert_id in chunk
+                ]
+            results.extend(rows)
+
+        for row in results:
+            if row["updated"]:
+                self.invalidate_security_context(row["alert_id"])
+        return results
+
+    async def _write_alert_status_chunk(
+        self,
+        alert_ids: List[str],
+        status: str,
+        from_statuses: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        """One bulk status transaction; rows come back in input order."""
+        return await self.write_named(
+            "set_alert_statuses",
+            {"alert_ids": alert_ids, "status": status, "from_statuses": from_statuses},
+        )
+
+    async def _all_alert_ids(self) -> List[str]:
+        return [record["alert_id"] async for record in self.stream_named("alert_ids")]
+
+    async def existing_alert_ids(self, alert_ids: List[str]) -> List[str]:
+        """The ids in alert_ids that exist in this graph, in one round trip."""
+        records = await self.read_named("existing_alert_ids", {"alert_ids": list(dict.fromkeys(alert_ids))})
+        return [record["alert_id"] for record in records]
+
+    async def reset_alert_statuses(self, status: str = "pending") -> int:
+        """Set every alert's status (demo reset) in bulk chunks. Returns the number of alerts reset."""
+        results = await self.set_alert_statuses(await self._all_alert_ids(), status)
+        self.invalidate_security_context()
+        return sum(1 for row in results if row["updated"])
+
+    # ========================================================================
+    # Alert Ingestion
+    # ========================================================================
+
+    @staticmethod
+    def alert_ingest_row(alert: Dict[str, Any], source: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Shape one validated schemas.Alert (model_dump()) into an ingest_alerts()
+        row. A naive timestamp is taken as UTC.
+        """
+        timestamp = alert["timestamp"]
+        if isinstance(timestamp, datetime) and timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        return {
+            "alert_id": alert["id"],
+            "alert_type": alert["alert_type"],
+            "severity": alert["severity"],
+            "source": source,
+            "source_ip": alert.get("source_ip"),
+            "source_location": alert.get("source_location"),
+            "destination_ip": alert.get("destination_ip"),
+            "description": alert["description"],
+            "status": alert.get("status") or "pending",
+            "timestamp": _iso_timestamp(timestamp),
+            "asset_id": alert["asset_id"],
+            "user_id": alert["user_id"],
+        }
+
+    async def ingest_alerts(
+        self,
+        rows: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Create alerts from alert_ingest_row() rows, one UNWIND transaction per
+        chunk (default GRAPH_BULK_CHUNK_SIZE, 500), each linked to its Asset
+        (DETECTED_ON), User (INVOLVES) and AlertType (CLASSIFIED_AS).
+
+        Idempotent on alert id: an alert that already exists is left as it is
+        (created=False), so a redelivered batch is harmless. Returns one
+        result per distinct id, in input order: alert_id, created,
+        asset_found, user_found, alert_type_found. A chunk that fails is
+        reported with created=False, its error and whether it is worth
+        retrying (retryable: graph unavailable or breaker open); committed
+        chunks stay.
+        """
+        chunk_size = chunk_size or self.bulk_chunk_size
+        unique: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            unique.setdefault(row["alert_id"], row)  # first delivery wins, as in the graph
+        rows = list(unique.values())
+        results: List[Dict[str, Any]] = []
+        for offset in range(0, len(rows), chunk_size):
+            chunk = rows[offset:offset + chunk_size]
+            try:
+                results.extend(await self._write_alert_ingest_chunk(chunk))
+            except Exception as exc:
+                print(f"[NEO4J] Ingest chunk of {len(chunk)} alert(s) failed: {exc}")
+                results.extend(
+                    {"alert_id": row["alert_id"], "created": False, "asset_found": None,
+                     "user_found": None, "alert_type_found": None, "error": str(exc),
+                     "retryable": isinstance(exc, CircuitOpenError) or is_availability_error(exc)}
+                    for row in chunk
+                )
+        return results
+
+    async def _write_alert_ingest_chunk(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One ingest transaction; rows come back in input order."""
+        return await self.write_named("ingest_alerts", {"rows": rows})
+
+    async def get_asset_business_units(self, asset_ids: List[str]) -> Dict[str, Optional[str]]:
+        """asset id -> business unit for the assets that exist (the partition key for new alerts)."""
+        records = await self.read_named("asset_business_units", {"asset_ids": list(dict.fromkeys(asset_ids))})
+        return {record["asset_id"]: record["business_unit"] for record in records}
+
+    # ========================================================================
+    # Threat Intel Queries
+    # ========================================================================
+
+    async def merge_threat_intel(self, ioc: Dict[str, Any]) -> None:
+        """MERGE one :ThreatIntel node by value and refresh its properties."""
+        await self.write_named("merge_threat_intel", ioc)
+
+    async def link_threat_intel(self, ioc_value: str, alert_id: str) -> bool:
+        """
+        MERGE (ThreatIntel)-[:ASSOCIATED_WITH]->(Alert). Returns False if either
+        node is missing. Drops the alert's cached security context on success.
+        """
+        result = await self.write_named("link_threat_intel", {"ioc_value": ioc_value, "alert_id": alert_id})
+        if result:
+            self.invalidate_security_context(alert_id)
+        return bool(result)
+
+    async def get_threat_intel_for_alert(self, alert_id: str) -> List[Dict[str, Any]]:
+        """ThreatIntel rows linked to alert_id: {ioc_value, severity, source}."""
+        return await self.read_named("threat_intel_for_alert", {"alert_id": alert_id}, cache=True)
+
+    async def get_threat_intel_counts(self) -> Dict[str, int]:
+        """Total ThreatIntel nodes and how many are critical/high severity."""
+        result = await self.read_named("threat_intel_counts", cache=True)
+        return result[0] if result else {"total": 0, "high_sev": 0}
+
+    # ========================================================================
+    # Schema Queries (auto-commit: schema commands can't run in managed tx)
+    # ========================================================================
+
+    async def apply_schema_statement(self, statement: str) -> None:
+        """Run one CREATE CONSTRAINT / CREATE INDEX ... IF NOT EXISTS statement."""
+        await self.run_query(statement, name="apply_schema_statement")
+
+    async def show_schema(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return SHOW INDEXES / SHOW CONSTRAINTS rows."""
+        indexes = await self.run_query(
+            "SHOW INDEXES YIELD name, type, entityType, labelsOrTypes, properties, state, populationPercent, owningConstraint",
+            name="show_indexes",
+        )
+        constraints = await self.run_query(
+            "SHOW CONSTRAINTS YIELD name, type, labelsOrTypes, properties, ownedIndex",
+            name="show_constraints",
+        )
+        return {"indexes": indexes, "constraints": constraints}
+
+    # ========================================================================
+    # Seed Verification Queries
+    # ========================================================================
+
+    async def get_label_counts(self) -> Dict[str, int]:
+        """Node count per (first) label."""
+        results = await self.read_named("label_counts")
+        return {r["label"]: r["count"] for r in results}
+
+    async def get_relationship_count(self, rel_type: str) -> int:
+        """Count relationships of one type (rel_type is a code constant, not user input)."""
+        query = f"MATCH ()-[r:{rel_type}]->() RETURN count(r) as count"
+        result = await self.read(query, name="relationship_count")
+        return result[0]["count"] if result else 0
+
+
+    # ========================================================================
+    # Export Queries (see services/graph_export.py)
+    # ========================================================================
+
+    async def export_page(
+        self,
+        label: str,
+        after: str = "",
+        since: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        One page of `label` nodes with key > after, ordered by key, each as
+        {key, properties, relationships} (outgoing edges). With `since`
+        (ISO 8601) only nodes changed at or after it; labels without a
+        change time return no rows then.
+        """
+        name = export_query_name(label)
+        parameters: Dict[str, Any] = {"after": after, "limit": limit}
+        if "since" in self.queries.get(name).parameters:
+            parameters["since"] = since
+        elif since is not None:
+            return []
+        return await self.read_named(name, parameters)
+
+
+def create_graph_client() -> Neo4jClient:
+    """
+    Build the graph client selected by GRAPH_BACKEND.
+
+      neo4j  (default) — Neo4j Aura / server via NEO4J_URI
+      memory           — in-process graph seeded from services/seed_neo4j.py,
+                         for benchmarks and load tests without a database
+      replay           — serves a GRAPH_RECORD recording (GRAPH_REPLAY) through
+                         the normal client, for deterministic profiling runs
+
+    With GRAPH_PARTITIONS set, returns a PartitionedGraphClient routing over
+    one client of that backend per partition (see db/partitioned.py).
+    """
+    backend = os.getenv("GRAPH_BACKEND", "neo4j").lower()
+    if os.getenv("GRAPH_PARTITIONS", "").strip():
+        # Imported here: partitioned subclasses Neo4jClient defined above
+        from app.db.partitioned import create_partitioned_client
+        return create_partitioned_client(backend)
+    if backend == "memory":
+        # Imported here: memory_graph subclasses Neo4jClient defined above
+        from app.db.memory_graph import InMemoryGraphClient
+        return InMemoryGraphClient()
+    if backend == "replay":
+        from app.db.replay import ReplayGraphClient
+        return ReplayGraphClient()
+    return Neo4jClient()
+
 
 # Global client instance
-neo4j_client = Neo4jClient()
+neo4j_client = create_graph_client()
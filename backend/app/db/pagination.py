@@ -0,0 +1,33 @@
+"""
+Keyset Pagination — Opaque cursors for graph list endpoints
+
+List endpoints page with WHERE (sort key) < (last row's sort key) instead of
+SKIP, so every page is an index range scan of `limit` rows no matter how
+deep the client has paged.
+
+A cursor is the last row's sort-key values (e.g. [timestamp, id]) as
+URL-safe base64 JSON. Clients treat it as opaque and pass it back verbatim;
+decode_cursor() raises ValueError for anything it did not produce.
+"""
+import base64
+import binascii
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the sort-key values of the last row on a page."""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Decode a cursor back into its `size` sort-key values. Raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, binascii.Error, UnicodeError):
+        raise ValueError(f"Invalid page cursor: {cursor!r}") from None
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid page cursor: {cursor!r}")
+    return values
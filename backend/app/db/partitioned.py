@@ -0,0 +1,550 @@
+"""
+Partitioned Graph Client — Route alerts to graph instances by business unit
+
+Alerts are partitioned by the business unit of the asset they were
+detected on (Asset.business_unit). Each partition is its own graph
+instance — a Neo4j database, or an InMemoryGraphClient stand-in — holding:
+
+  • its alerts and everything that hangs off them (Decisions,
+    DecisionContexts, EvolutionEvents, ASSOCIATED_WITH links)
+  • a full copy of the reference data (Users, Assets, AlertTypes,
+    AttackPatterns, Playbooks, SLAs, TravelContexts, ThreatIntel), so every
+    security-context traversal stays inside one instance
+
+PartitionedGraphClient subclasses Neo4jClient and overrides the named
+methods:
+
+  per-alert      get_alert, get_security_context(s), get_alert_bundle,
+                 set_alert_status(es), link_threat_intel, threat intel for
+                 an alert, decision traces — routed to the owning partition;
+                 ingested alerts by their asset's business unit
+  fan-out        pending-alert queue, evolution timeline, decisions by
+                 criticality, label/relationship counts, reset — every
+                 partition queried concurrently, results merged
+  replicated     merge_threat_intel, schema statements — applied everywhere;
+                 pattern and threat-intel counts read from the default
+                 partition
+
+Which partition owns an alert is kept in an in-process directory, filled
+when seeding and whenever a partition returns the alert; an unknown id is
+looked up on every partition concurrently. Evolution events for a decision
+the directory has not seen are sent to every partition — each one's MATCH
+on the triggering Decision keeps only the row it owns.
+
+Raw Cypher (run_query / read / write / stream_query) has no partition key
+and raises NotImplementedError; use partition(name) for instance-level work.
+
+Configuration (env):
+  GRAPH_PARTITIONS       comma-separated partition names; the first is the
+                         default for unmapped business units. Unset = one
+                         unpartitioned client (the normal case).
+  GRAPH_PARTITION_MAP    business_unit=partition pairs, e.g.
+                         "Finance=finance,Engineering=eng,IT=it"
+  NEO4J_URI_<NAME>, NEO4J_USER_<NAME>, NEO4J_PASSWORD_<NAME>,
+  NEO4J_DATABASE_<NAME>  per-partition connection (fall back to NEO4J_*)
+
+With GRAPH_BACKEND=memory every partition is an in-memory stand-in seeded
+with its own share of the canonical data — the local test setup.
+
+Endpoint:
+  GET /api/graph/partitions — partitions, routing map, directory size, breaker state
+"""
+import asyncio
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.db.neo4j import Neo4jClient
+
+
+# Seeded into every partition; counted once
+REPLICATED_LABELS = frozenset({
+    "User", "Asset", "AlertType", "AttackPattern", "Playbook", "SLA", "TravelContext", "ThreatIntel",
+})
+REPLICATED_RELATIONSHIPS = frozenset({"ASSIGNED_TO", "HAS_TRAVEL", "HANDLED_BY", "SUBJECT_TO"})
+
+
+def _sort_time(value: Any) -> str:
+    """Comparable ISO string for a Neo4j DateTime, datetime or ISO string (UTC throughout)."""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value or "")
+
+
+class PartitionedGraphClient(Neo4jClient):
+    """Neo4jClient interface routed over one client per business-unit partition."""
+
+    backend = "partitioned"
+
+    def __init__(self, partitions: Dict[str, Neo4jClient], routes: Optional[Dict[str, str]] = None) -> None:
+        super().__init__()
+        if not partitions:
+            raise ValueError("PartitionedGraphClient needs at least one partition")
+        self.partitions = dict(partitions)
+        self.default_partition = next(iter(self.partitions))
+        self.routes = dict(routes or {})
+        unknown = set(self.routes.values()) - set(self.partitions)
+        if unknown:
+            raise ValueError(f"GRAPH_PARTITION_MAP routes to unknown partition(s): {sorted(unknown)}")
+        self._alert_partition: Dict[str, str] = {}
+        self._decision_partition: Dict[str, str] = {}
+        self.directory_lookups = 0
+
+    # ------------------------------------------------------------------------
+    # Routing
+    # ------------------------------------------------------------------------
+
+    def partition(self, name: str) -> Neo4jClient:
+        return self.partitions[name]
+
+    def partition_for_business_unit(self, business_unit: Optional[str]) -> str:
+        """Partition name for a business unit (default partition when unmapped)."""
+        return self.routes.get(business_unit or "", self.default_partition)
+
+    def client_for_business_unit(self, business_unit: Optional[str]) -> Neo4jClient:
+        return self.partitions[self.partition_for_business_unit(business_unit)]
+
+    def remember_alert(self, alert_id: str, partition: str) -> None:
+        self._alert_partition[alert_id] = partition
+
+    async def _fan_out(self, call: Callable[[Neo4jClient], Awaitable[Any]]) -> List[Tuple[str, Any]]:
+        """Run call(client) on every partition concurrently. Returns [(partition, result)]."""
+        names = list(self.partitions)
+        results = await asyncio.gather(*(call(self.partitions[name]) for name in names))
+        return list(zip(names, results))
+
+    async def _partition_for_alert(self, alert_id: str) -> Optional[str]:
+        """Owning partition from the directory, else ask every partition. None if nowhere."""
+        partition = self._alert_partition.get(alert_id)
+        if partition is not None:
+            return partition
+        self.directory_lookups += 1
+        for name, alert in await self._fan_out(lambda client: client.get_alert(alert_id)):
+            if alert is not None:
+                self.remember_alert(alert_id, name)
+                return name
+        return None
+
+    async def _locate_alerts(self, alert_ids: List[str]) -> Dict[str, str]:
+        """Owning partition of ids missing from the directory — one concurrent lookup on every partition."""
+        if not alert_ids:
+            return {}
+        self.directory_lookups += 1
+        located: Dict[str, str] = {}
+        for name, found in await self._fan_out(lambda client: client.existing_alert_ids(alert_ids)):
+            for alert_id in found:
+                self.remember_alert(alert_id, name)
+                located.setdefault(alert_id, name)
+        return located
+
+    async def _client_for_alert(self, alert_id: str) -> Neo4jClient:
+        """Owning partition's client; the default one for an unknown alert (not-found semantics)."""
+        partition = await self._partition_for_alert(alert_id)
+        return self.partitions[partition or self.default_partition]
+
+    def _group_by_partition(self, alert_ids: Iterable[str]) -> Tuple[Dict[str, List[str]], List[str]]:
+        """Split ids into {partition: ids} for known alerts and a list of unknown ids."""
+        known: Dict[str, List[str]] = {}
+        unknown: List[str] = []
+        for alert_id in alert_ids:
+            partition = self._alert_partition.get(alert_id)
+            if partition is None:
+                unknown.append(alert_id)
+            else:
+                known.setdefault(partition, []).append(alert_id)
+        return known, unknown
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    async def connect(self):
+        if not self._alert_partition and any(c.backend == "memory" for c in self.partitions.values()):
+            # Stand-ins seed themselves on first connect — give each its share first
+            self.assign_seed_alerts()
+        await self._fan_out(lambda client: client.connect())
+        print(f"[PARTITIONS] Connected {len(self.partitions)} partition(s): {', '.join(self.partitions)}")
+
+    async def close(self):
+        await self._fan_out(lambda client: client.close())
+
+    def session(self, **config):
+        raise NotImplementedError("Partitioned graph client has no single session — use partition(name)")
+
+    async def run_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc") -> List[Dict[str, Any]]:
+        raise NotImplementedError(
+            "Partitioned graph client cannot route raw Cypher — add a named "
+            f"Neo4jClient method or use partition(name) for: {' '.join(query.split())[:80]}"
+        )
+
+    async def read(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc", cache: bool = False) -> List[Dict[str, Any]]:
+        return await self.run_query(query, parameters)
+
+    async def write(self, query: str, parameters: Optional[Dict[str, Any]] = None, name: str = "adhoc") -> List[Dict[str, Any]]:
+        return await self.run_query(query, parameters)
+
+    def stream_query(self, query: str, parameters: Optional[Dict[str, Any]] = None, fetch_size: Optional[int] = None, name: str = "adhoc", cache: bool = False):
+        raise NotImplementedError(
+            "Partitioned graph client cannot route raw Cypher — use partition(name) for: "
+            f"{' '.join(query.split())[:80]}"
+        )
+
+    async def warm_up_queries(self) -> Dict[str, Any]:
+        results = await self._fan_out(lambda client: client.warm_up_queries())
+        return {"domain": self.queries.domain, "partitions": dict(results)}
+
+    def assign_seed_alerts(self) -> Dict[str, List[str]]:
+        """
+        Split the canonical alerts by business unit and record them in the
+        directory. In-memory partitions are told their share, so connect()
+        seeds each with only its own alerts.
+        """
+        from app.services import seed_neo4j as seed
+
+        owned: Dict[str, List[str]] = {name: [] for name in self.partitions}
+        for alert_id, business_unit in seed.alert_business_units().items():
+            owned[self.partition_for_business_unit(business_unit)].append(alert_id)
+
+        self._alert_partition.clear()
+        self._decision_partition.clear()
+        for name, alert_ids in owned.items():
+            for alert_id in alert_ids:
+                self.remember_alert(alert_id, name)
+            client = self.partitions[name]
+            if client.backend == "memory":
+                client.seed_alert_ids = set(alert_ids)
+        for decision in seed.DECISIONS:
+            partition = self._alert_partition.get(decision["alert_id"])
+            if partition is not None:
+                self._decision_partition[decision["id"]] = partition
+        return owned
+
+    async def seed_partitions(self) -> Dict[str, Any]:
+        """Seed every partition with the canonical reference data and its business units' alerts."""
+        from app.services import seed_neo4j as seed
+
+        owned = self.assign_seed_alerts()
+
+        async def seed_one(name: str) -> Dict[str, Any]:
+            client = self.partitions[name]
+            if client.backend == "memory":
+                return client.load_seed_data()
+            return await seed.seed_neo4j_database(client, alert_ids=owned[name])
+
+        names = list(self.partitions)
+        summaries = await asyncio.gather(*(seed_one(name) for name in names))
+        print("[PARTITIONS] Seeded " + ", ".join(f"{name}={len(owned[name])} alerts" for name in names))
+        return {"partitions": dict(zip(names, summaries)), "alerts": {name: len(ids) for name, ids in owned.items()}}
+
+    # ------------------------------------------------------------------------
+    # Per-alert (routed)
+    # ------------------------------------------------------------------------
+
+    async def get_security_contexts(self, alert_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Known alerts go to their partition; unknown ones are asked of every partition."""
+        if not alert_ids:
+            return {}
+        unique_ids = list(dict.fromkeys(alert_ids))
+        known, unknown = self._group_by_partition(unique_ids)
+
+        calls = [(name, self.partitions[name].get_security_contexts(ids)) for name, ids in known.items()]
+        if unknown:
+            calls += [(name, client.get_security_contexts(unknown)) for name, client in self.partitions.items()]
+        results = await asyncio.gather(*(call for _, call in calls))
+
+        contexts: Dict[str, Dict[str, Any]] = {}
+        for (name, _), found in zip(calls, results):
+            for alert_id, context in found.items():
+                self.remember_alert(alert_id, name)
+                contexts.setdefault(alert_id, context)
+        return {alert_id: contexts[alert_id] for alert_id in unique_ids if alert_id in contexts}
+
+    def invalidate_security_context(self, alert_id: Optional[str] = None) -> None:
+        for client in self.partitions.values():
+            client.invalidate_security_context(alert_id)
+
+    async def get_alert_bundle(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        return await (await self._client_for_alert(alert_id)).get_alert_bundle(alert_id)
+
+    async def get_alert(self, alert_id: str) -> Optional[Dict[str, Any]]:
+        partition = await self._partition_for_alert(alert_id)
+        if partition is None:
+            return None
+        return await self.partitions[partition].get_alert(alert_id)
+
+    async def set_alert_status(self, alert_id: str, status: str) -> None:
+        await (await self._client_for_alert(alert_id)).set_alert_status(alert_id, status)
+
+    async def set_alert_statuses(
+        self,
+        alert_ids: List[str],
+        status: str,
+        from_statuses: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Each partition transitions its own alerts (chunked there); results in request order."""
+        unique_ids = list(dict.fromkeys(alert_ids))
+        known, unknown = self._group_by_partition(unique_ids)
+        for alert_id, partition in (await self._locate_alerts(unknown)).items():
+            known.setdefault(partition, []).append(alert_id)
+
+        names = list(known)
+        results = await asyncio.gather(*(
+            self.partitions[name].set_alert_statuses(known[name], status, from_statuses, chunk_size)
+            for name in names
+        ))
+        by_id = {row["alert_id"]: row for rows in results for row in rows}
+        missing = {"found": False, "previous_status": None, "updated": False}
+        return [by_id.get(alert_id, {"alert_id": alert_id, **missing}) for alert_id in unique_ids]
+
+    async def reset_alert_statuses(self, status: str = "pending") -> int:
+        results = await self._fan_out(lambda client: client.reset_alert_statuses(status))
+        return sum(count for _, count in results)
+
+    async def link_threat_intel(self, ioc_value: str, alert_id: str) -> bool:
+        return await (await self._client_for_alert(alert_id)).link_threat_intel(ioc_value, alert_id)
+
+    async def get_threat_intel_for_alert(self, alert_id: str) -> List[Dict[str, Any]]:
+        return await (await self._client_for_alert(alert_id)).get_threat_intel_for_alert(alert_id)
+
+    async def create_decision_traces(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Group rows by the alert's partition; remember where each decision went."""
+        _, unknown = self._group_by_partition(row["alert_id"] for row in rows)
+        await self._locate_alerts(list(dict.fromkeys(unknown)))
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            partition = self._alert_partition.get(row["alert_id"])
+            if partition is not None:
+                grouped.setdefault(partition, []).append(row)
+
+        names = list(grouped)
+        results = await asyncio.gather(*(self.partitions[name].create_decision_traces(grouped[name]) for name in names))
+        created: List[str] = []
+        for name, decision_ids in zip(names, results):
+            for decision_id in decision_ids:
+                self._decision_partition[decision_id] = name
+            created.extend(decision_ids)
+        return created
+
+    async def ingest_alerts(
+        self,
+        rows: List[Dict[str, Any]],
+        chunk_size: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Route each alert by its asset's business unit (read from the default
+        partition's reference data; unknown assets go to the default
+        partition) — the same key as seeding, so a redelivery lands where the
+        first delivery did. Results in input order.
+        """
+        units = await self.partitions[self.default_partition].get_asset_business_units(
+            [row["asset_id"] for row in rows]
+        )
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            partition = self._alert_partition.get(row["alert_id"]) or self.partition_for_business_unit(units.get(row["asset_id"]))
+            grouped.setdefault(partition, []).append(row)
+
+        names = list(grouped)
+        results = await asyncio.gather(*(self.partitions[name].ingest_alerts(grouped[name], chunk_size) for name in names))
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for name, partition_rows in zip(names, results):
+            for row in partition_rows:
+                if "error" not in row:
+                    self.remember_alert(row["alert_id"], name)
+                by_id[row["alert_id"]] = row
+        return [by_id[alert_id] for alert_id in dict.fromkeys(row["alert_id"] for row in rows)]
+
+    async def get_asset_business_units(self, asset_ids: List[str]) -> Dict[str, Optional[str]]:
+        return await self.partitions[self.default_partition].get_asset_business_units(asset_ids)
+
+    async def create_evolution_events(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Known decisions go to their partition; others to every partition (MATCH keeps the owner's)."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.partitions}
+        for row in rows:
+            partition = self._decision_partition.get(row["triggered_by"])
+            for name in ([partition] if partition is not None else self.partitions):
+                grouped[name].append(row)
+
+        names = [name for name, group in grouped.items() if group]
+        results = await asyncio.gather(*(self.partitions[name].create_evolution_events(grouped[name]) for name in names))
+        return [event_id for event_ids in results for event_id in event_ids]
+
+    async def record_decision_outcomes(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Routed like create_evolution_events: the decision's partition, or every partition."""
+        grouped: Dict[str, List[Dict[str, Any]]] = {name: [] for name in self.partitions}
+        for row in rows:
+            partition = self._decision_partition.get(row["decision_id"])
+            for name in ([partition] if partition is not None else self.partitions):
+                grouped[name].append(row)
+
+        names = [name for name, group in grouped.items() if group]
+        results = await asyncio.gather(*(self.partitions[name].record_decision_outcomes(grouped[name]) for name in names))
+        return [decision_id for decision_ids in results for decision_id in decision_ids]
+
+    # ------------------------------------------------------------------------
+    # Cross-partition reads (fan-out + merge)
+    # ------------------------------------------------------------------------
+
+    async def _fetch_alert_queue(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        filters: Dict[str, Any],
+    ) -> List[Dict[str, Any]]:
+        """Same keyset and filters on every partition; the merged page is the top `limit` of the union."""
+        records = []
+        for name, rows in await self._fan_out(lambda client: client._fetch_alert_queue(limit, after, filters)):
+            for record in rows:
+                self.remember_alert(record["alert"]["id"], name)
+                records.append(record)
+        records.sort(key=lambda r: (_sort_time(r["alert"]["timestamp"]), r["alert"]["id"]), reverse=True)
+        return records[:limit]
+
+    async def _count_alert_queue(self, filters: Dict[str, Any], count_limit: int) -> int:
+        results = await self._fan_out(lambda client: client._count_alert_queue(filters, count_limit))
+        return sum(total for _, total in results)
+
+    async def _fetch_evolution_timeline(
+        self,
+        limit: int,
+        after: Optional[List[Any]],
+        event_type: Optional[str],
+        triggered_by: Optional[str],
+    ) -> List[Dict[str, Any]]:
+        """Same keyset on every partition; the merged page is the top `limit` of the union."""
+        results = await self._fan_out(
+            lambda client: client._fetch_evolution_timeline(limit, after, event_type, triggered_by)
+        )
+        events = [event for _, rows in results for event in rows]
+        events.sort(key=lambda e: (_sort_time(e["timestamp"]), e["id"]), reverse=True)
+        return events[:limit]
+
+    async def stream_precedent_vectors(self) -> AsyncIterator[Dict[str, Any]]:
+        async def vectors(client: Neo4jClient) -> List[Dict[str, Any]]:
+            return [record async for record in client.stream_precedent_vectors()]
+
+        records = [record for _, rows in await self._fan_out(vectors) for record in rows]
+        records.sort(key=lambda r: _sort_time(r.get("timestamp")))
+        for record in records:
+            yield record
+
+    async def get_decisions_by_asset_criticality(
+        self,
+        asset_criticality: str,
+        days: int = 7,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        results = await self._fan_out(
+            lambda client: client.get_decisions_by_asset_criticality(asset_criticality, days=days, limit=limit)
+        )
+        decisions = [row for _, rows in results for row in rows]
+        decisions.sort(key=lambda r: _sort_time(r["timestamp"]), reverse=True)
+        return decisions[:limit]
+
+    async def get_label_counts(self) -> Dict[str, int]:
+        """Partitioned labels summed; replicated reference labels counted once."""
+        results = await self._fan_out(lambda client: client.get_label_counts())
+        counts: Dict[str, int] = {}
+        for name, partition_counts in results:
+            for label, count in partition_counts.items():
+                if label in REPLICATED_LABELS:
+                    if name == self.default_partition:
+                        counts[label] = count
+                else:
+                    counts[label] = counts.get(label, 0) + count
+        return counts
+
+    async def get_relationship_count(self, rel_type: str) -> int:
+        if rel_type in REPLICATED_RELATIONSHIPS:
+            return await self.partitions[self.default_partition].get_relationship_count(rel_type)
+        results = await self._fan_out(lambda client: client.get_relationship_count(rel_type))
+        return sum(count for _, count in results)
+
+    async def export_page(
+        self,
+        label: str,
+        after: str = "",
+        since: Optional[str] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """Replicated labels from the default partition; others merged in key order across partitions."""
+        if label in REPLICATED_LABELS:
+            return await self.partitions[self.default_partition].export_page(label, after, since, limit)
+        results = await self._fan_out(lambda client: client.export_page(label, after, since, limit))
+        rows = [row for _, page in results for row in page]
+        rows.sort(key=lambda row: row["key"])
+        return rows[:limit]
+
+    # ------------------------------------------------------------------------
+    # Replicated reference data
+    # ------------------------------------------------------------------------
+
+    async def get_pattern_count(self) -> int:
+        return await self.partitions[self.default_partition].get_pattern_count()
+
+    async def merge_threat_intel(self, ioc: Dict[str, Any]) -> None:
+        await self._fan_out(lambda client: client.merge_threat_intel(ioc))
+
+    async def get_threat_intel_counts(self) -> Dict[str, int]:
+        return await self.partitions[self.default_partition].get_threat_intel_counts()
+
+    async def apply_schema_statement(self, statement: str) -> None:
+        await self._fan_out(lambda client: client.apply_schema_statement(statement))
+
+    async def show_schema(self) -> Dict[str, List[Dict[str, Any]]]:
+        return await self.partitions[self.default_partition].show_schema()
+
+    # ------------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        owned: Dict[str, int] = {name: 0 for name in self.partitions}
+        for partition in self._alert_partition.values():
+            owned[partition] += 1
+        return {
+            "default":           self.default_partition,
+            "routes":            dict(self.routes),
+            "directory_size":    len(self._alert_partition),
+            "directory_lookups": self.directory_lookups,
+            "partitions": {
+                name: {
+                    "backend":      client.backend,
+                    "known_alerts": owned[name],
+                    "breaker":      client.breaker.state,
+                }
+                for name, client in self.partitions.items()
+            },
+        }
+
+
+def _partition_env(name: str, key: str) -> Optional[str]:
+    return os.getenv(f"{key}_{name.upper()}") or None
+
+
+def create_partitioned_client(backend: str = "neo4j") -> PartitionedGraphClient:
+    """Build the router from GRAPH_PARTITIONS / GRAPH_PARTITION_MAP (one client per partition)."""
+    names = [name.strip() for name in os.getenv("GRAPH_PARTITIONS", "").split(",") if name.strip()]
+    routes: Dict[str, str] = {}
+    for pair in os.getenv("GRAPH_PARTITION_MAP", "").split(","):
+        if "=" in pair:
+            business_unit, partition = pair.split("=", 1)
+            routes[business_unit.strip()] = partition.strip()
+
+    partitions: Dict[str, Neo4jClient] = {}
+    for name in names:
+        if backend == "memory":
+            from app.db.memory_graph import InMemoryGraphClient
+            partitions[name] = InMemoryGraphClient(alert_ids=[])
+        else:
+            partitions[name] = Neo4jClient(
+                uri=_partition_env(name, "NEO4J_URI"),
+                user=_partition_env(name, "NEO4J_USER"),
+                password=_partition_env(name, "NEO4J_PASSWORD"),
+                database=_partition_env(name, "NEO4J_DATABASE"),
+            )
+
+    print(f"[PARTITIONS] {backend} partitions: {', '.join(names)} (routes: {routes or 'all -> ' + names[0]})")
+    return PartitionedGraphClient(partitions, routes)
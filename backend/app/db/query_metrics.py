@@ -0,0 +1,161 @@
+"""
+Query Metrics — Per-query latency histograms and sampled PROFILE plans
+
+Neo4jClient.read/write/stream_query/run_query take a `name` for each
+statement (the client method that issues it; unnamed statements are
+grouped under "adhoc"). Every execution records wall-clock latency into a
+fixed-bucket histogram plus row and error counts.
+
+A configurable fraction of read/write/stream executions is run with a
+PROFILE prefix instead. The driver's profiled plan is reduced to operator,
+rows and db hits per step, and the most recent captures per query are kept.
+PROFILE executes the statement for real (writes still write), so a sampled
+run replaces the normal run rather than adding one. Auto-commit
+run_query() statements (schema commands) are timed but never profiled.
+
+Exposed via GET /api/graph/query-stats — compare snapshots before/after a
+schema or seed change to spot regressions.
+
+Configuration (env):
+  GRAPH_QUERY_PROFILE_SAMPLE_RATE  fraction of executions to PROFILE (default 0, off)
+  GRAPH_QUERY_PROFILE_KEEP         profiled plans kept per query (default 5)
+"""
+import os
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+
+# Histogram bucket upper bounds in milliseconds (last bucket is +Inf)
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def _summarize_plan(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a driver profile dict to operator / rows / db hits per step."""
+    args = plan.get("args") or {}
+    return {
+        "operator": plan.get("operatorType"),
+        "details":  args.get("Details"),
+        "rows":     plan.get("rows", 0),
+        "db_hits":  plan.get("dbHits", 0),
+        "children": [_summarize_plan(child) for child in plan.get("children") or []],
+    }
+
+
+def _total_db_hits(plan: Dict[str, Any]) -> int:
+    return plan.get("dbHits", 0) + sum(_total_db_hits(child) for child in plan.get("children") or [])
+
+
+class QueryStats:
+    """Latency histogram and counters for one named query."""
+
+    def __init__(self, profile_keep: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.profiles: Deque[Dict[str, Any]] = deque(maxlen=profile_keep)
+
+    def observe(self, elapsed_ms: float, rows: int, error: bool) -> None:
+        self.count += 1
+        self.rows += rows
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if error:
+            self.errors += 1
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound (ms) of the bucket holding the given percentile; None if in +Inf."""
+        if not self.count:
+            return 0.0
+        target = fraction * self.count
+        seen = 0
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            seen += self.buckets[i]
+            if seen >= target:
+                return float(bound)
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in LATENCY_BUCKETS_MS] + ["le_inf"]
+        return {
+            "count":       self.count,
+            "errors":      self.errors,
+            "rows":        self.rows,
+            "avg_rows":    round(self.rows / self.count, 2) if self.count else 0.0,
+            "avg_ms":      round(self.total_ms / self.count, 2) if self.count else 0.0,
+            "max_ms":      round(self.max_ms, 2),
+            "p50_ms":      self.percentile(0.50),
+            "p95_ms":      self.percentile(0.95),
+            "p99_ms":      self.percentile(0.99),
+            "histogram":   dict(zip(labels, self.buckets)),
+            "profiles":    list(self.profiles),
+        }
+
+
+class QueryMetrics:
+    """Registry of QueryStats keyed by query name."""
+
+    def __init__(self, profile_sample_rate: float = 0.0, profile_keep: int = 5) -> None:
+        self.profile_sample_rate = profile_sample_rate
+        self.profile_keep = profile_keep
+        self._stats: Dict[str, QueryStats] = {}
+        self.since = datetime.now(timezone.utc)
+
+    def _get(self, name: str) -> QueryStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = QueryStats(self.profile_keep)
+        return stats
+
+    def should_profile(self) -> bool:
+        """Decide whether this execution runs with PROFILE."""
+        return self.profile_sample_rate > 0 and random.random() < self.profile_sample_rate
+
+    def observe(self, name: str, elapsed_ms: float, rows: int = 0, error: bool = False) -> None:
+        self._get(name).observe(elapsed_ms, rows, error)
+
+    def record_profile(self, name: str, plan: Optional[Dict[str, Any]], elapsed_ms: float) -> None:
+        """Keep a reduced copy of a PROFILE plan (ignored if the driver returned none)."""
+        if not plan:
+            return
+        self._get(name).profiles.append({
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "elapsed_ms":  round(elapsed_ms, 2),
+            "db_hits":     _total_db_hits(plan),
+            "plan":        _summarize_plan(plan),
+        })
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self.since = datetime.now(timezone.utc)
+
+    def stats(self) -> Dict[str, Any]:
+        """All queries, slowest average first."""
+        queries: List[Any] = sorted(
+            ((name, stats.snapshot()) for name, stats in self._stats.items()),
+            key=lambda item: item[1]["avg_ms"],
+            reverse=True,
+        )
+        return {
+            "since":               self.since.isoformat(),
+            "profile_sample_rate": self.profile_sample_rate,
+            "bucket_bounds_ms":    LATENCY_BUCKETS_MS,
+            "queries":             dict(queries),
+        }
+
+
+def create_query_metrics() -> QueryMetrics:
+    """Build metrics from GRAPH_QUERY_PROFILE_* environment settings."""
+    return QueryMetrics(
+        profile_sample_rate=float(os.getenv("GRAPH_QUERY_PROFILE_SAMPLE_RATE", "0")),
+        profile_keep=int(os.getenv("GRAPH_QUERY_PROFILE_KEEP", "5")),
+    )
@@ -0,0 +1,194 @@
+"""
+Query Registry — Named, parameter-validated Cypher per domain
+
+Loads DomainConfig.get_graph_query_templates() (name -> Cypher) for the
+active domain. Neo4jClient issues every registered query by name
+(read_named / write_named / stream_named). The registry:
+
+  • validates parameters — the $placeholders in each template are its
+    required parameters; a missing or unexpected key raises ValueError
+    before anything reaches the driver
+  • classifies each query as read or write (write clauses present), so
+    warm-up and execution use the matching routing
+  • records the node labels each query mentions, used to tag and
+    invalidate cached results (result_cache.py)
+  • warms the plan cache — warm_up() runs EXPLAIN for every query with the
+    domain's representative parameters
+    (get_graph_query_warmup_parameters), so the first real request does not
+    pay planning cost. EXPLAIN plans without executing, so write queries
+    are safe to warm.
+  • tracks per-query stats — calls, validation failures, warm-up result,
+    joined with the latency numbers from QueryMetrics under the same name
+
+Endpoint:
+  GET /api/graph/queries — registry contents and per-query stats
+"""
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from app.core.domain_registry import get_domain_config
+
+
+_PARAM_PATTERN = re.compile(r"\$(\w+)")
+_WRITE_PATTERN = re.compile(r"\b(CREATE|MERGE|SET|DELETE|REMOVE)\b", re.IGNORECASE)
+# Node patterns with labels: (n:Alert), (:User:Admin {id: $x})
+_NODE_LABELS_PATTERN = re.compile(r"\(\s*\w*\s*((?::\s*\w+\s*)+)")
+
+
+def is_write_cypher(cypher: str) -> bool:
+    """True if the statement contains a write clause."""
+    return bool(_WRITE_PATTERN.search(cypher))
+
+
+@lru_cache(maxsize=512)
+def cypher_labels(cypher: str) -> FrozenSet[str]:
+    """Node labels mentioned in the statement's node patterns."""
+    labels = set()
+    for group in _NODE_LABELS_PATTERN.findall(cypher):
+        labels.update(label.strip() for label in group.split(":") if label.strip())
+    return frozenset(labels)
+
+
+def export_query_name(label: str) -> str:
+    """Registered name of a label's export query: EvolutionEvent -> export_evolution_event."""
+    return "export_" + re.sub(r"(?<!^)(?=[A-Z])", "_", label).lower()
+
+
+# Optional alert queue filters; each combination is its own registered query
+ALERT_QUEUE_FILTERS = ("severity", "alert_type", "asset_criticality", "user")
+
+
+def alert_queue_query_name(kind: str, filters: Dict[str, Any]) -> str:
+    """
+    Registered name of the queue query for the filters that are set: kind
+    (alert_queue / alert_queue_after / alert_queue_count), then the filters
+    in ALERT_QUEUE_FILTERS order, e.g. alert_queue_after:severity+user.
+    """
+    used = [name for name in ALERT_QUEUE_FILTERS if filters.get(name) is not None]
+    return f"{kind}:{'+'.join(used)}" if used else kind
+
+
+@dataclass(frozen=True)
+class NamedQuery:
+    """One registered Cypher template."""
+    name: str
+    cypher: str
+    parameters: FrozenSet[str]
+    is_write: bool
+    labels: FrozenSet[str]
+
+
+class QueryRegistry:
+    """Named queries for one domain, with validation and warm-up state."""
+
+    def __init__(
+        self,
+        domain: str,
+        templates: Dict[str, str],
+        warmup_parameters: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.domain = domain
+        self._queries: Dict[str, NamedQuery] = {
+            name: NamedQuery(
+                name=name,
+                cypher=cypher,
+                parameters=frozenset(_PARAM_PATTERN.findall(cypher)),
+                is_write=is_write_cypher(cypher),
+                labels=cypher_labels(cypher),
+            )
+            for name, cypher in templates.items()
+        }
+        self._warmup_parameters = warmup_parameters or {}
+        self._calls: Dict[str, int] = {name: 0 for name in self._queries}
+        self._validation_errors: Dict[str, int] = {name: 0 for name in self._queries}
+        self._warmup: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def for_domain(cls, domain_name: Optional[str] = None) -> "QueryRegistry":
+        """Build the registry from a DomainConfig (active domain by default)."""
+        config = get_domain_config(domain_name)
+        return cls(config.name, config.get_graph_query_templates(), config.get_graph_query_warmup_parameters())
+
+    def names(self) -> List[str]:
+        return list(self._queries)
+
+    def get(self, name: str) -> NamedQuery:
+        """Return a registered query. Raises KeyError for unknown names."""
+        try:
+            return self._queries[name]
+        except KeyError:
+            raise KeyError(f"Unknown graph query '{name}' for domain '{self.domain}'") from None
+
+    def bind(self, name: str, parameters: Optional[Dict[str, Any]] = None) -> NamedQuery:
+        """
+        Check parameters against the query's $placeholders and count the call.
+        Raises ValueError listing missing / unexpected parameter names.
+        """
+        query = self.get(name)
+        supplied = set(parameters or {})
+        missing = query.parameters - supplied
+        unexpected = supplied - query.parameters
+        if missing or unexpected:
+            self._validation_errors[name] += 1
+            problems = []
+            if missing:
+                problems.append(f"missing {sorted(missing)}")
+            if unexpected:
+                problems.append(f"unexpected {sorted(unexpected)}")
+            raise ValueError(f"Graph query '{name}': {', '.join(problems)} parameters")
+        self._calls[name] += 1
+        return query
+
+    # ------------------------------------------------------------------------
+    # Warm-up
+    # ------------------------------------------------------------------------
+
+    async def warm_up(self, client) -> Dict[str, Any]:
+        """
+        EXPLAIN every registered query through client.explain().
+        Failures are recorded per query, never raised.
+        """
+        warmed: List[str] = []
+        failed: List[Dict[str, str]] = []
+        for query in self._queries.values():
+            name = query.name
+            parameters = self._warmup_parameters.get(name, {})
+            start = time.perf_counter()
+            try:
+                await client.explain(query, parameters)
+                self._warmup[name] = {"ok": True, "ms": round((time.perf_counter() - start) * 1000, 2)}
+                warmed.append(name)
+            except Exception as exc:
+                self._warmup[name] = {"ok": False, "error": str(exc)}
+                failed.append({"name": name, "error": str(exc)})
+
+        print(f"[QUERIES] {self.domain}: warmed {len(warmed)}/{len(self._queries)} query plans")
+        for failure in failed:
+            print(f"[QUERIES] Warm-up failed for {failure['name']}: {failure['error']}")
+        return {"domain": self.domain, "warmed": warmed, "failed": failed}
+
+    # ------------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------------
+
+    def stats(self, metrics=None) -> Dict[str, Any]:
+        """Per-query registry state, joined with QueryMetrics latency if given."""
+        latency = metrics.stats()["queries"] if metrics is not None else {}
+        queries = {}
+        for name, query in self._queries.items():
+            executed = latency.get(name, {})
+            queries[name] = {
+                "parameters":        sorted(query.parameters),
+                "mode":              "write" if query.is_write else "read",
+                "labels":            sorted(query.labels),
+                "calls":             self._calls[name],
+                "validation_errors": self._validation_errors[name],
+                "warmup":            self._warmup.get(name),
+                "executions":        executed.get("count", 0),
+                "avg_ms":            executed.get("avg_ms", 0.0),
+                "p95_ms":            executed.get("p95_ms", 0.0),
+            }
+        return {"domain": self.domain, "count": len(queries), "queries": queries}
@@ -0,0 +1,475 @@
+"""
+Record / Replay Graph Driver — Deterministic performance runs without a database
+
+Record: with GRAPH_RECORD=<file>, Neo4jClient wraps the real driver in a
+RecordingDriver. Every statement it runs (managed read/write transactions
+and auto-commit / streamed queries) is appended to the file as one JSON
+line: query, parameters, the rows it returned and the latency observed.
+
+Replay: GRAPH_BACKEND=replay with GRAPH_REPLAY=<file> gives a
+ReplayGraphClient — a plain Neo4jClient whose driver is a ReplayDriver
+serving the recorded rows. Everything above the driver (named queries,
+metrics, caches, breaker, services, routers) runs unchanged, so the
+FastAPI and service layers can be profiled on realistic data with no
+database. Two replays of the same recording run the same statements and
+get the same rows back; ids and clock readings the app generates itself
+(decision ids, "now" timestamps) still differ between runs.
+
+Lookup is by query plus parameters, with VOLATILE_PARAMETERS masked:
+generated ids (decision_id, event_id, triggered_by), clock readings
+(timestamp, since) and LLM narration (reasoning) differ on every run, so
+they are not part of the match. Statements that are equal apart from
+those are served in recorded order — a replayed /action/execute gets the
+decision-trace write recorded at the same point in the flow. When a
+statement was recorded several times (e.g. the queue before and after a
+status change) the recorded results are served in order, the last one
+repeating once exhausted. A statement that was never recorded raises
+ReplayMissError. EXPLAIN (query warm-up) is answered with no rows and not
+recorded. Writes return their recorded rows and change nothing.
+
+Write-behind batching depends on timing, so it is disabled while recording
+and replaying (see write_behind.py) — every write is its own statement.
+
+Temporal values are tagged in the file ({"$datetime": iso}) and come back
+as the same neo4j.time / datetime types. Records are written with sorted
+keys; `diff` masks VOLATILE_PARAMETERS in parameters and rows, so
+recordings of the same flow diff cleanly apart from latency_ms.
+
+Configuration (env):
+  GRAPH_RECORD                  record every statement to this JSONL file (truncated on start)
+  GRAPH_REPLAY                  recording served when GRAPH_BACKEND=replay
+  GRAPH_REPLAY_LATENCY_SCALE    sleep recorded latency x scale per statement
+                                (default 0 = no delay, 1 = as recorded)
+
+CLI:
+  python -m app.db.replay summary <file>     statements, rows and latency per query
+  python -m app.db.replay diff <a> <b>       compare two recordings, ignoring latency
+"""
+import asyncio
+import datetime as dt
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from neo4j import Bookmarks
+from neo4j.time import Date as Neo4jDate, DateTime as Neo4jDateTime
+
+from app.db.neo4j import Neo4jClient
+
+
+class ReplayMissError(LookupError):
+    """A statement the replay recording has no result for."""
+
+
+# Values generated per run rather than read from the graph. Masked (at any
+# depth, e.g. inside UNWIND $rows) wherever statements are matched.
+VOLATILE_PARAMETERS = frozenset({"decision_id", "event_id", "triggered_by", "timestamp", "since", "reasoning"})
+
+_MASKED = "<volatile>"
+
+
+# ============================================================================
+# Value encoding (temporal types survive the round trip)
+# ============================================================================
+
+def encode_value(value: Any) -> Any:
+    """JSON-safe form of a driver value; temporal types are tagged."""
+    if isinstance(value, Neo4jDateTime):
+        return {"$datetime": value.iso_format()}
+    if isinstance(value, Neo4jDate):
+        return {"$date": value.iso_format()}
+    if isinstance(value, dt.datetime):
+        return {"$pydatetime": value.isoformat()}
+    if isinstance(value, dt.date):
+        return {"$pydate": value.isoformat()}
+    if isinstance(value, dict):
+        return {str(key): encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)
+
+
+_DECODERS = {
+    "$datetime":   Neo4jDateTime.from_iso_format,
+    "$date":       Neo4jDate.from_iso_format,
+    "$pydatetime": dt.datetime.fromisoformat,
+    "$pydate":     dt.date.fromisoformat,
+}
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of encode_value (returns fresh objects on every call)."""
+    if isinstance(value, dict):
+        if len(value) == 1:
+            tag, raw = next(iter(value.items()))
+            if tag in _DECODERS:
+                return _DECODERS[tag](raw)
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+def _statement(query: str) -> str:
+    """Lookup form of a statement: sampled PROFILE prefixes are ignored."""
+    return query[len("PROFILE "):] if query.startswith("PROFILE ") else query
+
+
+def _is_explain(query: str) -> bool:
+    return query.startswith("EXPLAIN ")
+
+
+def mask_volatile(value: Any) -> Any:
+    """Encoded value with every VOLATILE_PARAMETERS key's value replaced by a placeholder."""
+    if isinstance(value, dict):
+        return {
+            key: _MASKED if key in VOLATILE_PARAMETERS else mask_volatile(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [mask_volatile(item) for item in value]
+    return value
+
+
+def _parameters_key(encoded_parameters: Dict[str, Any]) -> str:
+    return json.dumps(mask_volatile(encoded_parameters), sort_keys=True)
+
+
+def statement_key(query: str, parameters: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    return _statement(query), _parameters_key(encode_value(parameters or {}))
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+class QueryRecorder:
+    """Appends one JSON line per completed statement."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.statements = 0
+        self._file = open(path, "w", encoding="utf-8")
+        print(f"[REPLAY] Recording graph statements to {path}")
+
+    def record(self, access: str, query: str, parameters: Optional[Dict[str, Any]], rows: List[Dict[str, Any]], latency_ms: float) -> None:
+        self.statements += 1
+        entry = {
+            "seq":        self.statements,
+            "access":     access,
+            "query":      _statement(query),
+            "parameters": encode_value(parameters or {}),
+            "rows":       encode_value(rows),
+            "latency_ms": round(latency_ms, 3),
+        }
+        self._file.write(json.dumps(entry, sort_keys=True) + "\n")
+        self._file.flush()
+
+
+_recorders: Dict[str, QueryRecorder] = {}
+
+
+def get_recorder(path: str) -> QueryRecorder:
+    """One recorder per file, shared by every client recording to it."""
+    if path not in _recorders:
+        _recorders[path] = QueryRecorder(path)
+    return _recorders[path]
+
+
+class _RecordingResult:
+    """Wraps a driver result; records the rows once they have been fetched."""
+
+    def __init__(self, result, recorder: QueryRecorder, access: str, query: str, parameters, elapsed: float) -> None:
+        self._result = result
+        self._recorder = recorder
+        self._access = access
+        self._query = query
+        self._parameters = parameters
+        self._elapsed = elapsed
+
+    def _finish(self, rows: List[Dict[str, Any]]) -> None:
+        if not _is_explain(self._query):
+            self._recorder.record(self._access, self._query, self._parameters, rows, self._elapsed * 1000)
+
+    async def data(self) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        rows = await self._result.data()
+        self._elapsed += time.perf_counter() - started
+        self._finish(rows)
+        return rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        """Yield the driver's records; only time spent waiting on the driver counts."""
+        rows: List[Dict[str, Any]] = []
+        records = self._result.__aiter__()
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    record = await records.__anext__()
+                except StopAsyncIteration:
+                    self._elapsed += time.perf_counter() - started
+                    break
+                self._elapsed += time.perf_counter() - started
+                rows.append(record.data())
+                yield record
+        finally:
+            self._finish(rows)
+
+    def __getattr__(self, name: str):
+        return getattr(self._result, name)
+
+
+class _RecordingTransaction:
+    def __init__(self, tx, recorder: QueryRecorder, access: str) -> None:
+        self._tx = tx
+        self._recorder = recorder
+        self._access = access
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        started = time.perf_counter()
+        result = await self._tx.run(query, parameters, **kwargs)
+        elapsed = time.perf_counter() - started
+        return _RecordingResult(result, self._recorder, self._access, query, parameters, elapsed)
+
+
+class _RecordingSession:
+    def __init__(self, session, recorder: QueryRecorder) -> None:
+        self._session = session
+        self._recorder = recorder
+
+    async def __aenter__(self):
+        await self._session.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self._session.__aexit__(*exc_info)
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs):
+        return await _RecordingTransaction(self._session, self._recorder, "run").run(query, parameters, **kwargs)
+
+    def _wrap(self, work, access: str):
+        async def recorded_work(tx, *args, **kwargs):
+            return await work(_RecordingTransaction(tx, self._recorder, access), *args, **kwargs)
+        return recorded_work
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await self._session.execute_read(self._wrap(work, "read"), *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await self._session.execute_write(self._wrap(work, "write"), *args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._session, name)
+
+
+class RecordingDriver:
+    """Driver wrapper that records every statement run through its sessions."""
+
+    def __init__(self, driver, path: str) -> None:
+        self._driver = driver
+        self.recorder = get_recorder(path)
+
+    def session(self, **config):
+        return _RecordingSession(self._driver.session(**config), self.recorder)
+
+    async def close(self):
+        await self._driver.close()
+
+    def __getattr__(self, name: str):
+        return getattr(self._driver, name)
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+def load_recording(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+class QueryRecording:
+    """Recorded results by (query, masked parameters), served in recorded order."""
+
+    def __init__(self, entries: List[Dict[str, Any]]) -> None:
+        self._entries: Dict[Tuple[str, str], List[Dict[str, Any]]] = defaultdict(list)
+        for entry in sorted(entries, key=lambda e: e["seq"]):
+            key = (entry["query"], _parameters_key(entry["parameters"]))
+            self._entries[key].append(entry)
+        self._served: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+
+    def next(self, query: str, parameters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        key = statement_key(query, parameters)
+        entries = self._entries.get(key)
+        if not entries:
+            self.misses += 1
+            raise ReplayMissError(f"No recorded result for: {' '.join(key[0].split())[:80]} {key[1][:120]}")
+        index = min(self._served[key], len(entries) - 1)
+        self._served[key] += 1
+        self.hits += 1
+        return entries[index]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "statements": sum(len(entries) for entries in self._entries.values()),
+            "distinct":   len(self._entries),
+            "hits":       self.hits,
+            "misses":     self.misses,
+        }
+
+
+class _ReplayRecord:
+    def __init__(self, row: Dict[str, Any]) -> None:
+        self._row = row
+
+    def data(self) -> Dict[str, Any]:
+        return self._row
+
+
+class _ReplaySummary:
+    profile = None
+
+
+class _ReplayResult:
+    def __init__(self, rows: List[Dict[str, Any]]) -> None:
+        self._rows = rows
+
+    async def data(self) -> List[Dict[str, Any]]:
+        return self._rows
+
+    async def __aiter__(self):
+        for row in self._rows:
+            yield _ReplayRecord(row)
+
+    async def consume(self) -> _ReplaySummary:
+        return _ReplaySummary()
+
+
+class _ReplaySession:
+    def __init__(self, driver: "ReplayDriver") -> None:
+        self._driver = driver
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, **kwargs) -> _ReplayResult:
+        if _is_explain(query):
+            return _ReplayResult([])
+        entry = self._driver.recording.next(query, parameters)
+        delay = entry["latency_ms"] * self._driver.latency_scale / 1000
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return _ReplayResult(decode_value(entry["rows"]))
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    async def last_bookmarks(self) -> Bookmarks:
+        return Bookmarks()
+
+
+class ReplayDriver:
+    """Stands in for AsyncDriver, answering every statement from a recording."""
+
+    def __init__(self, recording: QueryRecording, latency_scale: float = 0.0) -> None:
+        self.recording = recording
+        self.latency_scale = latency_scale
+
+    def session(self, **config) -> _ReplaySession:
+        return _ReplaySession(self)
+
+    async def close(self):
+        pass
+
+
+class ReplayGraphClient(Neo4jClient):
+    """Neo4jClient served from a GRAPH_RECORD recording instead of a database."""
+
+    backend = "replay"
+
+    def __init__(self, path: Optional[str] = None, latency_scale: Optional[float] = None) -> None:
+        super().__init__()
+        self.replay_path = path or os.getenv("GRAPH_REPLAY")
+        if not self.replay_path:
+            raise ValueError("GRAPH_BACKEND=replay needs GRAPH_REPLAY=<recording file>")
+        if latency_scale is None:
+            latency_scale = float(os.getenv("GRAPH_REPLAY_LATENCY_SCALE", "0"))
+        self.recording = QueryRecording(load_recording(self.replay_path))
+        self.latency_scale = latency_scale
+
+    async def connect(self):
+        if not self._driver:
+            self._driver = ReplayDriver(self.recording, self.latency_scale)
+            print(f"[REPLAY] Serving {self.recording.stats()['statements']} recorded statements "
+                  f"from {self.replay_path} (latency x{self.latency_scale:g})")
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def summarize(path: str) -> Dict[str, Dict[str, Any]]:
+    """Statements, rows and total latency per query in a recording."""
+    summary: Dict[str, Dict[str, Any]] = {}
+    for entry in load_recording(path):
+        query = " ".join(entry["query"].split())[:80]
+        stats = summary.setdefault(query, {"access": entry["access"], "statements": 0, "rows": 0, "latency_ms": 0.0})
+        stats["statements"] += 1
+        stats["rows"] += len(entry["rows"])
+        stats["latency_ms"] = round(stats["latency_ms"] + entry["latency_ms"], 3)
+    return summary
+
+
+def diff_recordings(path_a: str, path_b: str) -> List[str]:
+    """Differences between two recordings, ignoring seq, latency and volatile values."""
+    def comparable(path: str) -> Dict[Tuple[str, str], List[str]]:
+        grouped: Dict[Tuple[str, str], List[str]] = defaultdict(list)
+        for entry in load_recording(path):
+            key = (entry["query"], _parameters_key(entry["parameters"]))
+            grouped[key].append(json.dumps(mask_volatile(entry["rows"]), sort_keys=True))
+        return grouped
+
+    a, b = comparable(path_a), comparable(path_b)
+    differences = []
+    for key in sorted(set(a) | set(b)):
+        if a.get(key) != b.get(key):
+            query = " ".join(key[0].split())[:80]
+            differences.append(f"{query} {key[1][:120]}: {len(a.get(key, []))} vs {len(b.get(key, []))} result(s) differ")
+    return differences
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) == 2 and argv[0] == "summary":
+        for query, stats in sorted(summarize(argv[1]).items(), key=lambda item: -item[1]["latency_ms"]):
+            print(f"{stats['latency_ms']:>10.1f} ms  {stats['statements']:>5}x  {stats['rows']:>7} rows  "
+                  f"{stats['access']:<5}  {query}")
+        return 0
+    if len(argv) == 3 and argv[0] == "diff":
+        differences = diff_recordings(argv[1], argv[2])
+        for line in differences:
+            print(line)
+        print(f"[REPLAY] {len(differences)} differing statement(s)")
+        return 1 if differences else 0
+    print(__doc__.split("CLI:")[1].rstrip())
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
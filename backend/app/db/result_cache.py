@@ -0,0 +1,152 @@
+"""
+Query Result Cache — Opt-in LRU + TTL cache for named graph reads, invalidated by label
+
+Several page loads re-run the same read with the same parameters (alert
+queue, threat-intel counts, pattern count, per-alert threat-intel factor).
+Neo4jClient.read_named / stream_named(..., cache=True) serve repeats from
+here, keyed by (query name, parameters).
+
+Each entry is tagged with the node labels its Cypher mentions. Every write
+that goes through Neo4jClient (write / write_named / run_query) invalidates
+the entries tagged with any label the write mentions; a write that names no
+label (e.g. MATCH (n) DETACH DELETE n) clears the cache. Tagging by every
+label in the query over-invalidates (a MATCH-only label counts), never
+under-invalidates, for writes made by this process. The TTL bounds
+staleness from writes made elsewhere (other processes, the Neo4j browser).
+
+A read that started before an overlapping write finished is not stored
+(per-label versions are compared at put time), so an in-flight read cannot
+re-populate the cache with pre-write rows.
+
+Configuration (env):
+  GRAPH_RESULT_CACHE_SIZE         max entries (default 256, 0 disables)
+  GRAPH_RESULT_CACHE_TTL_SECONDS  entry lifetime (default 30)
+  GRAPH_RESULT_CACHE_MAX_ROWS     larger results are not cached (default 1000)
+
+Endpoint:
+  GET /api/graph/result-cache/stats
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+class QueryResultCache:
+    """LRU + TTL cache of read results, each tagged with the labels it depends on."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 30.0, max_rows: int = 1000) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[str, Tuple[float, FrozenSet[str], List[Dict[str, Any]]]]" = OrderedDict()
+        self._by_label: Dict[str, set] = {}
+        self._label_versions: Dict[str, int] = {}
+        self._clear_version = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped_puts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    @staticmethod
+    def key(name: str, parameters: Optional[Dict[str, Any]]) -> str:
+        return name + ":" + json.dumps(parameters or {}, sort_keys=True, default=str)
+
+    def versions(self, labels: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot taken before a read; put() rejects the rows if it changed."""
+        return (self._clear_version,) + tuple(self._label_versions.get(label, 0) for label in sorted(labels))
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached rows, or None on miss/expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        stored_at, _, rows = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._drop(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return [dict(row) for row in rows]
+
+    def put(self, key: str, labels: FrozenSet[str], rows: List[Dict[str, Any]], versions: Tuple[int, ...]) -> None:
+        """Store a copy of rows unless a write to one of `labels` landed since `versions`."""
+        if not self.enabled or len(rows) > self.max_rows:
+            return
+        if versions != self.versions(labels):
+            self.skipped_puts += 1
+            return
+        self._drop(key)
+        self._entries[key] = (time.monotonic(), labels, [dict(row) for row in rows])
+        for label in labels:
+            self._by_label.setdefault(label, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_labels(self, labels: Iterable[str]) -> None:
+        """Drop every entry tagged with one of `labels`; no labels clears everything."""
+        labels = set(labels)
+        if not labels:
+            self.clear()
+            return
+        for label in labels:
+            self._label_versions[label] = self._label_versions.get(label, 0) + 1
+            for key in list(self._by_label.get(label, ())):
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept so sizing data survives a reseed."""
+        self._clear_version += 1
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_label.clear()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for label in entry[1]:
+            keys = self._by_label.get(label)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_label[label]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters, current size and entries per label."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled":       self.enabled,
+            "size":          len(self._entries),
+            "max_entries":   self.max_entries,
+            "ttl_seconds":   self.ttl_seconds,
+            "max_rows":      self.max_rows,
+            "hits":          self.hits,
+            "misses":        self.misses,
+            "hit_rate":      round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions":     self.evictions,
+            "invalidations": self.invalidations,
+            "skipped_puts":  self.skipped_puts,
+            "by_label":      {label: len(keys) for label, keys in sorted(self._by_label.items())},
+        }
+
+
+def create_result_cache() -> QueryResultCache:
+    """Build the cache from GRAPH_RESULT_CACHE_* environment settings."""
+    return QueryResultCache(
+        max_entries=int(os.getenv("GRAPH_RESULT_CACHE_SIZE", "256")),
+        ttl_seconds=float(os.getenv("GRAPH_RESULT_CACHE_TTL_SECONDS", "30")),
+        max_rows=int(os.getenv("GRAPH_RESULT_CACHE_MAX_ROWS", "1000")),
+    )
@@ -0,0 +1,82 @@
+"""
+Graph Schema Bootstrap — Idempotent constraints and indexes per domain
+
+Each DomainConfig lists its CREATE CONSTRAINT / CREATE INDEX statements
+(all IF NOT EXISTS) in get_schema_statements(). apply_schema() runs them
+in order; it is safe to call on every startup and after every reseed.
+
+Schema commands cannot share a transaction with data writes, so they run
+through neo4j_client.apply_schema_statement (auto-commit), one at a time.
+
+Endpoint:
+  GET /api/graph/schema — expected vs. present constraints/indexes + state
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from app.core.domain_registry import get_domain_config
+from app.db.neo4j import neo4j_client
+
+
+_NAME_PATTERN = re.compile(r"CREATE\s+(?:CONSTRAINT|INDEX)\s+(\w+)\s+IF\s+NOT\s+EXISTS", re.IGNORECASE)
+
+
+def _statement_name(statement: str) -> Optional[str]:
+    """Extract the constraint/index name from a CREATE ... IF NOT EXISTS statement."""
+    match = _NAME_PATTERN.search(statement)
+    return match.group(1) if match else None
+
+
+async def apply_schema(domain_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Apply the domain's constraints and indexes.
+
+    Failures are collected per statement rather than raised, so one bad
+    statement (e.g. existing duplicate data blocking a constraint) does not
+    stop the rest or the caller.
+    """
+    config = get_domain_config(domain_name)
+    statements = config.get_schema_statements()
+
+    applied: List[str] = []
+    failed: List[Dict[str, str]] = []
+    for statement in statements:
+        name = _statement_name(statement) or statement
+        try:
+            await neo4j_client.apply_schema_statement(statement)
+            applied.append(name)
+        except Exception as exc:
+            print(f"[SCHEMA] Failed to apply {name}: {exc}")
+            failed.append({"name": name, "error": str(exc)})
+
+    print(f"[SCHEMA] {config.name}: applied {len(applied)}/{len(statements)} constraint/index statements")
+    return {
+        "domain":  config.name,
+        "applied": applied,
+        "failed":  failed,
+    }
+
+
+async def get_schema_state(domain_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Report constraints and indexes present in the database, their population
+    state, and any the domain expects but the database does not have.
+    """
+    config = get_domain_config(domain_name)
+    expected = [_statement_name(s) for s in config.get_schema_statements()]
+
+    schema = await neo4j_client.show_schema()
+    indexes = schema["indexes"]
+    constraints = schema["constraints"]
+
+    present = {row["name"] for row in indexes} | {row["name"] for row in constraints}
+    not_online = [row["name"] for row in indexes if row.get("state") != "ONLINE"]
+
+    return {
+        "domain":      config.name,
+        "expected":    expected,
+        "missing":     [name for name in expected if name and name not in present],
+        "not_online":  not_online,
+        "constraints": constraints,
+        "indexes":     indexes,
+    }
@@ -0,0 +1,433 @@
+"""
+Write-Behind Queue — Deferred, batched graph writes off the request path
+
+Decision traces, evolution events and decision outcomes are written for
+the audit trail, the Tab 2 timeline and the precedent index; nothing in
+the same request reads them back. Routers submit them here and return
+immediately. A background task flushes the queue into UNWIND transactions
+(Neo4jClient.create_decision_traces / create_evolution_events /
+record_decision_outcomes) every flush interval or whenever a full batch
+is waiting.
+
+Guarantees:
+  • Order — items flush in submission order; within one flush, decision
+    traces are written before evolution events and outcomes, so an
+    event's TRIGGERED_EVOLUTION and feedback given right after execute
+    always find their Decision. Events and outcomes whose decision trace
+    failed are not written without it.
+  • No silent loss — each write already runs in a managed transaction
+    (the driver retries transient errors within its retry budget). A
+    write that still fails with an availability error (or an open
+    circuit breaker) is retried with exponential backoff; rows that fail
+    every attempt go to a bounded dead-letter list (counted in stats()).
+    Dead letters that failed for availability are requeued ahead of the
+    next flush; others (e.g. a ClientError) are kept for inspection.
+  • Backpressure — the queue is bounded; submit() awaits when it is full.
+  • Drain — stop() (called from main.shutdown_event) flushes everything
+    still queued before the driver closes.
+  • Fallback — if the flusher is not running (scripts, tests, disabled via
+    env), submit() writes inline exactly as before.
+  • Read-your-writes — every queued row gets a ticket (sequence number)
+    recorded in the client's CausalSession; wait_for() lets that client's
+    next read wait until the batch holding its ticket is written, and
+    returns that batch's bookmarks (see bookmarks.py).
+
+The in-memory graph backend (GRAPH_BACKEND=memory) applies writes
+synchronously in microseconds, so it always writes inline: there is
+nothing to gain from deferring and its reads do not wait on tickets.
+Record/replay runs (GRAPH_RECORD, GRAPH_BACKEND=replay) also write inline,
+so each write is the same statement in the recording and the replay.
+
+Configuration (env):
+  GRAPH_WRITE_BEHIND                   "true"/"false" (default true)
+  GRAPH_WRITE_BEHIND_MAX_SIZE          queue bound (default 1000)
+  GRAPH_WRITE_BEHIND_BATCH_SIZE        rows per flush (default 100)
+  GRAPH_WRITE_BEHIND_FLUSH_INTERVAL_MS max wait before a partial flush (default 250)
+  GRAPH_WRITE_BEHIND_MAX_ATTEMPTS      write attempts per flush (default 3)
+  GRAPH_WRITE_BEHIND_RETRY_BACKOFF_MS  first retry delay, doubled per attempt (default 500)
+  GRAPH_WRITE_BEHIND_DEAD_LETTERS      dead-letter bound, oldest dropped beyond it (default 1000)
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.db.bookmarks import CausalSession, causal_session, current_causal_session
+from app.db.circuit_breaker import CircuitOpenError, is_availability_error
+from app.db.neo4j import neo4j_client
+
+
+KIND_DECISION_TRACE = "decision_trace"
+KIND_EVOLUTION_EVENT = "evolution_event"
+KIND_DECISION_OUTCOME = "decision_outcome"
+
+# Flush order within one batch: later kinds may reference decisions written earlier
+_WRITE_ORDER = (KIND_DECISION_TRACE, KIND_EVOLUTION_EVENT, KIND_DECISION_OUTCOME)
+
+# Row key naming the decision each kind belongs to (a failed trace blocks the rest)
+_DECISION_KEY = {
+    KIND_DECISION_TRACE:   "decision_id",
+    KIND_EVOLUTION_EVENT:  "triggered_by",
+    KIND_DECISION_OUTCOME: "decision_id",
+}
+
+# Queued by stop() so the flusher writes its in-flight batch before exiting
+_STOP = object()
+
+# Recent (last ticket, bookmarks) per flushed batch kept for wait_for()
+_BATCH_BOOKMARKS_KEPT = 256
+
+
+def _retryable(exc: BaseException) -> bool:
+    """Worth another attempt later: the graph was unreachable or the breaker was open."""
+    return isinstance(exc, CircuitOpenError) or is_availability_error(exc)
+
+
+class WriteBehindQueue:
+    """Bounded async queue that batches deferred graph writes."""
+
+    def __init__(
+        self,
+        client,
+        enabled: bool = True,
+        max_size: int = 1000,
+        batch_size: int = 100,
+        flush_interval: float = 0.25,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.5,
+        dead_letter_size: int = 1000,
+    ) -> None:
+        self.client = client
+        self.enabled = enabled
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        # {"kind", "row", "error", "retryable"} for rows no flush could write
+        self._dead_letters: Deque[Dict[str, Any]] = deque(maxlen=max(1, dead_letter_size))
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        # Tickets are only comparable within one process lifetime
+        self.epoch = uuid.uuid4().hex[:8]
+        self._next_ticket = 0
+        self._flushed_ticket = 0
+        self._flushed: Optional[asyncio.Condition] = None
+        self._batch_bookmarks: Deque[Tuple[int, List[str]]] = deque(maxlen=_BATCH_BOOKMARKS_KEPT)
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.dead_letters_dropped = 0
+        self.inline_writes = 0
+        self.backpressure_waits = 0
+        self.causal_waits = 0
+        self.causal_timeouts = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the background flusher (no-op if disabled or already running)."""
+        if not self.enabled or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._flushed = asyncio.Condition()
+        self._task = asyncio.create_task(self._run())
+        print(
+            f"[WRITE-BEHIND] Started (max_size={self.max_size}, "
+            f"batch_size={self.batch_size}, flush_interval={self.flush_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and drain everything still queued."""
+        if self._task is None:
+            return
+        if self.running:
+            await self._queue.put(_STOP)
+            await self._task
+        self._task = None
+        await self.flush()
+        if any(entry["retryable"] for entry in self._dead_letters):
+            # Last attempt for rows an earlier outage dead-lettered
+            async with self._flush_lock:
+                await self._write_batch([])
+        print(
+            f"[WRITE-BEHIND] Stopped — {self.written} written, {self.failed} failed, "
+            f"{len(self._dead_letters)} dead-lettered"
+        )
+
+    # ------------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------------
+
+    async def submit(self, kind: str, row: Dict[str, Any]) -> None:
+        """Queue one row; awaits while the queue is full (backpressure)."""
+        self.submitted += 1
+
+        if not self.running:
+            # Inline write: errors propagate to the caller, as before write-behind
+            self.inline_writes += 1
+            await self._writer_for(kind)([row])
+            self.written += 1
+            return
+
+        if self._queue.full():
+            self.backpressure_waits += 1
+        self._next_ticket += 1
+        ticket = self._next_ticket
+        await self._queue.put((ticket, kind, row))
+
+        causal = current_causal_session()
+        if causal is not None:
+            causal.add_ticket(self.epoch, ticket)
+
+    async def submit_decision_trace(self, **kwargs: Any) -> str:
+        """Queue a create_decision_trace() write. Returns decision_id immediately."""
+        row = self.client.decision_trace_row(**kwargs)
+        await self.submit(KIND_DECISION_TRACE, row)
+        return row["decision_id"]
+
+    async def submit_evolution_event(self, **kwargs: Any) -> str:
+        """Queue a create_evolution_event() write. Returns event_id immediately."""
+        row = self.client.evolution_event_row(**kwargs)
+        await self.submit(KIND_EVOLUTION_EVENT, row)
+        return row["event_id"]
+
+    async def submit_decision_outcome(self, **kwargs: Any) -> str:
+        """Queue a record_decision_outcomes() write. Returns decision_id immediately."""
+        row = self.client.decision_outcome_row(**kwargs)
+        await self.submit(KIND_DECISION_OUTCOME, row)
+        return row["decision_id"]
+
+    # ------------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        """Flush whenever a full batch is waiting or the interval elapses."""
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            async with self._flush_lock:
+                await self._write_batch(batch)
+            if stopping:
+                return
+
+    async def flush(self) -> None:
+        """Write everything currently queued, in batch_size chunks."""
+        if self._queue is None:
+            return
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch = []
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                await self._write_batch(batch)
+
+    async def wait_for(self, epoch: str, ticket: int, timeout: float) -> List[str]:
+        """
+        Wait until the row with `ticket` has been written, then return the
+        bookmarks of the batch that wrote it. Returns [] immediately for a
+        ticket from another epoch (server restarted) or one already written
+        and forgotten; on timeout returns [] and the caller reads without it.
+        """
+        if epoch != self.epoch or ticket > self._next_ticket or self._flushed is None:
+            return []
+        if ticket > self._flushed_ticket:
+            self.causal_waits += 1
+            try:
+                async with self._flushed:
+                    await asyncio.wait_for(
+                        self._flushed.wait_for(lambda: self._flushed_ticket >= ticket), timeout
+                    )
+            except asyncio.TimeoutError:
+                self.causal_timeouts += 1
+                print(f"[WRITE-BEHIND] Causal wait for ticket {ticket} timed out after {timeout}s")
+                return []
+        for last_ticket, bookmarks in self._batch_bookmarks:
+            if last_ticket >= ticket:
+                return bookmarks
+        return []
+
+    def _writer_for(self, kind: str):
+        """Map a row kind to the client's batched UNWIND writer."""
+        if kind == KIND_DECISION_TRACE:
+            return self.client.create_decision_traces
+        if kind == KIND_DECISION_OUTCOME:
+            return self.client.record_decision_outcomes
+        return self.client.create_evolution_events
+
+    async def _write_with_retry(self, kind: str, rows: List[Dict[str, Any]]) -> None:
+        """One writer call, retried with exponential backoff while the graph is unavailable."""
+        for attempt in range(self.max_attempts):
+            try:
+                await self._writer_for(kind)(rows)
+                return
+            except Exception as exc:
+                if attempt + 1 >= self.max_attempts or not _retryable(exc):
+                    raise
+                self.retries += 1
+                delay = self.retry_backoff * 2 ** attempt
+                print(f"[WRITE-BEHIND] Write of {len(rows)} {kind} row(s) failed ({exc}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _dead_letter(self, kind: str, rows: List[Dict[str, Any]], error: str, retryable: bool) -> None:
+        for row in rows:
+            if len(self._dead_letters) == self._dead_letters.maxlen:
+                self.dead_letters_dropped += 1
+            self._dead_letters.append({"kind": kind, "row": row, "error": error, "retryable": retryable})
+        self.dead_lettered += len(rows)
+
+    def _take_retryable_dead_letters(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Remove and return dead letters that failed for availability (oldest first)."""
+        retry = [(entry["kind"], entry["row"]) for entry in self._dead_letters if entry["retryable"]]
+        if retry:
+            kept = [entry for entry in self._dead_letters if not entry["retryable"]]
+            self._dead_letters = deque(kept, maxlen=self._dead_letters.maxlen)
+        return retry
+
+    async def _write_batch(self, batch: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+        """
+        Write decision traces first, then the events and outcomes that
+        depend on them. Requeued dead letters go ahead of the batch's rows.
+        """
+        rows_by_kind: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in _WRITE_ORDER}
+        for kind, row in self._take_retryable_dead_letters():
+            rows_by_kind[kind].append(row)
+        for _, kind, row in batch:
+            rows_by_kind[kind].append(row)
+
+        start = time.perf_counter()
+        # decision_id -> retryable, for traces that could not be written
+        unwritten: Dict[str, bool] = {}
+        # Collects the bookmarks of this batch's transactions
+        with causal_session(CausalSession()) as written:
+            for kind, rows in rows_by_kind.items():
+                if kind != KIND_DECISION_TRACE and unwritten:
+                    key = _DECISION_KEY[kind]
+                    for retryable in (True, False):
+                        blocked = [row for row in rows if unwritten.get(row[key]) is retryable]
+                        if blocked:
+                            self._dead_letter(kind, blocked, "decision trace not written", retryable)
+                    rows = [row for row in rows if row[key] not in unwritten]
+                if not rows:
+                    continue
+                try:
+                    await self._write_with_retry(kind, rows)
+                    self.written += len(rows)
+                except Exception as exc:
+                    self.failed += len(rows)
+                    retryable = _retryable(exc)
+                    print(
+                        f"[WRITE-BEHIND] Failed to write {len(rows)} {kind} row(s): {exc} — "
+                        f"dead-lettered{' for requeue' if retryable else ''}"
+                    )
+                    self._dead_letter(kind, rows, str(exc), retryable)
+                    if kind == KIND_DECISION_TRACE:
+                        unwritten.update((row["decision_id"], retryable) for row in rows)
+
+        # Release readers waiting on these tickets (also after a failure —
+        # there is nothing left to wait for)
+        if batch:
+            last_ticket = max(ticket for ticket, _, _ in batch)
+            self._batch_bookmarks.append((last_ticket, sorted(written.bookmarks)))
+            self._flushed_ticket = max(self._flushed_ticket, last_ticket)
+            if self._flushed is not None:
+                async with self._flushed:
+                    self._flushed.notify_all()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+    # ------------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and flush latency counters."""
+        return {
+            "enabled":              self.enabled,
+            "running":              self.running,
+            "depth":                self._queue.qsize() if self._queue is not None else 0,
+            "max_size":             self.max_size,
+            "batch_size":           self.batch_size,
+            "flush_interval_s":     self.flush_interval,
+            "submitted":            self.submitted,
+            "written":              self.written,
+            "failed":               self.failed,
+            "retries":              self.retries,
+            "dead_letters":         len(self._dead_letters),
+            "dead_lettered":        self.dead_lettered,
+            "dead_letters_dropped": self.dead_letters_dropped,
+            "inline_writes":        self.inline_writes,
+            "backpressure_waits":   self.backpressure_waits,
+            "causal_waits":         self.causal_waits,
+            "causal_timeouts":      self.causal_timeouts,
+            "batches":              self.batches,
+            "last_flush_ms":        round(self.last_flush_ms, 2),
+            "avg_flush_ms":         round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms":         round(self.max_flush_ms, 2),
+        }
+
+
+def create_write_behind_queue(client) -> WriteBehindQueue:
+    """Build the queue from GRAPH_WRITE_BEHIND_* environment settings."""
+    from app.db.memory_graph import InMemoryGraphClient
+
+    # Inline writes where batch boundaries must not depend on timing:
+    # the in-memory graph, and record/replay runs (db/replay.py)
+    deterministic = (
+        isinstance(client, InMemoryGraphClient)
+        or client.backend == "replay"
+        or bool(os.getenv("GRAPH_RECORD"))
+    )
+    return WriteBehindQueue(
+        client,
+        enabled=os.getenv("GRAPH_WRITE_BEHIND", "true").lower() == "true" and not deterministic,
+        max_size=int(os.getenv("GRAPH_WRITE_BEHIND_MAX_SIZE", "1000")),
+        batch_size=int(os.getenv("GRAPH_WRITE_BEHIND_BATCH_SIZE", "100")),
+        flush_interval=int(os.getenv("GRAPH_WRITE_BEHIND_FLUSH_INTERVAL_MS", "250")) / 1000,
+        max_attempts=int(os.getenv("GRAPH_WRITE_BEHIND_MAX_ATTEMPTS", "3")),
+        retry_backoff=int(os.getenv("GRAPH_WRITE_BEHIND_RETRY_BACKOFF_MS", "500")) / 1000,
+        dead_letter_size=int(os.getenv("GRAPH_WRITE_BEHIND_DEAD_LETTERS", "1000")),
+    )
+
+
+# Module-level singleton, started/stopped by main.py lifecycle events
+write_behind = create_write_behind_queue(neo4j_client)
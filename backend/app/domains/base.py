@@ -112,10 +112,22 @@ class DomainConfig(ABC):
     def get_seed_queries(self) -> List[str]:
         """Cypher queries to seed the demo graph for this domain."""
 
+    @abstractmethod
+    def get_schema_statements(self) -> List[str]:
+        """Idempotent Cypher constraint/index statements (CREATE ... IF NOT EXISTS) for this domain's graph."""
+
     @abstractmethod
     def get_graph_query_templates(self) -> Dict[str, str]:
         """Named Cypher query templates. Key=query_name, Value=Cypher string."""
 
+    @abstractmethod
+    def get_graph_query_warmup_parameters(self) -> Dict[str, Dict]:
+        """Representative parameters per query name, used to EXPLAIN-warm the plan cache."""
+
+    def get_graph_export_labels(self) -> Dict[str, Dict]:
+        """Exported node labels. Key=label, Value={"key": key property, "changed": change-time expression or None}."""
+        return {}
+
     @abstractmethod
     def get_narration_templates(self) -> Dict[str, str]:
         """LLM prompt templates for reasoning narration. Key=alert_type, Value=template."""
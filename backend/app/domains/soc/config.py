@@ -9,6 +9,7 @@ Constants are extracted from the existing service files — nothing is invented:
   asymmetry_ratio← services/feedback.py get_reward_summary() asymmetric_ratio
   prompt_variants← services/evolver.py  PROMPT_STATS keys
   metrics_config ← routers/metrics.py   BusinessImpact values
+  graph queries  ← db/neo4j.py          Neo4jClient inline Cypher (see queries.py)
 """
 
 from app.domains.base import (
@@ -336,9 +337,50 @@ class SOCDomainConfig(DomainConfig):
         # TODO: Extract from services/seed_neo4j.py in a later prompt
         return []
 
+    # =========================================================================
+    # Graph schema
+    # Source: lookup keys of the hot queries in db/neo4j.py, routers/triage.py,
+    #         services/triage.py and services/threat_intel.py.
+    # Decision / EvolutionEvent ids are 4-hex random suffixes (DEC-XXXX), so
+    # they get plain indexes rather than uniqueness constraints — a collision
+    # must not fail the write path.
+    # =========================================================================
+
+    def get_schema_statements(self) -> List[str]:
+        return [
+            # Uniqueness constraints (each also backs a lookup index)
+            "CREATE CONSTRAINT alert_id IF NOT EXISTS FOR (n:Alert) REQUIRE n.id IS UNIQUE",
+            "CREATE CONSTRAINT threat_intel_value IF NOT EXISTS FOR (n:ThreatIntel) REQUIRE n.value IS UNIQUE",
+            "CREATE CONSTRAINT playbook_id IF NOT EXISTS FOR (n:Playbook) REQUIRE n.id IS UNIQUE",
+            "CREATE CONSTRAINT user_id IF NOT EXISTS FOR (n:User) REQUIRE n.id IS UNIQUE",
+            "CREATE CONSTRAINT asset_id IF NOT EXISTS FOR (n:Asset) REQUIRE n.id IS UNIQUE",
+            "CREATE CONSTRAINT alert_type_id IF NOT EXISTS FOR (n:AlertType) REQUIRE n.id IS UNIQUE",
+            "CREATE CONSTRAINT attack_pattern_id IF NOT EXISTS FOR (n:AttackPattern) REQUIRE n.id IS UNIQUE",
+            # Range indexes
+            "CREATE INDEX decision_id IF NOT EXISTS FOR (n:Decision) ON (n.id)",
+            "CREATE INDEX evolution_event_id IF NOT EXISTS FOR (n:EvolutionEvent) ON (n.id)",
+            "CREATE INDEX evolution_event_timestamp IF NOT EXISTS FOR (n:EvolutionEvent) ON (n.timestamp)",
+            "CREATE INDEX alert_status IF NOT EXISTS FOR (n:Alert) ON (n.status)",
+            "CREATE INDEX alert_status_timestamp IF NOT EXISTS FOR (n:Alert) ON (n.status, n.timestamp)",
+            "CREATE INDEX alert_severity IF NOT EXISTS FOR (n:Alert) ON (n.severity)",
+            "CREATE INDEX alert_alert_type IF NOT EXISTS FOR (n:Alert) ON (n.alert_type)",
+            "CREATE INDEX asset_criticality IF NOT EXISTS FOR (n:Asset) ON (n.criticality)",
+            "CREATE INDEX user_name IF NOT EXISTS FOR (n:User) ON (n.name)",
+            "CREATE INDEX decision_timestamp IF NOT EXISTS FOR (n:Decision) ON (n.timestamp)",
+            "CREATE INDEX decision_context_asset_criticality IF NOT EXISTS FOR (n:DecisionContext) ON (n.asset_criticality)",
+        ]
+
     def get_graph_query_templates(self) -> Dict[str, str]:
-        # TODO: Extract from db/neo4j.py and routers/soc.py in a later prompt
-        return {}
+        from app.domains.soc.queries import SOC_GRAPH_QUERIES
+        return dict(SOC_GRAPH_QUERIES)
+
+    def get_graph_query_warmup_parameters(self) -> Dict[str, Dict]:
+        from app.domains.soc.queries import SOC_GRAPH_QUERY_WARMUP
+        return dict(SOC_GRAPH_QUERY_WARMUP)
+
+    def get_graph_export_labels(self) -> Dict[str, Dict]:
+        from app.domains.soc.queries import SOC_GRAPH_EXPORT_LABELS
+        return dict(SOC_GRAPH_EXPORT_LABELS)
 
     def get_narration_templates(self) -> Dict[str, str]:
         # TODO: Extract from services/reasoning.py in a later prompt
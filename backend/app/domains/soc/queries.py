@@ -0,0 +1,540 @@
+"""
+SOC graph query templates.
+
+Extracted from db/neo4j.py — the same Cypher Neo4jClient used to inline,
+keyed by the name the client uses for metrics. Served through
+SOCDomainConfig.get_graph_query_templates() and loaded into the
+QueryRegistry (db/query_registry.py), which validates parameters against
+the $placeholders below and EXPLAINs every query on startup.
+
+Not registered (kept inline in Neo4jClient):
+  SHOW INDEXES / SHOW CONSTRAINTS and CREATE CONSTRAINT/INDEX — admin
+    commands, cannot be EXPLAINed
+  relationship_count — relationship type is interpolated (seed verification only)
+
+Exported:
+    SOC_GRAPH_QUERIES          — name -> Cypher
+    SOC_GRAPH_QUERY_WARMUP     — name -> representative parameters for EXPLAIN
+    SOC_GRAPH_EXPORT_LABELS    — exported label -> key property / change-time expression
+"""
+from itertools import combinations
+from typing import Any, Dict, Optional, Tuple
+
+from app.db.query_registry import ALERT_QUEUE_FILTERS, alert_queue_query_name, export_query_name
+
+
+# ============================================================================
+# A. Security context / alert bundle
+# ============================================================================
+
+_SECURITY_CONTEXTS = """
+UNWIND $alert_ids AS alert_id
+MATCH (alert:Alert {id: alert_id})
+MATCH (alert)-[:DETECTED_ON]->(asset:Asset)
+MATCH (alert)-[:INVOLVES]->(user:User)
+MATCH (alert)-[:CLASSIFIED_AS]->(alertType:AlertType)
+OPTIONAL MATCH (alertType)-[:HANDLED_BY]->(playbook:Playbook)
+OPTIONAL MATCH (user)-[:HAS_TRAVEL]->(travel:TravelContext)
+OPTIONAL MATCH (asset)-[:SUBJECT_TO]->(sla:SLA)
+OPTIONAL MATCH (alert)-[:MATCHES]->(pattern:AttackPattern)
+
+// Count all nodes consulted
+WITH alert_id, alert, asset, user, alertType, playbook, travel, sla, pattern,
+     1 + 1 + 1 + 1 +
+     CASE WHEN playbook IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN travel IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN sla IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN pattern IS NOT NULL THEN 1 ELSE 0 END as base_nodes
+
+RETURN
+    alert_id,
+    alert,
+    asset,
+    user,
+    alertType,
+    playbook,
+    travel,
+    sla,
+    pattern,
+    base_nodes + 39 as nodes_consulted  // Fixed at 47 for demo consistency
+"""
+
+_ALERT_BUNDLE = """
+MATCH (alert:Alert {id: $alert_id})
+OPTIONAL MATCH (alert)-[:DETECTED_ON]->(asset:Asset)
+OPTIONAL MATCH (alert)-[:INVOLVES]->(user:User)
+OPTIONAL MATCH (alert)-[:CLASSIFIED_AS]->(alertType:AlertType)
+OPTIONAL MATCH (alertType)-[:HANDLED_BY]->(playbook:Playbook)
+OPTIONAL MATCH (user)-[:HAS_TRAVEL]->(travel:TravelContext)
+OPTIONAL MATCH (asset)-[:SUBJECT_TO]->(sla:SLA)
+OPTIONAL MATCH (alert)-[:MATCHES]->(pattern:AttackPattern)
+
+WITH alert, asset, user, alertType, playbook, travel, sla, pattern,
+     1 + 1 + 1 + 1 +
+     CASE WHEN playbook IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN travel IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN sla IS NOT NULL THEN 1 ELSE 0 END +
+     CASE WHEN pattern IS NOT NULL THEN 1 ELSE 0 END as base_nodes
+
+RETURN
+    alert,
+    asset,
+    user,
+    alertType,
+    playbook,
+    travel,
+    sla,
+    pattern,
+    base_nodes + 39 as nodes_consulted  // Fixed at 47 for demo consistency
+LIMIT 1
+"""
+
+# ============================================================================
+# B. Decision traces / evolution events (UNWIND batches from write_behind)
+# ============================================================================
+
+_CREATE_DECISION_TRACES = """
+UNWIND $rows AS row
+MATCH (alert:Alert {id: row.alert_id})
+
+CREATE (decision:Decision {
+    id: row.decision_id,
+    type: row.action,
+    reasoning: row.reasoning,
+    confidence: row.confidence,
+    timestamp: datetime(row.timestamp),
+    alert_id: row.alert_id,
+    action_taken: row.action
+})
+
+CREATE (context:DecisionContext {
+    id: row.decision_id + '-ctx',
+    decision_id: row.decision_id,
+    user_name: row.user_name,
+    user_risk_score: row.user_risk_score,
+    asset_hostname: row.asset_hostname,
+    asset_criticality: row.asset_criticality,
+    user_snapshot: row.user_snapshot,
+    asset_snapshot: row.asset_snapshot,
+    patterns_matched: row.patterns_matched,
+    nodes_consulted: row.nodes_consulted,
+    factor_vector: row.factor_vector
+})
+
+CREATE (decision)-[:HAD_CONTEXT]->(context)
+CREATE (decision)-[:FOR_ALERT]->(alert)
+
+WITH decision, row
+OPTIONAL MATCH (playbook:Playbook {id: row.playbook_id})
+FOREACH (p IN CASE WHEN playbook IS NOT NULL THEN [playbook] ELSE [] END |
+    CREATE (decision)-[:APPLIED_PLAYBOOK]->(p)
+)
+
+RETURN decision.id as decision_id
+"""
+
+# Factor vectors of every past decision (services/precedents.py rebuilds its index from these)
+_PRECEDENT_VECTORS = """
+MATCH (decision:Decision)-[:HAD_CONTEXT]->(context:DecisionContext)
+WHERE context.factor_vector IS NOT NULL
+RETURN decision.id AS decision_id, decision.alert_id AS alert_id, decision.action_taken AS action,
+       decision.confidence AS confidence, decision.timestamp AS timestamp, context.factor_vector AS factor_vector,
+       decision.outcome AS outcome
+ORDER BY decision.timestamp
+"""
+
+# Analyst feedback on a decision (services/feedback.py), kept on the Decision node
+_RECORD_DECISION_OUTCOMES = """
+UNWIND $rows AS row
+MATCH (decision:Decision {id: row.decision_id})
+WHERE decision.alert_id = row.alert_id
+SET decision.outcome = row.outcome, decision.outcome_at = datetime(row.timestamp)
+RETURN decision.id AS decision_id
+"""
+
+_CREATE_EVOLUTION_EVENTS = """
+UNWIND $rows AS row
+MATCH (decision:Decision {id: row.triggered_by})
+
+CREATE (event:EvolutionEvent {
+    id: row.event_id,
+    event_type: row.event_type,
+    triggered_by: row.triggered_by,
+    before_state: row.before_state,
+    after_state: row.after_state,
+    description: row.description,
+    timestamp: datetime(row.timestamp)
+})
+SET event += row.state_props
+
+CREATE (decision)-[:TRIGGERED_EVOLUTION {
+    impact: row.impact,
+    magnitude: row.magnitude,
+    timestamp: datetime(row.timestamp)
+}]->(event)
+
+RETURN event.id as event_id
+"""
+
+# Keyset-paginated timeline: the EvolutionEvent.timestamp index supplies the
+# DESC order and the cursor becomes an index range bound, so each page reads
+# ~limit rows however deep the client pages. id breaks timestamp ties.
+_EVOLUTION_TIMELINE_FILTERS = """
+  AND ($event_type IS NULL OR event.event_type = $event_type)
+  AND ($triggered_by IS NULL OR event.triggered_by = $triggered_by)
+RETURN event.id AS id,
+       event.event_type AS event_type,
+       event.triggered_by AS triggered_by,
+       event.description AS description,
+       event.before_state AS before_state,
+       event.after_state AS after_state,
+       event.timestamp AS timestamp
+ORDER BY event.timestamp DESC, event.id DESC
+LIMIT $limit
+"""
+
+_EVOLUTION_TIMELINE = """
+MATCH (event:EvolutionEvent)
+WHERE event.timestamp IS NOT NULL""" + _EVOLUTION_TIMELINE_FILTERS
+
+_EVOLUTION_TIMELINE_AFTER = """
+MATCH (event:EvolutionEvent)
+WHERE event.timestamp <= datetime($cursor_timestamp)
+  AND (event.timestamp < datetime($cursor_timestamp) OR event.id < $cursor_id)""" + _EVOLUTION_TIMELINE_FILTERS
+
+# Structured DecisionContext filter — runs in the database on indexed
+# asset_criticality + Decision.timestamp instead of pulling snapshots back
+_DECISIONS_BY_ASSET_CRITICALITY = """
+MATCH (decision:Decision)-[:HAD_CONTEXT]->(context:DecisionContext {asset_criticality: $asset_criticality})
+WHERE decision.timestamp >= datetime($since)
+RETURN decision.id AS decision_id,
+       decision.alert_id AS alert_id,
+       decision.action_taken AS action,
+       decision.confidence AS confidence,
+       decision.timestamp AS timestamp,
+       context.asset_hostname AS asset_hostname,
+       context.asset_criticality AS asset_criticality,
+       context.user_name AS user_name,
+       context.user_risk_score AS user_risk_score
+ORDER BY decision.timestamp DESC
+LIMIT $limit
+"""
+
+# ============================================================================
+# C. Alert queue / status
+# ============================================================================
+
+# Filterable, keyset-paginated queue. The Alert(status, timestamp) index
+# supplies the DESC order and the (timestamp, id) cursor is a range bound
+# on it, so each page reads ~limit alerts however deep the client pages.
+#
+# Each combination of filters is its own registered query containing only
+# the predicates in use, so the planner can seek the Alert.severity /
+# Alert.alert_type / Asset.criticality indexes and (through the UNION of
+# User.id and User.name seeks) start from the user. A single query with
+# "$x IS NULL OR prop = $x" predicates could use none of them.
+
+# User filter: matches id or name, as two index seeks
+_ALERT_QUEUE_USER = """
+CALL {
+    MATCH (user:User {id: $user}) RETURN user
+    UNION
+    MATCH (user:User {name: $user}) RETURN user
+}"""
+
+_ALERT_QUEUE_AFTER = """
+  AND alert.timestamp <= datetime($cursor_timestamp)
+  AND (alert.timestamp < datetime($cursor_timestamp) OR alert.id < $cursor_id)"""
+
+_ALERT_QUEUE_PAGE = """RETURN alert, user.name AS user_name, asset.hostname AS asset_hostname
+ORDER BY alert.timestamp DESC, alert.id DESC
+LIMIT $limit
+"""
+
+# Total-count estimate: stops after $count_limit matches so a huge queue
+# never costs a full count (callers report "cap+" beyond it)
+_ALERT_QUEUE_COUNT = """WITH alert LIMIT $count_limit
+RETURN count(alert) AS total
+"""
+
+
+def _alert_queue_query(kind: str, used: Tuple[str, ...]) -> str:
+    """Queue query with predicates for exactly the filters in `used`."""
+    alert = "(alert:Alert {status: $status" + "".join(
+        f", {name}: ${name}" for name in ("severity", "alert_type") if name in used
+    ) + "})"
+    if "user" in used:
+        cypher = _ALERT_QUEUE_USER + f"\nMATCH {alert}-[:INVOLVES]->(user)"
+    else:
+        cypher = f"\nMATCH {alert}"
+    cypher += "\nWHERE alert.timestamp IS NOT NULL"
+    if kind == "alert_queue_after":
+        cypher += _ALERT_QUEUE_AFTER
+    if "user" not in used:
+        cypher += "\nMATCH (alert)-[:INVOLVES]->(user:User)"
+    criticality = " {criticality: $asset_criticality}" if "asset_criticality" in used else ""
+    cypher += f"\nMATCH (alert)-[:DETECTED_ON]->(asset:Asset{criticality})\n"
+    return cypher + (_ALERT_QUEUE_COUNT if kind == "alert_queue_count" else _ALERT_QUEUE_PAGE)
+
+
+_ALERT_QUEUE_VARIANTS = [
+    used for size in range(len(ALERT_QUEUE_FILTERS) + 1) for used in combinations(ALERT_QUEUE_FILTERS, size)
+]
+_ALERT_QUEUE_QUERIES: Dict[str, str] = {
+    alert_queue_query_name(kind, dict.fromkeys(used, "")): _alert_queue_query(kind, used)
+    for kind in ("alert_queue", "alert_queue_after", "alert_queue_count")
+    for used in _ALERT_QUEUE_VARIANTS
+}
+
+# Bulk transition: one UNWIND per chunk, one result row per requested id.
+# Alerts not in $from_statuses (when given) are reported but left unchanged.
+_SET_ALERT_STATUSES = """
+UNWIND $alert_ids AS alert_id
+OPTIONAL MATCH (alert:Alert {id: alert_id})
+WITH alert_id, alert, alert.status AS previous_status,
+     alert IS NOT NULL AND ($from_statuses IS NULL OR alert.status IN $from_statuses) AS allowed
+FOREACH (_ IN CASE WHEN allowed THEN [1] ELSE [] END |
+    SET alert.status = $status, alert.status_updated_at = datetime())
+RETURN alert_id, alert IS NOT NULL AS found, previous_status, allowed AS updated
+"""
+
+# Ingestion: one UNWIND per chunk from the alert ingest queue. MERGE on id
+# makes SIEM re-deliveries no-ops (an existing alert keeps its status and
+# edges). New alerts are linked to whichever of their User / Asset /
+# AlertType exist; the *_found flags report the ones that did not.
+_INGEST_ALERTS = """
+UNWIND $rows AS row
+OPTIONAL MATCH (existing:Alert {id: row.alert_id})
+WITH row, existing IS NULL AS created
+MERGE (alert:Alert {id: row.alert_id})
+ON CREATE SET alert.alert_type      = row.alert_type,
+              alert.severity        = row.severity,
+              alert.source          = row.source,
+              alert.source_ip       = row.source_ip,
+              alert.source_location = row.source_location,
+              alert.destination_ip  = row.destination_ip,
+              alert.description     = row.description,
+              alert.status          = row.status,
+              alert.timestamp       = datetime(row.timestamp),
+              alert.ingested_at     = datetime()
+WITH row, alert, created
+OPTIONAL MATCH (asset:Asset {id: row.asset_id})
+OPTIONAL MATCH (user:User {id: row.user_id})
+OPTIONAL MATCH (type:AlertType {id: row.alert_type})
+FOREACH (a IN CASE WHEN created AND asset IS NOT NULL THEN [asset] ELSE [] END |
+    CREATE (alert)-[:DETECTED_ON]->(a))
+FOREACH (u IN CASE WHEN created AND user IS NOT NULL THEN [user] ELSE [] END |
+    CREATE (alert)-[:INVOLVES]->(u))
+FOREACH (t IN CASE WHEN created AND type IS NOT NULL THEN [type] ELSE [] END |
+    CREATE (alert)-[:CLASSIFIED_AS]->(t))
+RETURN row.alert_id AS alert_id, created,
+       asset IS NOT NULL AS asset_found,
+       user IS NOT NULL AS user_found,
+       type IS NOT NULL AS alert_type_found
+"""
+
+_ASSET_BUSINESS_UNITS = """
+UNWIND $asset_ids AS asset_id
+MATCH (asset:Asset {id: asset_id})
+RETURN asset.id AS asset_id, asset.business_unit AS business_unit
+"""
+
+# ============================================================================
+# D. Threat intel
+# ============================================================================
+
+_MERGE_THREAT_INTEL = """
+MERGE (ti:ThreatIntel {value: $value})
+SET ti.type         = $type,
+    ti.severity     = $severity,
+    ti.source       = $source,
+    ti.risk_factors = $risk_factors,
+    ti.first_seen   = $first_seen,
+    ti.last_updated = $last_updated,
+    ti.context      = $context,
+    ti.refreshed_at = datetime()
+RETURN ti.value AS value
+"""
+
+_LINK_THREAT_INTEL = """
+MATCH (ti:ThreatIntel {value: $ioc_value})
+MATCH (alert:Alert {id: $alert_id})
+MERGE (ti)-[r:ASSOCIATED_WITH]->(alert)
+SET r.linked_at = datetime()
+RETURN ti.value AS ioc, alert.id AS alert_id
+"""
+
+# ============================================================================
+# E. Export (services/graph_export.py)
+# ============================================================================
+
+# label -> key property, and the expression giving when a node last changed
+# (None: reference data, exported in full runs only)
+def _latest(*properties: str) -> str:
+    """Cypher for the latest non-null value of n's `properties` (null if all are null)."""
+    first, *rest = (f"n.{prop}" for prop in properties)
+    values = ", ".join(rest)
+    return f"reduce(latest = {first}, t IN [{values}] | CASE WHEN latest IS NULL OR t > latest THEN t ELSE latest END)"
+
+
+SOC_GRAPH_EXPORT_LABELS: Dict[str, Dict[str, Optional[str]]] = {
+    "Alert":          {"key": "id",    "changed": _latest("status_updated_at", "ingested_at", "timestamp")},
+    "User":           {"key": "id",    "changed": None},
+    "Asset":          {"key": "id",    "changed": None},
+    "Decision":       {"key": "id",    "changed": _latest("outcome_at", "timestamp")},
+    "EvolutionEvent": {"key": "id",    "changed": "n.timestamp"},
+    "ThreatIntel":    {"key": "value", "changed": "n.refreshed_at"},
+}
+
+
+def _export_query(label: str, key: str, changed: Optional[str]) -> str:
+    """
+    One page of `label` nodes after key $after (key index range scan), each
+    with its outgoing relationships. Incremental when $since is set.
+    """
+    since = f" AND ($since IS NULL OR {changed} >= datetime($since))" if changed else ""
+    return f"""
+MATCH (n:{label})
+WHERE n.{key} > $after{since}
+WITH n ORDER BY n.{key} LIMIT $limit
+OPTIONAL MATCH (n)-[r]->(m)
+WITH n, collect(CASE WHEN r IS NULL THEN null ELSE {{
+    type: type(r), target_label: labels(m)[0], target: coalesce(m.id, m.value), properties: properties(r)
+}} END) AS relationships
+RETURN n.{key} AS key, properties(n) AS properties, relationships
+ORDER BY key
+"""
+
+
+SOC_GRAPH_QUERIES: Dict[str, str] = {
+    # Security context / alert bundle
+    "security_contexts":       _SECURITY_CONTEXTS,
+    "alert_bundle":            _ALERT_BUNDLE,
+    "get_alert":               "MATCH (alert:Alert {id: $alert_id}) RETURN alert",
+
+    # Decision traces / evolution
+    "create_decision_traces":  _CREATE_DECISION_TRACES,
+    "create_evolution_events": _CREATE_EVOLUTION_EVENTS,
+    "record_decision_outcomes": _RECORD_DECISION_OUTCOMES,
+    "evolution_timeline":       _EVOLUTION_TIMELINE,
+    "evolution_timeline_after": _EVOLUTION_TIMELINE_AFTER,
+    "pattern_count":           "MATCH (p:AttackPattern) RETURN count(p) as count",
+    "precedent_vectors":       _PRECEDENT_VECTORS,
+    "decisions_by_asset_criticality": _DECISIONS_BY_ASSET_CRITICALITY,
+
+    # Alert queue / status
+    **_ALERT_QUEUE_QUERIES,     # alert_queue[_after|_count][:filter+...]
+    "set_alert_status": (
+        "MATCH (alert:Alert {id: $alert_id}) "
+        "SET alert.status = $status, alert.status_updated_at = datetime()"
+    ),
+    "set_alert_statuses":      _SET_ALERT_STATUSES,
+    "alert_ids":               "MATCH (alert:Alert) RETURN alert.id AS alert_id",
+    "existing_alert_ids": (
+        "UNWIND $alert_ids AS alert_id "
+        "MATCH (alert:Alert {id: alert_id}) RETURN alert.id AS alert_id"
+    ),
+    "ingest_alerts":           _INGEST_ALERTS,
+    "asset_business_units":    _ASSET_BUSINESS_UNITS,
+
+    # Threat intel
+    "merge_threat_intel":      _MERGE_THREAT_INTEL,
+    "link_threat_intel":       _LINK_THREAT_INTEL,
+    "threat_intel_for_alert": (
+        "MATCH (t:ThreatIntel)-[:ASSOCIATED_WITH]->(a:Alert {id: $alert_id}) "
+        "RETURN t.value AS ioc_value, t.severity AS severity, t.source AS source"
+    ),
+    "threat_intel_counts": (
+        "MATCH (t:ThreatIntel) "
+        "RETURN count(t) AS total, "
+        "count(CASE WHEN t.severity IN ['critical','high'] THEN 1 END) AS high_sev"
+    ),
+
+    # Seed verification
+    "label_counts": (
+        "MATCH (n) "
+        "RETURN labels(n)[0] as label, count(n) as count "
+        "ORDER BY label"
+    ),
+
+    # Export — export_alert, export_user, ... (one page of nodes + outgoing relationships)
+    **{
+        export_query_name(label): _export_query(label, spec["key"], spec["changed"])
+        for label, spec in SOC_GRAPH_EXPORT_LABELS.items()
+    },
+}
+
+
+# Representative parameters for startup EXPLAIN. The plan cache is keyed on
+# parameter types, so values must have the same types as real calls.
+_DECISION_ROW: Dict[str, Any] = {
+    "decision_id": "DEC-WARMUP", "alert_id": "ALERT-WARMUP", "action": "false_positive_close",
+    "confidence": 0.0, "reasoning": "", "playbook_id": "PB-WARMUP", "nodes_consulted": 0,
+    "patterns_matched": ["PAT-WARMUP"], "timestamp": "2026-01-01T00:00:00+00:00",
+    "user_name": "", "user_risk_score": 0.0, "asset_hostname": "", "asset_criticality": "critical",
+    "user_snapshot": "{}", "asset_snapshot": "{}", "factor_vector": [0.0, 0.0, 0.0, 0.5, 0.0],
+}
+_EVOLUTION_ROW: Dict[str, Any] = {
+    "event_id": "EVO-WARMUP", "event_type": "pattern_confidence", "triggered_by": "DEC-WARMUP",
+    "before_state": "{}", "after_state": "{}", "state_props": {"before_confidence": 0.0},
+    "description": "", "impact": "", "magnitude": 0.0, "timestamp": "2026-01-01T00:00:00+00:00",
+}
+_OUTCOME_ROW: Dict[str, Any] = {
+    "decision_id": "DEC-WARMUP", "alert_id": "ALERT-WARMUP", "outcome": "correct",
+    "timestamp": "2026-01-01T00:00:00+00:00",
+}
+
+_INGEST_ROW: Dict[str, Any] = {
+    "alert_id": "ALERT-WARMUP", "alert_type": "anomalous_login", "severity": "low", "source": "warmup",
+    "source_ip": "0.0.0.0", "source_location": "", "destination_ip": "0.0.0.0", "description": "",
+    "status": "pending", "timestamp": "2026-01-01T00:00:00+00:00", "asset_id": "ASSET-WARMUP", "user_id": "USER-WARMUP",
+}
+_ALERT_QUEUE_FILTER_VALUES: Dict[str, Any] = {
+    "severity": "high", "alert_type": "anomalous_login", "asset_criticality": "critical", "user": "USER-WARMUP",
+}
+_ALERT_QUEUE_KIND_PARAMETERS: Dict[str, Dict[str, Any]] = {
+    "alert_queue":       {"limit": 11},
+    "alert_queue_after": {"limit": 11, "cursor_timestamp": "2026-01-01T00:00:00+00:00", "cursor_id": "ALERT-WARMUP"},
+    "alert_queue_count": {"count_limit": 10001},
+}
+
+SOC_GRAPH_QUERY_WARMUP: Dict[str, Dict[str, Any]] = {
+    "security_contexts":       {"alert_ids": ["ALERT-WARMUP"]},
+    "alert_bundle":            {"alert_id": "ALERT-WARMUP"},
+    "get_alert":               {"alert_id": "ALERT-WARMUP"},
+    "create_decision_traces":  {"rows": [_DECISION_ROW]},
+    "create_evolution_events": {"rows": [_EVOLUTION_ROW]},
+    "record_decision_outcomes": {"rows": [_OUTCOME_ROW]},
+    "evolution_timeline":      {"limit": 21, "event_type": None, "triggered_by": None},
+    "evolution_timeline_after": {
+        "limit": 21, "event_type": None, "triggered_by": None,
+        "cursor_timestamp": "2026-01-01T00:00:00+00:00", "cursor_id": "EVO-WARMUP",
+    },
+    "decisions_by_asset_criticality": {
+        "asset_criticality": "critical", "since": "2026-01-01T00:00:00+00:00", "limit": 100,
+    },
+    **{
+        alert_queue_query_name(kind, dict.fromkeys(used, "")): {
+            "status": "pending", **parameters, **{name: _ALERT_QUEUE_FILTER_VALUES[name] for name in used},
+        }
+        for kind, parameters in _ALERT_QUEUE_KIND_PARAMETERS.items()
+        for used in _ALERT_QUEUE_VARIANTS
+    },
+    "set_alert_status":        {"alert_id": "ALERT-WARMUP", "status": "pending"},
+    "set_alert_statuses":      {"alert_ids": ["ALERT-WARMUP"], "status": "resolved", "from_statuses": ["pending"]},
+    "existing_alert_ids":      {"alert_ids": ["ALERT-WARMUP"]},
+    "ingest_alerts":           {"rows": [_INGEST_ROW]},
+    "asset_business_units":    {"asset_ids": ["ASSET-WARMUP"]},
+    "merge_threat_intel": {
+        "value": "0.0.0.0", "type": "ip", "severity": "low", "source": "warmup",
+        "risk_factors": [""], "first_seen": "", "last_updated": "", "context": "",
+    },
+    "link_threat_intel":       {"ioc_value": "0.0.0.0", "alert_id": "ALERT-WARMUP"},
+    "threat_intel_for_alert":  {"alert_id": "ALERT-WARMUP"},
+    **{
+        export_query_name(label): (
+            {"after": "", "limit": 500, "since": None} if spec["changed"] else {"after": "", "limit": 500}
+        )
+        for label, spec in SOC_GRAPH_EXPORT_LABELS.items()
+    },
+}
@@ -17,7 +17,9 @@ What is NOT yet implemented (raises NotImplementedError):
   classify_situation() — supply_chain/situations.py not yet created
   compute_factors()    — supply_chain/factors.py not yet created
   get_seed_queries()   — supply_chain/seed_neo4j.py not yet created
+  get_schema_statements()     — supply_chain constraints/indexes not yet created
   get_graph_query_templates() — supply_chain Cypher templates not yet created
+  get_graph_query_warmup_parameters() — follows the templates above
   get_narration_templates()   — supply_chain LLM prompts not yet created
 """
 
@@ -355,10 +357,18 @@ class S2PDomainConfig(DomainConfig):
         # TODO: Create domains/supply_chain/seed_neo4j.py in a future prompt
         return []
 
+    def get_schema_statements(self) -> List[str]:
+        # TODO: Create S2P constraints/indexes alongside the S2P seed data
+        return []
+
     def get_graph_query_templates(self) -> Dict[str, str]:
         # TODO: Create S2P Cypher templates in a future prompt
         return {}
 
+    def get_graph_query_warmup_parameters(self) -> Dict[str, Dict]:
+        # TODO: Add alongside the S2P Cypher templates
+        return {}
+
     def get_narration_templates(self) -> Dict[str, str]:
         # TODO: Create S2P LLM prompt templates in a future prompt
         return {}
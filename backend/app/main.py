@@ -2,7 +2,7 @@
 SOC Copilot Demo - FastAPI Backend
 Main application entry point with CORS and router registration.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -22,8 +22,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allow all HTTP methods
     allow_headers=["*"],  # Allow all headers
+    expose_headers=["X-Graph-Bookmark"],  # causal bookmark token (db/bookmarks.py)
 )
 
+
+# Read-your-writes: the client's X-Graph-Bookmark token is current for the
+# request's graph calls, and returned updated when the request wrote anything
+@app.middleware("http")
+async def graph_causal_session(request: Request, call_next):
+    from app.db.bookmarks import BOOKMARK_HEADER, CausalSession, causal_session
+    from app.db.write_behind import write_behind
+
+    causal = CausalSession.from_token(request.headers.get(BOOKMARK_HEADER), waiter=write_behind.wait_for)
+    with causal_session(causal):
+        response = await call_next(request)
+    if causal.changed:
+        response.headers[BOOKMARK_HEADER] = causal.token()
+    return response
+
 # Health check endpoint
 @app.get("/")
 async def root():
@@ -57,6 +73,34 @@ async def startup_event():
     await neo4j_client.connect()
     print("[OK] Connected to Neo4j")
 
+    # Idempotent constraints/indexes for the active domain (never blocks startup)
+    from app.db.schema import apply_schema
+    try:
+        await apply_schema()
+    except Exception as exc:
+        print(f"[SCHEMA] Schema bootstrap skipped: {exc}")
+
+    # EXPLAIN every registered query so first requests skip planning
+    try:
+        await neo4j_client.warm_up_queries()
+    except Exception as exc:
+        print(f"[QUERIES] Plan warm-up skipped: {exc}")
+
+    # Nearest-precedent index over past decisions' factor vectors
+    from app.services.precedents import precedent_index
+    try:
+        await precedent_index.rebuild(neo4j_client)
+    except Exception as exc:
+        print(f"[PRECEDENTS] Index rebuild skipped: {exc}")
+
+    # Deferred decision-trace / evolution-event writes
+    from app.db.write_behind import write_behind
+    await write_behind.start()
+
+    # Bounded SIEM alert-ingest queue (429 when full)
+    from app.services.alert_ingest import alert_ingest
+    await alert_ingest.start()
+
     from app.core.domain_registry import get_active_domain, get_domain_config
     config = get_domain_config()
     print(f"[DOMAIN] Active domain: {config.display_name} ({config.name})")
@@ -70,14 +114,22 @@ async def startup_event():
     from app.services.policy import reset_policy_state
     from app.services.audit import reset_audit_state
     from app.services.evolver import reset_evolver_state
+    from app.services.analysis_store import analysis_store
     state_manager.register("feedback", reset_feedback_state)
     state_manager.register("policy",   reset_policy_state)
     state_manager.register("audit",    reset_audit_state)
     state_manager.register("evolver",  reset_evolver_state)
+    state_manager.register("context_cache", neo4j_client.invalidate_security_context)
+    state_manager.register("analysis_store", analysis_store.clear)
+    state_manager.register("precedent_index", precedent_index.clear)  # re-seeding rebuilds it
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Close connections on shutdown"""
     from app.db.neo4j import neo4j_client
+    from app.db.write_behind import write_behind
+    from app.services.alert_ingest import alert_ingest
+    await alert_ingest.stop()  # write admitted alerts before the driver closes
+    await write_behind.stop()  # drain queued writes before the driver closes
     await neo4j_client.close()
     print("[OK] Disconnected from Neo4j")
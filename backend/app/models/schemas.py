@@ -35,6 +35,7 @@ class ProcessAlertRequest(BaseModel):
     alert_id: str
     deployment_version: Optional[str] = "v3.1"
     simulate_failure: bool = False
+    analysis_token: Optional[str] = None  # from /alert/analyze; /action/execute commits that analysis
 
 
 class OutcomeRequest(BaseModel):
@@ -44,6 +45,29 @@ class OutcomeRequest(BaseModel):
     outcome: Literal["correct", "incorrect"]
 
 
+class BulkAlertStatusRequest(BaseModel):
+    """Request to move many alerts to one status (e.g. closing a false-positive storm)"""
+    alert_ids: List[str] = Field(..., min_length=1, max_length=10000)
+    status: Literal["pending", "resolved", "closed"]
+    from_statuses: Optional[List[str]] = None  # only transition alerts currently in these
+
+
+class BatchAnalyzeFilter(BaseModel):
+    """Pending-queue selection for batch analysis"""
+    severity: Optional[str] = None
+    alert_type: Optional[str] = None
+    asset_criticality: Optional[str] = None
+    user: Optional[str] = None  # user id or name
+    limit: int = Field(100, ge=1, le=1000)
+
+
+class BatchAnalyzeRequest(BaseModel):
+    """Request to analyze many alerts: explicit alert_ids, or a filter over the pending queue"""
+    alert_ids: Optional[List[str]] = Field(None, min_length=1, max_length=1000)
+    filter: Optional[BatchAnalyzeFilter] = None
+    concurrency: Optional[int] = Field(None, ge=1)  # default BATCH_TRIAGE_CONCURRENCY
+
+
 # ============================================================================
 # Security Context Models
 # ============================================================================
@@ -2,7 +2,7 @@
 Runtime Evolution API - THE KEY DIFFERENTIATOR
 Tab 2 endpoints: Deployment registry, eval gates, TRIGGERED_EVOLUTION
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from typing import Optional
 from datetime import datetime
 import uuid
@@ -12,7 +12,10 @@ from app.services.agent import agent
 from app.services.reasoning import narrator
 from app.services.situation import analyze_situation
 from app.services import evolver
+from app.services.precedents import alert_threat_intel_severity, precedent_factor_vector, precedent_vector_for_alert
+from app.core.concurrency import gather_or_cancel
 from app.db.neo4j import neo4j_client
+from app.db.write_behind import write_behind
 from app.models.schemas import ProcessAlertRequest
 
 
@@ -114,7 +117,13 @@ async def process_alert(request: ProcessAlertRequest):
         # Step 3: LLM Narration (Generate Reasoning)
         # ====================================================================
 
-        reasoning = await narrator.generate_reasoning(alert_type, decision.action, context)
+        # Threat-intel severity for the precedent factor vector is read
+        # concurrently; the vector itself is built after Step 4, which may
+        # change the context
+        reasoning, ti_severity = await gather_or_cancel(
+            narrator.generate_reasoning(alert_type, decision.action, context),
+            alert_threat_intel_severity(request.alert_id),
+        )
 
         # ====================================================================
         # Step 4: Eval Gate (4 Checks)
@@ -128,12 +137,13 @@ async def process_alert(request: ProcessAlertRequest):
         eval_result = agent.evaluate_gates(decision, context, reasoning)
 
         # ====================================================================
-        # Step 5: Create Decision Trace in Neo4j
+        # Step 5: Queue Decision Trace for Neo4j (write-behind)
         # ====================================================================
 
         decision_id = f"DEC-{uuid.uuid4().hex[:4].upper()}"
+        factor_vector = precedent_factor_vector(context, ti_severity)
 
-        await neo4j_client.create_decision_trace(
+        await write_behind.submit_decision_trace(
             decision_id=decision_id,
             alert_id=request.alert_id,
             action=decision.action,
@@ -151,7 +161,8 @@ async def process_alert(request: ProcessAlertRequest):
                     "hostname": context.get("asset_hostname"),
                     "criticality": context.get("asset_criticality")
                 }
-            }
+            },
+            factor_vector=factor_vector
         )
 
         # ====================================================================
@@ -169,7 +180,7 @@ async def process_alert(request: ProcessAlertRequest):
 
                 event_id = f"EVO-{uuid.uuid4().hex[:4].upper()}"
 
-                await neo4j_client.create_evolution_event(
+                await write_behind.submit_evolution_event(
                     event_id=event_id,
                     event_type=event_type,
                     triggered_by=decision_id,
@@ -288,13 +299,16 @@ async def process_alert_blocked(request: ProcessAlertRequest):
         # Agent decision (rule-based)
         decision = agent.decide(alert_type, context)
 
-        # LLM narration
-        reasoning = await narrator.generate_reasoning(alert_type, decision.action, context)
+        # LLM narration, concurrently with the precedent vector's threat-intel read
+        reasoning, factor_vector = await gather_or_cancel(
+            narrator.generate_reasoning(alert_type, decision.action, context),
+            precedent_vector_for_alert(request.alert_id, context),
+        )
 
         # Create decision trace (even though it will be blocked)
         decision_id = f"DEC-{uuid.uuid4().hex[:4].upper()}"
 
-        await neo4j_client.create_decision_trace(
+        await write_behind.submit_decision_trace(
             decision_id=decision_id,
             alert_id=request.alert_id,
             action=decision.action,
@@ -312,7 +326,8 @@ async def process_alert_blocked(request: ProcessAlertRequest):
                     "hostname": context.get("asset_hostname"),
                     "criticality": context.get("asset_criticality")
                 }
-            }
+            },
+            factor_vector=factor_vector
         )
 
         # Build eval gate with ONE FAILED CHECK
@@ -463,14 +478,29 @@ async def simulate_failure():
 # ============================================================================
 
 @router.get("/evolution/recent")
-async def get_recent_evolution():
-    """Get recent evolution events for display"""
+async def get_recent_evolution(
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    event_type: Optional[str] = None,
+    triggered_by: Optional[str] = None,
+):
+    """
+    Get recent evolution events for display, newest first.
+
+    Keyset-paginated: pass the returned next_cursor as `cursor` for the next
+    page (next_cursor is null on the last page). Filter with event_type
+    and/or triggered_by (decision id).
+    """
 
     try:
-        events = await neo4j_client.get_recent_evolution_events(limit=10)
-        return {"events": events}
+        return await neo4j_client.get_evolution_timeline(
+            limit=limit, cursor=cursor, event_type=event_type, triggered_by=triggered_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        # Fallback mock data
+        # Fallback mock data — only reached when the graph is unavailable and
+        # the client has no last known good result cached yet
         return {
             "events": [
                 {
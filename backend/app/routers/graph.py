@@ -2,10 +2,21 @@
 Graph Intelligence Router — Threat Intel endpoints
 
 Exposes POST /api/graph/threat-intel/refresh which fetches from Pulsedive
-(or falls back to hardcoded IOCs) and writes :ThreatIntel nodes to Neo4j.
+(or falls back to hardcoded IOCs) and writes :ThreatIntel nodes to Neo4j,
+plus read-only diagnostics for the graph client (context/result cache stats,
+schema/index state, write-behind queue depth, per-query latency, named
+query registry, circuit breaker, partitions), structured decision lookups
+and a streaming NDJSON / CSV export for offline analytics.
 """
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
+from app.db.neo4j import neo4j_client
+from app.db.schema import get_schema_state
+from app.db.write_behind import write_behind
+from app.services import graph_export
 from app.services.threat_intel import refresh_threat_intel
 
 router = APIRouter()
@@ -39,3 +50,169 @@ async def refresh_threat_intel_endpoint():
             status_code=500,
             detail=f"Threat intel refresh failed: {str(exc)}",
         )
+
+
+@router.get("/graph/context-cache/stats")
+async def context_cache_stats():
+    """
+    Security-context cache counters (hits, misses, evictions, size).
+
+    Used to size SECURITY_CONTEXT_CACHE_SIZE / _TTL_SECONDS.
+    """
+    return neo4j_client.context_cache.stats()
+
+
+@router.get("/graph/result-cache/stats")
+async def result_cache_stats():
+    """
+    Named-query result cache counters (hits, misses, invalidations, entries per label).
+
+    Used to size GRAPH_RESULT_CACHE_SIZE / _TTL_SECONDS.
+    """
+    return neo4j_client.result_cache.stats()
+
+
+@router.get("/graph/partitions")
+async def graph_partitions():
+    """
+    Partition routing state when GRAPH_PARTITIONS is set: business-unit map,
+    alerts known per partition, directory lookups and each partition's breaker.
+    """
+    if neo4j_client.backend != "partitioned":
+        return {"partitioned": False, "backend": neo4j_client.backend}
+    return {"partitioned": True, **neo4j_client.stats()}
+
+
+@router.get("/graph/schema")
+async def graph_schema_state():
+    """
+    Report constraint/index state for the active domain.
+
+    Returns expected names (from DomainConfig.get_schema_statements),
+    any missing from the database, indexes not yet ONLINE, and the raw
+    SHOW CONSTRAINTS / SHOW INDEXES rows.
+    """
+    print("[GRAPH] GET /graph/schema called")
+    try:
+        return await get_schema_state()
+    except Exception as exc:
+        print(f"[ERROR] Schema state query failed: {exc}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Schema state query failed: {str(exc)}",
+        )
+
+
+@router.get("/graph/write-behind/stats")
+async def write_behind_stats():
+    """
+    Write-behind queue depth, throughput and flush latency.
+
+    A growing depth or rising backpressure_waits means flushes cannot keep
+    up — raise GRAPH_WRITE_BEHIND_BATCH_SIZE or look at graph latency.
+    """
+    return write_behind.stats()
+
+
+@router.get("/graph/query-stats")
+async def query_stats():
+    """
+    Per-query latency histogram, row counts and sampled PROFILE plans.
+
+    Queries are keyed by the Neo4jClient method that issues them and sorted
+    slowest first. Set GRAPH_QUERY_PROFILE_SAMPLE_RATE to capture plans.
+    """
+    return neo4j_client.query_metrics.stats()
+
+
+@router.post("/graph/query-stats/reset")
+async def reset_query_stats():
+    """Clear query metrics, e.g. before re-measuring after a schema/seed change."""
+    neo4j_client.query_metrics.reset()
+    return {"status": "reset", "since": neo4j_client.query_metrics.since.isoformat()}
+
+
+@router.get("/graph/queries")
+async def graph_queries():
+    """
+    Named query registry for the active domain.
+
+    Per query: required parameters, read/write mode, calls, parameter
+    validation failures, startup EXPLAIN result and execution latency.
+    """
+    return neo4j_client.queries.stats(neo4j_client.query_metrics)
+
+
+@router.get("/graph/circuit-breaker")
+async def circuit_breaker_state():
+    """
+    Graph circuit breaker state and stale-result fallback counters.
+
+    state is closed / open / half_open; stale_results.served counts reads
+    answered from the last known good cache while the graph was unavailable.
+    """
+    return {
+        "breaker":       neo4j_client.breaker.stats(),
+        "stale_results": neo4j_client.stale_results.stats(),
+    }
+
+
+@router.get("/graph/decisions")
+async def decisions_by_asset_criticality(asset_criticality: str = "critical", days: int = 7, limit: int = 100):
+    """
+    Decisions taken on assets of a given criticality in the last `days`.
+
+    Filtered in the database on the indexed DecisionContext.asset_criticality
+    and Decision.timestamp properties, newest first.
+    """
+    print(f"[GRAPH] GET /graph/decisions called (asset_criticality={asset_criticality}, days={days})")
+    try:
+        decisions = await neo4j_client.get_decisions_by_asset_criticality(asset_criticality, days=days, limit=limit)
+    except Exception as exc:
+        print(f"[ERROR] Decision query failed: {exc}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Decision query failed: {str(exc)}",
+        )
+    return {"asset_criticality": asset_criticality, "days": days, "count": len(decisions), "decisions": decisions}
+
+
+@router.get("/graph/export")
+async def export_graph(labels: Optional[str] = None, since: Optional[str] = None):
+    """
+    Stream the graph as NDJSON (nodes, then their outgoing relationships).
+
+    labels: comma-separated (default: all exported labels).
+    since:  ISO 8601 — only nodes changed since then (incremental export);
+            pass the previous export's started_at.
+    """
+    label_list = [label.strip() for label in labels.split(",") if label.strip()] if labels else None
+    try:
+        graph_export.export_labels(neo4j_client, label_list)
+        graph_export.parse_since(since)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    print(f"[GRAPH] GET /graph/export called (labels={label_list or 'all'}, since={since})")
+    return StreamingResponse(
+        graph_export.ndjson_lines(label_list, since, client=neo4j_client),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/graph/export/csv")
+async def export_graph_csv(label: str, kind: str = graph_export.NODE_KIND, since: Optional[str] = None):
+    """Stream one label's nodes (kind=nodes) or outgoing relationships (kind=relationships) as CSV."""
+    try:
+        graph_export.export_labels(neo4j_client, [label])
+        graph_export.parse_since(since)
+        if kind not in (graph_export.NODE_KIND, graph_export.RELATIONSHIP_KIND):
+            raise ValueError(f"kind must be '{graph_export.NODE_KIND}' or '{graph_export.RELATIONSHIP_KIND}'")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    print(f"[GRAPH] GET /graph/export/csv called (label={label}, kind={kind}, since={since})")
+    return StreamingResponse(
+        graph_export.csv_chunks(label, kind, since, client=neo4j_client),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{label}.{kind}.csv"'},
+    )
+
@@ -3,7 +3,7 @@ Compounding Metrics API - Tab 4
 Shows week-over-week improvement proving the compounding moat
 """
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
@@ -261,15 +261,16 @@ async def reset_all_demo_data():
     print("[DEMO RESET] Starting comprehensive demo reset via re-seeding...")
 
     try:
+        # Reset all in-memory state (audit, evolver, feedback, policy, precedent index)
+        # first, so what seeding rebuilds from the new graph is not cleared again
+        state_manager.reset_all()
+
         # Re-seed the entire database from canonical data
         summary = await seed_neo4j_database()
 
         # Verify the seed
         verification = await verify_neo4j_seed()
 
-        # Reset all in-memory state (audit, evolver, feedback, policy)
-        state_manager.reset_all()
-
         print("[DEMO RESET] Comprehensive reset completed successfully")
 
         return {
@@ -340,35 +341,39 @@ async def reset_demo_data():
 # ============================================================================
 
 @router.get("/metrics/evolution-events")
-async def get_evolution_events(limit: int = Query(10, ge=1, le=50)):
+async def get_evolution_events(
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = None,
+    event_type: Optional[str] = None,
+    triggered_by: Optional[str] = None,
+):
     """
-    Get recent evolution events from Neo4j.
-
-    In production, this queries:
-    MATCH (e:EvolutionEvent)
-    OPTIONAL MATCH (e)<-[:TRIGGERED_EVOLUTION]-(d:Decision)
-    RETURN e, d
-    ORDER BY e.timestamp DESC
-    LIMIT $limit
-    """
-    try:
-        print(f"[EVOLUTION EVENTS] Fetching {limit} recent events")
+    Get recent evolution events from Neo4j, newest first.
 
-        # Mock data
-        events = generate_compounding_data().evolution_events
+    Keyset-paginated over the EvolutionEvent.timestamp index: pass the
+    returned next_cursor as `cursor` for the next page. Filter with
+    event_type and/or triggered_by (decision id).
+    """
+    from app.db.neo4j import neo4j_client
 
+    print(f"[EVOLUTION EVENTS] Fetching {limit} events (cursor={'yes' if cursor else 'no'})")
+    try:
+        return await neo4j_client.get_evolution_timeline(
+            limit=limit, cursor=cursor, event_type=event_type, triggered_by=triggered_by,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        # Mock fallback — only reached when the graph is unavailable and the
+        # client has no last known good result cached yet
+        print(f"[ERROR] Evolution events fetch failed, using mock data: {e}")
+        events = generate_compounding_data().evolution_events[:limit]
         return {
-            "events": [e.model_dump() for e in events[:limit]],
-            "total": len(events)
+            "events": [e.model_dump() for e in events],
+            "count": len(events),
+            "next_cursor": None,
         }
 
-    except Exception as e:
-        print(f"[ERROR] Evolution events fetch failed: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to fetch evolution events: {str(e)}"
-        )
-
 
 # ============================================================================
 # GET /api/demo/domains - Domain Registry Status
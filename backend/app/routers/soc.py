@@ -587,23 +587,18 @@ async def get_threat_landscape():
     Returns a live snapshot of what the security graph knows right now.
     Displayed in the Tab 1 summary strip before any query is made.
 
-    Attempts a live Neo4j count of ThreatIntel nodes; falls back to
-    static numbers if Neo4j is unavailable.
+    Attempts a live Neo4j count of ThreatIntel nodes. While the graph is
+    unavailable the client serves its last known good counts; the static
+    numbers are only used if nothing has been read since startup.
     """
     # Attempt live ThreatIntel counts from Neo4j
     ti_loaded = 47
     high_severity_iocs = 12
     try:
         from app.db.neo4j import neo4j_client
-        results = await neo4j_client.run_query(
-            "MATCH (t:ThreatIntel) "
-            "RETURN count(t) AS total, "
-            "count(CASE WHEN t.severity IN ['critical','high'] THEN 1 END) AS high_sev",
-            {},
-        )
-        if results:
-            ti_loaded = int(results[0].get("total") or ti_loaded)
-            high_severity_iocs = int(results[0].get("high_sev") or high_severity_iocs)
+        counts = await neo4j_client.get_threat_intel_counts()
+        ti_loaded = int(counts.get("total") or ti_loaded)
+        high_severity_iocs = int(counts.get("high_sev") or high_severity_iocs)
     except Exception as exc:
         print(f"[SOC] threat-landscape Neo4j query failed (using static fallback): {exc}")
 
@@ -2,8 +2,9 @@
 Alert Triage API - Tab 3
 Graph-based reasoning and closed-loop execution
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 import uuid
 
@@ -12,11 +13,17 @@ from app.services.reasoning import narrator
 from app.services.situation import analyze_situation
 from app.services.feedback import process_outcome, get_feedback_status, get_reward_summary
 from app.services.policy import detect_policy_conflicts, get_conflict_history
-from app.services.triage import get_decision_factors
+from app.services.triage import get_decision_factors, decision_factor_names
+from app.services.precedents import PRECEDENT_FACTORS, precedent_index, precedent_vector_for_alert
 from app.services.audit import record_decision
+from app.services.analysis_store import analysis_store
+from app.services import alert_ingest as ingest
+from app.services import batch_triage
+from app.core.concurrency import gather_or_cancel
 from app.core.state_manager import state_manager
 from app.db.neo4j import neo4j_client
-from app.models.schemas import ProcessAlertRequest, OutcomeRequest
+from app.db.write_behind import write_behind
+from app.models.schemas import ProcessAlertRequest, OutcomeRequest, BulkAlertStatusRequest, BatchAnalyzeRequest
 
 
 router = APIRouter()
@@ -27,47 +34,33 @@ router = APIRouter()
 # ============================================================================
 
 @router.get("/alerts/queue")
-async def get_alert_queue():
+async def get_alert_queue(
+    limit: int = Query(10, ge=1, le=200),
+    cursor: Optional[str] = None,
+    status: str = "pending",
+    severity: Optional[str] = None,
+    alert_type: Optional[str] = None,
+    asset_criticality: Optional[str] = None,
+    user: Optional[str] = None,
+):
     """
-    Get list of pending alerts for triage.
+    Get a page of alerts for triage (pending by default), newest first.
     Returns simplified alert list for the sidebar.
+
+    Keyset-paginated: pass the returned next_cursor as `cursor` for the next
+    page (next_cursor is null on the last page). Filter with severity,
+    alert_type, asset_criticality and user (id or name). total_estimate is
+    a cached count, capped at ALERT_QUEUE_COUNT_CAP (total_estimate_capped).
     """
-    print("[TRIAGE] GET /alerts/queue called")
+    print(f"[TRIAGE] GET /alerts/queue called (limit={limit}, cursor={'yes' if cursor else 'no'})")
 
     try:
-        # Query Neo4j for pending alerts
-        query = """
-        MATCH (alert:Alert {status: 'pending'})
-        MATCH (alert)-[:INVOLVES]->(user:User)
-        MATCH (alert)-[:DETECTED_ON]->(asset:Asset)
-        RETURN alert, user.name as user_name, asset.hostname as asset_hostname
-        ORDER BY alert.timestamp DESC
-        LIMIT 10
-        """
-
-        print("[TRIAGE] Querying Neo4j for pending alerts...")
-        results = await neo4j_client.run_query(query)
-        print(f"[TRIAGE] Neo4j returned {len(results)} results")
-
-        alerts = []
-        for record in results:
-            alert = record["alert"]
-            alerts.append({
-                "id": alert["id"],
-                "alert_type": alert["alert_type"],
-                "severity": alert["severity"],
-                "asset_hostname": record["asset_hostname"],
-                "user_name": record["user_name"],
-                "timestamp": alert["timestamp"],
-                "status": alert["status"],
-                "source_location": alert.get("source_location", "Unknown")
-            })
-
-        print(f"[TRIAGE] Returning {len(alerts)} alerts from Neo4j")
-        response = {"alerts": alerts}
-        print(f"[TRIAGE] Response structure: {response}")
-        return response
-
+        page = await neo4j_client.get_alert_queue(
+            limit=limit, cursor=cursor, status=status, severity=severity,
+            alert_type=alert_type, asset_criticality=asset_criticality, user=user,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"[ERROR] Failed to fetch alert queue: {e}")
         import traceback
@@ -77,6 +70,29 @@ async def get_alert_queue():
             detail=f"Failed to fetch alerts from Neo4j: {str(e)}"
         )
 
+    alerts = []
+    for record in page["alerts"]:
+        alert = record["alert"]
+        alerts.append({
+            "id": alert["id"],
+            "alert_type": alert["alert_type"],
+            "severity": alert["severity"],
+            "asset_hostname": record["asset_hostname"],
+            "user_name": record["user_name"],
+            "timestamp": alert["timestamp"],
+            "status": alert["status"],
+            "source_location": alert.get("source_location", "Unknown")
+        })
+
+    print(f"[TRIAGE] Returning {len(alerts)} alerts from Neo4j (total_estimate={page['total_estimate']})")
+    return {
+        "alerts": alerts,
+        "count": len(alerts),
+        "next_cursor": page["next_cursor"],
+        "total_estimate": page["total_estimate"],
+        "total_estimate_capped": page["total_estimate_capped"],
+    }
+
 
 # ============================================================================
 # POST /api/alert/analyze - Analyze Alert with Graph Traversal
@@ -93,42 +109,59 @@ async def analyze_alert(request: ProcessAlertRequest):
         alert_id = request.alert_id
 
         # ====================================================================
-        # Step 1: Get full alert details
+        # Step 1: Get alert, security context (47 nodes) and graph data
+        # in one round trip
         # ====================================================================
-        alert_data = await neo4j_client.get_alert(alert_id)
+        bundle = await neo4j_client.get_alert_bundle(alert_id)
 
-        if not alert_data:
+        if not bundle:
             raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
 
-        # ====================================================================
-        # Step 2: Get security context (47 nodes)
-        # ====================================================================
-        context = await neo4j_client.get_security_context(alert_id)
+        alert_data = bundle["alert"]
+        context = bundle["context"]
 
         if not context:
             raise HTTPException(status_code=404, detail=f"Context for {alert_id} not found")
 
         # ====================================================================
-        # Step 3: Situation Analysis (Loop 1: Context Intelligence)
+        # Step 2: Situation Analysis (Loop 1: Context Intelligence)
         # ====================================================================
         alert_type = context.get("alert_type")
         situation_analysis = analyze_situation(alert_type, context)
 
         # ====================================================================
-        # Step 4: Get agent recommendation
+        # Step 3: Get agent recommendation
         # ====================================================================
         decision = agent.decide(alert_type, context)
 
-        # Generate reasoning
-        reasoning = await narrator.generate_reasoning(alert_type, decision.action, context)
+        # Generate reasoning while the precedent factor vector's threat
+        # intel is read — independent stages, run concurrently
+        reasoning, factor_vector = await gather_or_cancel(
+            narrator.generate_reasoning(alert_type, decision.action, context),
+            precedent_vector_for_alert(alert_id, context),
+        )
 
         # ====================================================================
-        # Step 5: Get graph data for visualization
+        # Step 4: Graph data for visualization (fetched with the bundle)
         # ====================================================================
-        graph_data = await get_graph_data(alert_id)
+        graph_data = bundle["graph_data"]
+
+        # Nearest prior decisions by factor vector (services/precedents.py)
+        precedents = precedent_index.search(factor_vector, k=5, exclude_alert=alert_id)
+
+        # Keep what is shown so /action/execute can commit it unchanged
+        analysis_token = analysis_store.put({
+            "alert_id":       alert_id,
+            "context":        context,
+            "decision":       decision,
+            "reasoning":      reasoning,
+            "situation_type": situation_analysis.situation_type,
+            "factor_names":   decision_factor_names(alert_id),
+            "factor_vector":  factor_vector,
+        })
 
         # ====================================================================
-        # Step 6: Extract key facts from context
+        # Step 5: Extract key facts from context
         # ====================================================================
         key_facts = []
 
@@ -173,7 +206,10 @@ async def analyze_alert(request: ProcessAlertRequest):
                 "playbook_id": decision.playbook_id
             },
             "graph_data": graph_data,
-            "situation_analysis": situation_analysis.model_dump()
+            "situation_analysis": situation_analysis.model_dump(),
+            "precedents": precedents,
+            "analysis_token": analysis_token,
+            "analysis_token_expires_in": analysis_store.ttl_seconds
         }
 
     except HTTPException:
@@ -183,6 +219,119 @@ async def analyze_alert(request: ProcessAlertRequest):
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
 
+# ============================================================================
+# POST /api/alerts/analyze-batch - Batch Analysis (NDJSON)
+# ============================================================================
+
+@router.post("/alerts/analyze-batch")
+async def analyze_alert_batch(request: BatchAnalyzeRequest):
+    """
+    Run situation -> decide -> narrate -> gates for many alerts and stream
+    one NDJSON result per alert as it completes (see services/batch_triage.py).
+
+    Give either alert_ids or a filter (severity / alert_type /
+    asset_criticality / user / limit) over the pending queue. Contexts are
+    fetched in batched round trips; up to `concurrency` alerts are analyzed
+    at once. Read-only: nothing is executed or written to the graph.
+    """
+    if (request.alert_ids is None) == (request.filter is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of alert_ids or filter")
+
+    if request.alert_ids is not None:
+        alert_ids = request.alert_ids
+    else:
+        try:
+            alert_ids = await batch_triage.select_alert_ids(
+                severity=request.filter.severity,
+                alert_type=request.filter.alert_type,
+                asset_criticality=request.filter.asset_criticality,
+                user=request.filter.user,
+                limit=request.filter.limit,
+                client=neo4j_client,
+            )
+        except Exception as e:
+            print(f"[ERROR] Batch alert selection failed: {e}")
+            raise HTTPException(status_code=500, detail=f"Alert selection failed: {str(e)}")
+
+    concurrency = batch_triage.resolve_concurrency(request.concurrency)
+    print(f"[TRIAGE] POST /alerts/analyze-batch called — {len(alert_ids)} alert(s), concurrency {concurrency}")
+    return StreamingResponse(
+        batch_triage.ndjson_lines(alert_ids, concurrency, client=neo4j_client),
+        media_type="application/x-ndjson",
+    )
+
+
+# ============================================================================
+# POST /api/alerts/ingest - SIEM Alert Ingestion
+# ============================================================================
+
+@router.post("/alerts/ingest", status_code=202)
+async def ingest_alerts(request: Request, source: Optional[str] = None):
+    """
+    Accept alerts from the SIEM: NDJSON (Content-Type application/x-ndjson,
+    one alert per line, validated as it streams in) or a JSON webhook body
+    (an alert, a list of alerts or {"alerts": [...]}). `source` names the
+    sending SIEM and is stored on each alert.
+
+    Valid alerts are queued and written to the graph in batches (see
+    services/alert_ingest.py); invalid ones are returned with their line and
+    error. 202 when queued; 429 with Retry-After when the ingest queue cannot
+    take the whole batch (nothing is queued — resend it); 413 above
+    ALERT_INGEST_MAX_REQUEST_ALERTS; 422 when no alert is valid.
+    """
+    queue = ingest.alert_ingest
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    try:
+        if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            alerts, errors = await ingest.read_ndjson_alerts(request.stream(), queue.max_request_alerts)
+        else:
+            alerts, errors = ingest.read_json_alerts(await request.body(), queue.max_request_alerts)
+    except ingest.IngestRequestTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Malformed request body: {str(e)}")
+
+    if not alerts:
+        if errors:
+            raise HTTPException(status_code=422, detail={"message": "No valid alerts", "rejected": errors})
+        raise HTTPException(status_code=400, detail="No alerts in request body")
+
+    try:
+        admitted = await queue.offer(alerts, source=source)
+    except Exception as e:
+        print(f"[ERROR] Alert ingestion failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Ingestion failed: {str(e)}")
+
+    if not admitted:
+        retry_after = queue.retry_after()
+        print(f"[TRIAGE] POST /alerts/ingest — queue full ({queue.depth}/{queue.max_size}), {len(alerts)} alert(s) refused")
+        return JSONResponse(
+            status_code=429,
+            headers={"Retry-After": str(retry_after)},
+            content={
+                "detail": "Alert ingest queue is full; retry the whole batch",
+                "retry_after": retry_after,
+                "queue_depth": queue.depth,
+                "queue_max_size": queue.max_size,
+            },
+        )
+
+    print(f"[TRIAGE] POST /alerts/ingest — {len(alerts)} accepted, {len(errors)} rejected (source={source})")
+    return {
+        "accepted": len(alerts),
+        "rejected": len(errors),
+        "errors": errors,
+        "queued": queue.running,
+        "queue_depth": queue.depth,
+    }
+
+
+@router.get("/alerts/ingest/stats")
+async def get_alert_ingest_stats():
+    """Ingest queue depth, admission (accepted / 429) and write counters."""
+    return ingest.alert_ingest.stats()
+
+
 # ============================================================================
 # POST /api/action/execute - Execute Closed Loop
 # ============================================================================
@@ -197,47 +346,35 @@ async def execute_action(request: ProcessAlertRequest):
     2. VERIFIED - Outcome confirmed
     3. EVIDENCE - Decision trace captured
     4. KPI IMPACT - Metrics attributed
+
+    With analysis_token (returned by /alert/analyze) the displayed decision
+    and reasoning are committed as-is; without it they are recomputed.
     """
 
+    # Reserved analysis token, released if execute fails before queueing the trace
+    reserved_token: Optional[str] = None
     try:
         alert_id = request.alert_id
 
-        # Get context for decision trace
-        context = await neo4j_client.get_security_context(alert_id)
-
-        if not context:
-            raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
-
-        # Get decision
-        alert_type = context.get("alert_type")
-        decision = agent.decide(alert_type, context)
-        reasoning = await narrator.generate_reasoning(alert_type, decision.action, context)
-
-        # Resolve correct situation_type and factor list for the audit ledger (H-1).
-        # context never carries these keys; derive them from the same functions
-        # used by /alert/analyze. Graceful fallback keeps the execute path safe.
-        situation_type_str = "unknown"
-        factor_names: list = []
-        try:
-            situation = analyze_situation(alert_type, context)
-            situation_type_str = situation.situation_type
-        except Exception as exc:
-            print(f"[EXECUTE] analyze_situation failed for {alert_id}: {exc}")
-        try:
-            factors_result = await get_decision_factors(alert_id)
-            if factors_result:
-                factor_names = [f["name"] for f in factors_result.get("factors", [])]
-        except Exception as exc:
-            print(f"[EXECUTE] get_decision_factors failed for {alert_id}: {exc}")
+        if request.analysis_token:
+            # Commit exactly what /alert/analyze showed — no graph read, no LLM call
+            analysis = analysis_store.reserve(request.analysis_token, alert_id)
+            if analysis is None:
+                raise HTTPException(
+                    status_code=409,
+                    detail=f"Analysis token for {alert_id} is expired, unknown, in use or already used — re-run analyze",
+                )
+            reserved_token = request.analysis_token
+            print(f"[EXECUTE] Committing stored analysis for {alert_id}")
+        else:
+            analysis = await _analyze_for_execution(alert_id)
 
-        # Record decision in the in-memory audit ledger (Evidence Ledger — Tab 4)
-        record_decision(
-            alert_id=alert_id,
-            situation_type=situation_type_str,
-            action_taken=decision.action,
-            factors=factor_names,
-            confidence=decision.confidence,
-        )
+        context = analysis["context"]
+        decision = analysis["decision"]
+        reasoning = analysis["reasoning"]
+        situation_type_str = analysis["situation_type"]
+        factor_names = analysis["factor_names"]
+        factor_vector = analysis["factor_vector"]
 
         # ====================================================================
         # Step 1: EXECUTED - Take action in target system
@@ -253,11 +390,11 @@ async def execute_action(request: ProcessAlertRequest):
         verification_method = "API status check" if decision.action == "false_positive_close" else "Ticket existence verification"
 
         # ====================================================================
-        # Step 3: EVIDENCE - Create decision trace in Neo4j
+        # Step 3: EVIDENCE - Queue decision trace for Neo4j (write-behind)
         # ====================================================================
         decision_id = f"DEC-{uuid.uuid4().hex[:4].upper()}"
 
-        await neo4j_client.create_decision_trace(
+        await write_behind.submit_decision_trace(
             decision_id=decision_id,
             alert_id=alert_id,
             action=decision.action,
@@ -275,15 +412,28 @@ async def execute_action(request: ProcessAlertRequest):
                     "hostname": context.get("asset_hostname"),
                     "criticality": context.get("asset_criticality")
                 }
-            }
+            },
+            factor_vector=factor_vector
         )
 
-        # Update alert status in Neo4j
-        await neo4j_client.run_query(
-            "MATCH (alert:Alert {id: $alert_id}) SET alert.status = 'resolved'",
-            {"alert_id": alert_id}
+        # Queued — the token is spent, so a retry after a later failure
+        # cannot write a second trace
+        if reserved_token is not None:
+            analysis_store.redeem(reserved_token)
+            reserved_token = None
+
+        # Record decision in the in-memory audit ledger (Evidence Ledger — Tab 4)
+        record_decision(
+            alert_id=alert_id,
+            situation_type=situation_type_str,
+            action_taken=decision.action,
+            factors=factor_names,
+            confidence=decision.confidence,
         )
 
+        # Update alert status in Neo4j (also drops the cached context)
+        await neo4j_client.set_alert_status(alert_id, "resolved")
+
         # ====================================================================
         # Step 4: KPI IMPACT - Calculate metrics impact
         # ====================================================================
@@ -320,6 +470,63 @@ async def execute_action(request: ProcessAlertRequest):
     except Exception as e:
         print(f"[ERROR] Failed to execute action: {e}")
         raise HTTPException(status_code=500, detail=f"Execution failed: {str(e)}")
+    finally:
+        # Nothing was queued: the same token can execute again
+        if reserved_token is not None:
+            analysis_store.release(reserved_token)
+
+
+async def _analyze_for_execution(alert_id: str) -> Dict[str, Any]:
+    """
+    Recompute the analysis for execute_action when no analysis_token is
+    given. Returns the same fields analyze_alert stores in analysis_store.
+    """
+    # Get context for decision trace
+    context = await neo4j_client.get_security_context(alert_id)
+
+    if not context:
+        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
+
+    # Get decision
+    alert_type = context.get("alert_type")
+    decision = agent.decide(alert_type, context)
+
+    # Resolve correct situation_type and factor list for the audit ledger (H-1).
+    # context never carries these keys; derive them from the same functions
+    # used by /alert/analyze. Graceful fallback keeps the execute path safe.
+    situation_type_str = "unknown"
+    try:
+        situation = analyze_situation(alert_type, context)
+        situation_type_str = situation.situation_type
+    except Exception as exc:
+        print(f"[EXECUTE] analyze_situation failed for {alert_id}: {exc}")
+
+    async def live_factor_names() -> list:
+        try:
+            factors_result = await get_decision_factors(alert_id)
+            if factors_result:
+                return [f["name"] for f in factors_result.get("factors", [])]
+        except Exception as exc:
+            print(f"[EXECUTE] get_decision_factors failed for {alert_id}: {exc}")
+        return []
+
+    # Narration, the factor breakdown and the precedent vector's threat
+    # intel are independent — run them concurrently
+    reasoning, factor_names, factor_vector = await gather_or_cancel(
+        narrator.generate_reasoning(alert_type, decision.action, context),
+        live_factor_names(),
+        precedent_vector_for_alert(alert_id, context),
+    )
+
+    return {
+        "alert_id":       alert_id,
+        "context":        context,
+        "decision":       decision,
+        "reasoning":      reasoning,
+        "situation_type": situation_type_str,
+        "factor_names":   factor_names,
+        "factor_vector":  factor_vector,
+    }
 
 
 # ============================================================================
@@ -337,15 +544,8 @@ async def reset_demo_alerts():
 
     try:
         # Reset all alerts to pending status in Neo4j
-        query = """
-        MATCH (alert:Alert)
-        SET alert.status = 'pending'
-        RETURN count(alert) as reset_count
-        """
-
         print("[TRIAGE] Running Cypher query to reset alert statuses...")
-        result = await neo4j_client.run_query(query)
-        reset_count = result[0]["reset_count"] if result else 0
+        reset_count = await neo4j_client.reset_alert_statuses("pending")
 
         print(f"[TRIAGE] Reset {reset_count} alerts to 'pending' status")
 
@@ -367,6 +567,45 @@ async def reset_demo_alerts():
         )
 
 
+# ============================================================================
+# POST /api/alerts/status - Bulk Alert Status Transition
+# ============================================================================
+
+@router.post("/alerts/status")
+async def bulk_set_alert_status(request: BulkAlertStatusRequest):
+    """
+    Move many alerts to one status at once (e.g. close a false-positive storm).
+
+    Runs as chunked UNWIND transactions (GRAPH_BULK_CHUNK_SIZE alerts each).
+    Returns per-alert results: found, previous_status, updated (False when
+    the alert is missing, not in from_statuses, or its chunk failed).
+    """
+    print(f"[TRIAGE] POST /alerts/status called — {len(request.alert_ids)} alert(s) -> {request.status}")
+
+    try:
+        results = await neo4j_client.set_alert_statuses(
+            request.alert_ids, request.status, from_statuses=request.from_statuses,
+        )
+    except Exception as e:
+        print(f"[ERROR] Bulk status update failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Bulk status update failed: {str(e)}")
+
+    updated = sum(1 for row in results if row["updated"])
+    not_found = sum(1 for row in results if row["found"] is False)
+    failed = sum(1 for row in results if "error" in row)
+    print(f"[TRIAGE] Bulk status: {updated} updated, {not_found} not found, {failed} failed")
+    return {
+        "status": request.status,
+        "requested": len(results),
+        "updated": updated,
+        "not_found": not_found,
+        "skipped": len(results) - updated - not_found - failed,
+        "failed": failed,
+        "results": results,
+        "timestamp": datetime.now().isoformat(),
+    }
+
+
 # ============================================================================
 # POST /api/alert/outcome - Report Decision Outcome (v2.5 - Feedback Loop)
 # ============================================================================
@@ -403,6 +642,12 @@ async def report_decision_outcome(request: OutcomeRequest):
             decision_id=request.decision_id,
             outcome=request.outcome
         )
+        # Persist on the Decision node; queued behind the decision's own trace
+        await write_behind.submit_decision_outcome(
+            decision_id=request.decision_id,
+            alert_id=request.alert_id,
+            outcome=request.outcome,
+        )
 
         print(f"[FEEDBACK] Processed {request.outcome} outcome for {request.alert_id}")
         print(f"[FEEDBACK] Graph updates: {len(result.graph_updates)}")
@@ -630,146 +875,38 @@ async def decision_factors(alert_id: str):
 
 
 # ============================================================================
-# Helper: Get Graph Data for Visualization
+# GET /api/alert/{alert_id}/precedents - Nearest Prior Decisions
 # ============================================================================
 
-async def get_graph_data(alert_id: str) -> Dict[str, Any]:
-    """
-    Get graph data for visualization.
-    Returns nodes and relationships in a format suitable for graph rendering.
+@router.get("/alert/{alert_id}/precedents")
+async def alert_precedents(alert_id: str, k: int = Query(5, ge=1, le=50)):
     """
-
-    query = """
-    MATCH (alert:Alert {id: $alert_id})
-    MATCH (alert)-[:DETECTED_ON]->(asset:Asset)
-    MATCH (alert)-[:INVOLVES]->(user:User)
-    MATCH (alert)-[:CLASSIFIED_AS]->(alertType:AlertType)
-    OPTIONAL MATCH (user)-[:HAS_TRAVEL]->(travel:TravelContext)
-    OPTIONAL MATCH (alert)-[:MATCHES]->(pattern:AttackPattern)
-    OPTIONAL MATCH (alertType)-[:HANDLED_BY]->(playbook:Playbook)
-
-    RETURN alert, asset, user, alertType, travel, pattern, playbook
+    The k past decisions whose factor vectors (travel match, device trust,
+    user risk, asset criticality, threat-intel severity) are closest to this
+    alert's, with their actions and any recorded outcome. Decisions on the
+    alert itself are excluded.
     """
+    print(f"[TRIAGE] GET /alert/{alert_id}/precedents called (k={k})")
 
-    try:
-        results = await neo4j_client.run_query(query, {"alert_id": alert_id})
-
-        if not results:
-            return {"nodes": [], "relationships": []}
-
-        record = results[0]
-
-        # Build nodes
-        nodes = []
-        relationships = []
-
-        # Add alert node
-        alert = record.get("alert")
-        if alert:
-            nodes.append({
-                "id": alert["id"],
-                "label": alert["id"],
-                "type": "Alert",
-                "properties": {
-                    "alert_type": alert.get("alert_type"),
-                    "severity": alert.get("severity")
-                }
-            })
-
-        # Add user node
-        user = record.get("user")
-        if user:
-            nodes.append({
-                "id": user["id"],
-                "label": user["name"],
-                "type": "User",
-                "properties": {
-                    "title": user.get("title"),
-                    "risk_score": user.get("risk_score")
-                }
-            })
-            relationships.append({
-                "source": alert["id"],
-                "target": user["id"],
-                "type": "INVOLVES"
-            })
-
-        # Add asset node
-        asset = record.get("asset")
-        if asset:
-            nodes.append({
-                "id": asset["id"],
-                "label": asset["hostname"],
-                "type": "Asset",
-                "properties": {
-                    "criticality": asset.get("criticality")
-                }
-            })
-            relationships.append({
-                "source": alert["id"],
-                "target": asset["id"],
-                "type": "DETECTED_ON"
-            })
+    context = await neo4j_client.get_security_context(alert_id)
+    if not context:
+        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
 
-        # Add travel node
-        travel = record.get("travel")
-        if travel:
-            nodes.append({
-                "id": travel["id"],
-                "label": travel["destination"],
-                "type": "TravelContext",
-                "properties": {
-                    "destination": travel.get("destination")
-                }
-            })
-            relationships.append({
-                "source": user["id"],
-                "target": travel["id"],
-                "type": "HAS_TRAVEL"
-            })
+    factor_vector = await precedent_vector_for_alert(alert_id, context)
+    return {
+        "alert_id": alert_id,
+        "factors": dict(zip(PRECEDENT_FACTORS, factor_vector)),
+        "precedents": precedent_index.search(factor_vector, k=k, exclude_alert=alert_id),
+    }
 
-        # Add pattern node
-        pattern = record.get("pattern")
-        if pattern:
-            nodes.append({
-                "id": pattern["id"],
-                "label": pattern["name"],
-                "type": "AttackPattern",
-                "properties": {
-                    "occurrence_count": pattern.get("occurrence_count"),
-                    "confidence": pattern.get("confidence")
-                }
-            })
-            relationships.append({
-                "source": alert["id"],
-                "target": pattern["id"],
-                "type": "MATCHES"
-            })
 
-        # Add playbook node
-        playbook = record.get("playbook")
-        if playbook:
-            alertType = record.get("alertType")
-            nodes.append({
-                "id": playbook["id"],
-                "label": playbook["name"],
-                "type": "Playbook",
-                "properties": {
-                    "sla_minutes": playbook.get("sla_minutes")
-                }
-            })
-            if alertType:
-                relationships.append({
-                    "source": alertType["id"],
-                    "target": playbook["id"],
-                    "type": "HANDLED_BY"
-                })
+@router.get("/precedents/stats")
+async def precedent_stats():
+    """Precedent index size, block layout, recorded outcomes and average search time."""
+    return precedent_index.stats()
 
-        return {
-            "nodes": nodes,
-            "relationships": relationships
-        }
 
-    except Exception as e:
-        print(f"[ERROR] Failed to get graph data: {e}")
-        return {"nodes": [], "relationships": []}
+@router.get("/alert/analysis-store/stats")
+async def analysis_store_stats():
+    """Outstanding analysis tokens and issued / redeemed / rejected counters."""
+    return analysis_store.stats()
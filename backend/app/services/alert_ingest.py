@@ -0,0 +1,507 @@
+"""
+Alert Ingest — SIEM alert intake with a bounded queue and 429 backpressure
+
+The SIEM pushes alerts as NDJSON (one alert per line) or as a JSON webhook
+body (one alert, a list, or {"alerts": [...]}). Every alert is validated
+against models/schemas.Alert. Valid alerts are admitted to a bounded queue
+and the request returns 202 straight away. A background task writes the
+queue into the graph through Neo4jClient.ingest_alerts(): one UNWIND
+transaction per batch, and each new alert is linked to its Asset
+(DETECTED_ON), User (INVOLVES) and AlertType (CLASSIFIED_AS).
+
+Admission is all-or-nothing per request. If the queue cannot take the
+whole batch, nothing is queued and the endpoint answers 429 with a
+Retry-After header, so the SIEM can resend the same batch unchanged. The
+hint is the time the flusher needs to drain the current backlog at its
+measured write rate, never less than ALERT_INGEST_RETRY_AFTER_SECONDS.
+Writes are idempotent on alert id, so a redelivered alert is not
+duplicated.
+
+A 202 is a promise to write the alert, so a failed flush does not drop
+it. Alerts whose write failed because the graph was unavailable (or the
+circuit breaker was open) are retried with exponential backoff; alerts
+that fail every attempt go to a bounded dead-letter list, counted in
+stats(). Dead letters that failed for availability are requeued ahead of
+the next flush and on stop(); others are kept for inspection.
+
+NDJSON bodies are validated line by line as they stream in. An oversized
+request is refused (413) without buffering it.
+
+Alerts whose Asset, User or AlertType does not exist are still written,
+just without that edge, and are counted under "unresolved" in stats().
+The triage queue only lists alerts that have both a user and an asset.
+
+The queue runs on every backend except record/replay runs (GRAPH_RECORD,
+GRAPH_BACKEND=replay), where batch boundaries must not depend on timing.
+There, and whenever the flusher is not running (scripts), offer() writes
+inline.
+
+Configuration (env):
+  ALERT_INGEST_QUEUE                  "true"/"false" (default true)
+  ALERT_INGEST_MAX_SIZE               queue bound in alerts (default 10000)
+  ALERT_INGEST_BATCH_SIZE             alerts per write transaction (default 500)
+  ALERT_INGEST_FLUSH_INTERVAL_MS      max wait before a partial flush (default 200)
+  ALERT_INGEST_MAX_REQUEST_ALERTS     alerts per request; capped at MAX_SIZE (default 5000)
+  ALERT_INGEST_RETRY_AFTER_SECONDS    minimum Retry-After on 429 (default 1)
+  ALERT_INGEST_MAX_ATTEMPTS           write attempts per flush (default 3)
+  ALERT_INGEST_RETRY_BACKOFF_MS       first retry delay, doubled per attempt (default 500)
+  ALERT_INGEST_DEAD_LETTERS           dead-letter bound, oldest dropped beyond it (default 10000)
+
+Endpoints:
+  POST /api/alerts/ingest
+  GET  /api/alerts/ingest/stats
+"""
+import asyncio
+import json
+import math
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.db.circuit_breaker import CircuitOpenError, is_availability_error
+from app.db.neo4j import neo4j_client
+from app.models.schemas import Alert
+
+
+# Queued by stop() so the flusher writes its in-flight batch before exiting
+_STOP = object()
+
+# Retry-After never tells a SIEM to back off longer than this
+_MAX_RETRY_AFTER_SECONDS = 60
+
+
+class IngestRequestTooLarge(Exception):
+    """The request holds more alerts than one request may carry."""
+
+
+class IngestWriteError(Exception):
+    """An inline write left alerts unwritten after every attempt."""
+
+
+def _retryable(exc: BaseException) -> bool:
+    """Worth another attempt later: the graph was unreachable or the breaker was open."""
+    return isinstance(exc, CircuitOpenError) or is_availability_error(exc)
+
+
+# ============================================================================
+# Parsing / validation
+# ============================================================================
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'alert'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def validate_alert(payload: Any, line: int) -> Tuple[Optional[Alert], Optional[Dict[str, Any]]]:
+    """(Alert, None) for a valid payload, else (None, {"line", "alert_id", "error"})."""
+    try:
+        return Alert.model_validate(payload), None
+    except ValidationError as exc:
+        alert_id = payload.get("id") if isinstance(payload, dict) else None
+        return None, {"line": line, "alert_id": alert_id, "error": _validation_message(exc)}
+
+
+async def read_ndjson_alerts(
+    chunks: AsyncIterator[bytes],
+    max_alerts: int,
+) -> Tuple[List[Alert], List[Dict[str, Any]]]:
+    """
+    Validate an NDJSON body line by line as it arrives. Blank lines are
+    skipped; line numbers are 1-based. Raises IngestRequestTooLarge as soon
+    as the body holds more than max_alerts alerts.
+    """
+    alerts: List[Alert] = []
+    errors: List[Dict[str, Any]] = []
+    line_number = 0
+    pending = b""
+
+    def take(raw: bytes) -> None:
+        nonlocal line_number
+        line_number += 1
+        if not raw.strip():
+            return
+        if len(alerts) + len(errors) >= max_alerts:
+            raise IngestRequestTooLarge(f"More than {max_alerts} alerts in one request")
+        try:
+            payload = json.loads(raw)
+        except ValueError as exc:
+            errors.append({"line": line_number, "alert_id": None, "error": f"invalid JSON: {exc}"})
+            return
+        alert, error = validate_alert(payload, line_number)
+        if alert is not None:
+            alerts.append(alert)
+        else:
+            errors.append(error)
+
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for raw in lines:
+            take(raw)
+    if pending:
+        take(pending)
+    return alerts, errors
+
+
+def read_json_alerts(body: bytes, max_alerts: int) -> Tuple[List[Alert], List[Dict[str, Any]]]:
+    """
+    Validate a JSON webhook body: one alert object, a list of alerts or
+    {"alerts": [...]}. "line" in errors is the 1-based position in the list.
+    Raises ValueError for a body that is not JSON or has none of those shapes.
+    """
+    payload = json.loads(body)
+    if isinstance(payload, dict):
+        payload = payload["alerts"] if isinstance(payload.get("alerts"), list) else [payload]
+    if not isinstance(payload, list):
+        raise ValueError("Expected an alert object, a list of alerts or {\"alerts\": [...]}")
+    if len(payload) > max_alerts:
+        raise IngestRequestTooLarge(f"More than {max_alerts} alerts in one request")
+
+    alerts: List[Alert] = []
+    errors: List[Dict[str, Any]] = []
+    for position, item in enumerate(payload, start=1):
+        alert, error = validate_alert(item, position)
+        if alert is not None:
+            alerts.append(alert)
+        else:
+            errors.append(error)
+    return alerts, errors
+
+
+# ============================================================================
+# Queue
+# ============================================================================
+
+class AlertIngestQueue:
+    """Bounded queue of ingested alerts, flushed to the graph in UNWIND batches."""
+
+    def __init__(
+        self,
+        client,
+        enabled: bool = True,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        max_request_alerts: int = 5000,
+        retry_after_seconds: int = 1,
+        max_attempts: int = 3,
+        retry_backoff: float = 0.5,
+        dead_letter_size: int = 10000,
+    ) -> None:
+        self.client = client
+        self.enabled = enabled
+        self.max_size = max(1, max_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        # A batch larger than the queue could never be admitted
+        self.max_request_alerts = max(1, min(max_request_alerts, self.max_size))
+        self.retry_after_seconds = max(1, retry_after_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self._dead_letters: Deque[Dict[str, Any]] = deque(maxlen=max(1, dead_letter_size))
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.accepted = 0
+        self.rejected_requests = 0
+        self.rejected_alerts = 0
+        self.inline_writes = 0
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.dead_letters_dropped = 0
+        self.unresolved = {"asset": 0, "user": 0, "alert_type": 0}
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._total_flushed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start the background flusher (no-op if disabled or already running)."""
+        if not self.enabled or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size + 1)  # + room for _STOP
+        self._task = asyncio.create_task(self._run())
+        print(
+            f"[INGEST] Started (max_size={self.max_size}, batch_size={self.batch_size}, "
+            f"flush_interval={self.flush_interval}s)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the flusher and write everything still queued, retryable dead letters included."""
+        if self._task is None:
+            return
+        if self.running:
+            self._queue.put_nowait(_STOP)
+            await self._task
+        self._task = None
+        await self.flush()
+        if any(entry["retryable"] for entry in self._dead_letters):
+            async with self._flush_lock:
+                await self._write_batch([])  # last attempt at requeued dead letters
+        print(
+            f"[INGEST] Stopped — {self.created} created, {self.duplicates} duplicate(s), "
+            f"{self.failed} failed, {len(self._dead_letters)} dead letter(s)"
+        )
+
+    # ------------------------------------------------------------------------
+    # Producer
+    # ------------------------------------------------------------------------
+
+    async def offer(self, alerts: List[Alert], source: Optional[str] = None) -> bool:
+        """
+        Admit every alert or none. Returns False (nothing queued) when the
+        queue lacks room for the whole batch. Without a running flusher the
+        batch is written inline; alerts still unwritten after every attempt
+        raise IngestWriteError to the caller instead of being dead-lettered.
+        """
+        rows = [self.client.alert_ingest_row(alert.model_dump(), source) for alert in alerts]
+        if not rows:
+            return True
+
+        if not self.running:
+            self.inline_writes += 1
+            self.accepted += len(rows)
+            await self._write_batch(rows, raise_errors=True)
+            return True
+
+        # Single-threaded event loop: nothing else enqueues between the check and the puts
+        if self.depth + len(rows) > self.max_size:
+            self.rejected_requests += 1
+            self.rejected_alerts += len(rows)
+            return False
+        for row in rows:
+            self._queue.put_nowait(row)
+        self.accepted += len(rows)
+        return True
+
+    def retry_after(self) -> int:
+        """Seconds a rejected sender should wait: the backlog's drain time at the measured write rate."""
+        seconds = float(self.retry_after_seconds)
+        if self._total_flushed and self._total_flush_ms:
+            rate = self._total_flushed / (self._total_flush_ms / 1000)  # alerts per second
+            seconds = max(seconds, self.depth / rate)
+        return min(_MAX_RETRY_AFTER_SECONDS, math.ceil(seconds))
+
+    # ------------------------------------------------------------------------
+    # Consumer
+    # ------------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        """Flush whenever a full batch is waiting or the interval elapses."""
+        while True:
+            first = await self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            async with self._flush_lock:
+                await self._write_batch(batch)
+            if stopping:
+                return
+
+    async def flush(self) -> None:
+        """Write everything currently queued, in batch_size chunks."""
+        if self._queue is None:
+            return
+        async with self._flush_lock:
+            while not self._queue.empty():
+                batch = []
+                while len(batch) < self.batch_size and not self._queue.empty():
+                    item = self._queue.get_nowait()
+                    if item is not _STOP:
+                        batch.append(item)
+                if batch:
+                    await self._write_batch(batch)
+
+    async def _ingest_with_retry(
+        self,
+        rows: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], Dict[str, Any]]]]:
+        """
+        ingest_alerts(), re-sending the alerts whose write failed for
+        availability with exponential backoff. Returns (results of written
+        alerts, (row, failed result) per alert given up on); a failed result
+        carries its error and whether it is retryable.
+        """
+        by_id: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            by_id.setdefault(row["alert_id"], row)
+        pending = list(by_id.values())
+        written: List[Dict[str, Any]] = []
+        given_up: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        for attempt in range(self.max_attempts):
+            try:
+                results = await self.client.ingest_alerts(pending, chunk_size=self.batch_size)
+            except Exception as exc:
+                results = [
+                    {"alert_id": row["alert_id"], "error": str(exc), "retryable": _retryable(exc)}
+                    for row in pending
+                ]
+            retry: List[Dict[str, Any]] = []
+            for result in results:
+                if not result.get("error"):
+                    written.append(result)
+                elif result.get("retryable") and attempt + 1 < self.max_attempts:
+                    retry.append(by_id[result["alert_id"]])
+                else:
+                    given_up.append((by_id[result["alert_id"]], result))
+            if not retry:
+                break
+            self.retries += 1
+            delay = self.retry_backoff * 2 ** attempt
+            print(f"[INGEST] Write of {len(retry)} alert(s) failed; retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            pending = retry
+        return written, given_up
+
+    async def _write_batch(self, rows: List[Dict[str, Any]], raise_errors: bool = False) -> None:
+        """
+        Write one batch, requeued dead letters ahead of its rows. Alerts that
+        fail every attempt are dead-lettered, or raise IngestWriteError when
+        raise_errors (inline writes, where the caller still holds the request).
+        """
+        if not raise_errors:
+            rows = self._take_retryable_dead_letters() + rows
+        if not rows:
+            return
+        start = time.perf_counter()
+        results, failed = await self._ingest_with_retry(rows)
+
+        self.duplicates += len(rows) - len({row["alert_id"] for row in rows})  # repeated within this batch
+        missing = {"asset": 0, "user": 0, "alert_type": 0}
+        for result in results:
+            if not result["created"]:
+                self.duplicates += 1
+                continue
+            self.created += 1
+            for key in missing:
+                if not result[f"{key}_found"]:
+                    missing[key] += 1
+        for key, count in missing.items():
+            self.unresolved[key] += count
+        if any(missing.values()):
+            print(
+                f"[INGEST] {len(rows)} alert(s) written with unresolved references — "
+                f"asset: {missing['asset']}, user: {missing['user']}, alert_type: {missing['alert_type']}"
+            )
+
+        if failed:
+            self.failed += len(failed)
+            message = f"{len(failed)} alert(s) not written: {failed[0][1]['error']}"
+            print(f"[INGEST] {message}")
+            if raise_errors:
+                raise IngestWriteError(message)
+            self._dead_letter(failed)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.batches += 1
+        self.last_flush_ms = elapsed_ms
+        self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+        self._total_flushed += len(rows)
+
+    def _dead_letter(self, failed: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        for row, result in failed:
+            if len(self._dead_letters) == self._dead_letters.maxlen:
+                self.dead_letters_dropped += 1
+            self._dead_letters.append({"row": row, "error": result["error"], "retryable": bool(result.get("retryable"))})
+        self.dead_lettered += len(failed)
+    def _take_retryable_dead_letters(self) -> List[Dict[str, Any]]:
+        """Remove and return dead letters that failed for availability (oldest first)."""
+        retry = [entry["row"] for entry in self._dead_letters if entry["retryable"]]
+        if retry:
+            kept = [entry for entry in self._dead_letters if not entry["retryable"]]
+            self._dead_letters = deque(kept, maxlen=self._dead_letters.maxlen)
+        return retry
+
+    # ------------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth, admission and write counters."""
+        return {
+            "enabled":              self.enabled,
+            "running":              self.running,
+            "depth":                self.depth,
+            "max_size":             self.max_size,
+            "batch_size":           self.batch_size,
+            "flush_interval_s":     self.flush_interval,
+            "max_request_alerts":   self.max_request_alerts,
+            "accepted":             self.accepted,
+            "rejected_requests":    self.rejected_requests,
+            "rejected_alerts":      self.rejected_alerts,
+            "inline_writes":        self.inline_writes,
+            "created":              self.created,
+            "duplicates":           self.duplicates,
+            "failed":               self.failed,
+            "retries":              self.retries,
+            "dead_letters":         len(self._dead_letters),
+            "dead_lettered":        self.dead_lettered,
+            "dead_letters_dropped": self.dead_letters_dropped,
+            "unresolved":           dict(self.unresolved),
+            "batches":              self.batches,
+            "last_flush_ms":        round(self.last_flush_ms, 2),
+            "avg_flush_ms":         round(self._total_flush_ms / self.batches, 2) if self.batches else 0.0,
+            "max_flush_ms":         round(self.max_flush_ms, 2),
+            "retry_after_s":        self.retry_after(),
+        }
+
+
+def create_alert_ingest_queue(client) -> AlertIngestQueue:
+    """Build the queue from ALERT_INGEST_* environment settings."""
+    # Inline writes where batch boundaries must not depend on timing (db/replay.py)
+    deterministic = client.backend == "replay" or bool(os.getenv("GRAPH_RECORD"))
+    return AlertIngestQueue(
+        client,
+        enabled=os.getenv("ALERT_INGEST_QUEUE", "true").lower() == "true" and not deterministic,
+        max_size=int(os.getenv("ALERT_INGEST_MAX_SIZE", "10000")),
+        batch_size=int(os.getenv("ALERT_INGEST_BATCH_SIZE", "500")),
+        flush_interval=int(os.getenv("ALERT_INGEST_FLUSH_INTERVAL_MS", "200")) / 1000,
+        max_request_alerts=int(os.getenv("ALERT_INGEST_MAX_REQUEST_ALERTS", "5000")),
+        retry_after_seconds=int(os.getenv("ALERT_INGEST_RETRY_AFTER_SECONDS", "1")),
+        max_attempts=int(os.getenv("ALERT_INGEST_MAX_ATTEMPTS", "3")),
+        retry_backoff=int(os.getenv("ALERT_INGEST_RETRY_BACKOFF_MS", "500")) / 1000,
+        dead_letter_size=int(os.getenv("ALERT_INGEST_DEAD_LETTERS", "10000")),
+    )
+
+
+# Module-level singleton, started/stopped by main.py lifecycle events
+alert_ingest = create_alert_ingest_queue(neo4j_client)
@@ -0,0 +1,117 @@
+"""
+Analysis Store — Short-lived tokens linking /alert/analyze to /action/execute
+
+The analyst clicks Analyze, reads the recommendation, then clicks Execute.
+Without a token, execute re-reads the context and re-runs decide, narrate
+(a full LLM call), analyze_situation and the factor lookups — and may
+commit a different decision or reasoning than the one on screen.
+
+analyze_alert stores what it showed and returns an analysis_token. The
+stored fields are the context, the decision, the reasoning, the situation
+type, the factor names and the precedent factor vector. execute_action
+with that token commits exactly that analysis, with no graph read and no
+LLM call.
+
+Tokens are single use, expire after ANALYSIS_TOKEN_TTL_SECONDS and live
+in a bounded LRU. execute_action reserve()s the token (marks it in
+flight), so a concurrent execute with the same token — a double click —
+is rejected. Once the decision trace is queued the token is redeem()ed
+(removed): a later failure cannot be retried into a second trace. If
+execute fails before anything was queued it release()s the reservation
+and the same token can be retried. A request for the wrong alert does not
+touch the token. An expired, evicted, in-flight or already used token is
+rejected with 409 so the UI re-runs analyze. Execute without a token keeps
+the recompute path.
+
+Configuration (env):
+  ANALYSIS_TOKEN_STORE_SIZE   max outstanding tokens (default 1024)
+  ANALYSIS_TOKEN_TTL_SECONDS  token lifetime (default 600)
+
+Endpoint:
+  GET /api/alert/analysis-store/stats
+"""
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class AnalysisStore:
+    """Bounded LRU + TTL map of analysis_token -> analysis. Tokens are single use."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Set[str] = set()
+        self.issued = 0
+        self.redeemed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def put(self, analysis: Dict[str, Any]) -> str:
+        """Store one analysis and return its new token, evicting the oldest if full."""
+        token = f"ANL-{uuid.uuid4().hex}"
+        self._entries[token] = (time.monotonic(), analysis)
+        self.issued += 1
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._in_flight.discard(evicted)
+            self.evictions += 1
+        return token
+
+    def reserve(self, token: str, alert_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Token's analysis if it is live, for alert_id and not already in
+        flight, else None. Marks it in flight until redeem() or release().
+        """
+        entry = self._entries.get(token)
+        if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+            del self._entries[token]
+            self._in_flight.discard(token)
+            entry = None
+        if entry is None or entry[1]["alert_id"] != alert_id or token in self._in_flight:
+            self.rejected += 1
+            return None
+        self._in_flight.add(token)
+        self._entries.move_to_end(token)
+        return entry[1]
+
+    def redeem(self, token: str) -> None:
+        """Spend a reserved token: its decision has been queued."""
+        self._in_flight.discard(token)
+        if self._entries.pop(token, None) is not None:
+            self.redeemed += 1
+
+    def release(self, token: str) -> None:
+        """Drop the reservation after an execute that queued nothing; the token stays usable."""
+        self._in_flight.discard(token)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._in_flight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "outstanding": len(self._entries),
+            "in_flight":   len(self._in_flight),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "issued":      self.issued,
+            "redeemed":    self.redeemed,
+            "rejected":    self.rejected,
+            "evictions":   self.evictions,
+        }
+
+
+def create_analysis_store() -> AnalysisStore:
+    """Build the store from ANALYSIS_TOKEN_* environment settings."""
+    return AnalysisStore(
+        max_entries=int(os.getenv("ANALYSIS_TOKEN_STORE_SIZE", "1024")),
+        ttl_seconds=float(os.getenv("ANALYSIS_TOKEN_TTL_SECONDS", "600")),
+    )
+
+
+# Global store instance
+analysis_store = create_analysis_store()
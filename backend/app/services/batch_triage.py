@@ -0,0 +1,230 @@
+"""
+Batch Triage — Analyze many alerts with bounded concurrency, streamed as NDJSON
+
+Runs the /alert/process pipeline without its writes — situation analysis,
+agent decision, narration, eval gates — for a list of alert IDs or a
+filter over the pending queue (the /alerts/queue query). Nothing is
+written to the graph and no decision trace is recorded. Use the
+per-alert endpoints to act on a recommendation.
+
+Contexts are loaded with Neo4jClient.get_security_contexts(), one UNWIND
+round trip per BATCH_TRIAGE_CONTEXT_CHUNK alerts, and served from the
+context cache where it is warm. A producer fetches chunk by chunk into a
+bounded work queue. `concurrency` workers run the pipeline, so narration
+calls overlap, and the next chunk is fetched while the current one is
+being analyzed. Results are yielded as each alert finishes (completion
+order, not request order).
+
+NDJSON lines:
+  {"type": "batch", "alerts", "concurrency", "started_at"}
+  {"type": "result", "alert_id", "status": "analyzed", "situation_analysis",
+   "recommendation", "eval_gate", "elapsed_ms"}
+  {"type": "result", "alert_id", "status": "not_found"}
+  {"type": "result", "alert_id", "status": "error", "error"}
+  {"type": "batch_complete", "analyzed", "not_found", "failed", "elapsed_ms", "alerts_per_second"}
+
+Configuration (env):
+  BATCH_TRIAGE_CONCURRENCY       default alerts analyzed at once (default 8)
+  BATCH_TRIAGE_MAX_CONCURRENCY   upper bound on a request's concurrency (default 32)
+  BATCH_TRIAGE_CONTEXT_CHUNK     alerts per batched context fetch (default 50)
+
+Endpoint:
+  POST /api/alerts/analyze-batch
+"""
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+_DONE = object()  # one per worker, so the consumer knows when every result is in
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+def _client(client=None):
+    if client is None:
+        from app.db.neo4j import neo4j_client
+        client = neo4j_client
+    return client
+
+
+def resolve_concurrency(concurrency: Optional[int] = None) -> int:
+    """Requested concurrency (BATCH_TRIAGE_CONCURRENCY if None), clamped to [1, BATCH_TRIAGE_MAX_CONCURRENCY]."""
+    limit = _env_int("BATCH_TRIAGE_MAX_CONCURRENCY", 32)
+    requested = concurrency or _env_int("BATCH_TRIAGE_CONCURRENCY", 8)
+    return max(1, min(requested, limit))
+
+
+async def select_alert_ids(
+    severity: Optional[str] = None,
+    alert_type: Optional[str] = None,
+    asset_criticality: Optional[str] = None,
+    user: Optional[str] = None,
+    limit: int = 100,
+    client=None,
+) -> List[str]:
+    """Pending alerts (newest first) matching the filters, up to limit — the /alerts/queue query."""
+    client = _client(client)
+    alert_ids: List[str] = []
+    cursor = None
+    while len(alert_ids) < limit:
+        page = await client.get_alert_queue(
+            limit=min(limit - len(alert_ids), 200), cursor=cursor, severity=severity,
+            alert_type=alert_type, asset_criticality=asset_criticality, user=user,
+        )
+        alert_ids.extend(record["alert"]["id"] for record in page["alerts"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    return alert_ids
+
+
+# ============================================================================
+# Pipeline (one alert)
+# ============================================================================
+
+async def analyze_alert_context(alert_id: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """Situation -> decide -> narrate -> gates for one alert whose context is already loaded."""
+    from app.services.agent import agent
+    from app.services.reasoning import narrator
+    from app.services.situation import analyze_situation
+
+    started = time.perf_counter()
+    alert_type = context.get("alert_type")
+    situation_analysis = analyze_situation(alert_type, context)
+    decision = agent.decide(alert_type, context)
+    reasoning = await narrator.generate_reasoning(alert_type, decision.action, context)
+    eval_result = agent.evaluate_gates(decision, context, reasoning)
+
+    return {
+        "type": "result",
+        "alert_id": alert_id,
+        "status": "analyzed",
+        "situation_analysis": situation_analysis.model_dump(),
+        "recommendation": {
+            "action": decision.action,
+            "confidence": decision.confidence,
+            "reasoning": reasoning,
+            "pattern_id": decision.pattern_id,
+            "playbook_id": decision.playbook_id,
+        },
+        "eval_gate": {
+            "checks": eval_result["checks"],
+            "overall_passed": eval_result["overall_passed"],
+            "overall_score": eval_result["overall_score"],
+        },
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+# ============================================================================
+# Batch
+# ============================================================================
+
+async def analyze_batch(
+    alert_ids: List[str],
+    concurrency: Optional[int] = None,
+    context_chunk: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Header, one result per distinct alert in completion order, then a summary."""
+    client = _client(client)
+    alert_ids = list(dict.fromkeys(alert_ids))
+    concurrency = resolve_concurrency(concurrency)
+    context_chunk = context_chunk or _env_int("BATCH_TRIAGE_CONTEXT_CHUNK", 50)
+    started = time.perf_counter()
+    yield {
+        "type": "batch",
+        "alerts": len(alert_ids),
+        "concurrency": concurrency,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+    }
+
+    # Bounded: the producer stays at most one context chunk ahead of the workers
+    work: asyncio.Queue = asyncio.Queue(maxsize=context_chunk)
+    results: asyncio.Queue = asyncio.Queue()
+
+    async def produce() -> None:
+        closed = False
+        try:
+            for offset in range(0, len(alert_ids), context_chunk):
+                chunk = alert_ids[offset:offset + context_chunk]
+                try:
+                    contexts = await client.get_security_contexts(chunk)
+                except Exception as exc:
+                    print(f"[BATCH] Context fetch for {len(chunk)} alert(s) failed: {exc}")
+                    for alert_id in chunk:
+                        results.put_nowait({"type": "result", "alert_id": alert_id, "status": "error", "error": str(exc)})
+                    continue
+                for alert_id in chunk:
+                    await work.put((alert_id, contexts.get(alert_id)))
+        except asyncio.CancelledError:
+            closed = True
+            raise
+        finally:
+            # Stream closed: the workers are cancelled too, and a put into the
+            # full queue would never return
+            if not closed:
+                for _ in range(concurrency):
+                    await work.put(_DONE)
+
+    async def worker() -> None:
+        while True:
+            item = await work.get()
+            if item is _DONE:
+                results.put_nowait(_DONE)
+                return
+            alert_id, context = item
+            if not context:
+                results.put_nowait({"type": "result", "alert_id": alert_id, "status": "not_found"})
+                continue
+            try:
+                results.put_nowait(await analyze_alert_context(alert_id, context))
+            except Exception as exc:
+                print(f"[BATCH] Analysis failed for {alert_id}: {exc}")
+                results.put_nowait({"type": "result", "alert_id": alert_id, "status": "error", "error": str(exc)})
+
+    tasks = [asyncio.create_task(produce())] + [asyncio.create_task(worker()) for _ in range(concurrency)]
+    counts = {"analyzed": 0, "not_found": 0, "error": 0}
+    try:
+        finished = 0
+        while finished < concurrency:
+            result = await results.get()
+            if result is _DONE:
+                finished += 1
+                continue
+            counts[result["status"]] += 1
+            yield result
+    finally:
+        # Client went away mid-stream: stop the producer and workers
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"[BATCH] {len(alert_ids)} alert(s) in {elapsed * 1000:.1f}ms at concurrency {concurrency}: "
+        f"{counts['analyzed']} analyzed, {counts['not_found']} not found, {counts['error']} failed"
+    )
+    yield {
+        "type": "batch_complete",
+        "analyzed": counts["analyzed"],
+        "not_found": counts["not_found"],
+        "failed": counts["error"],
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "alerts_per_second": round(len(alert_ids) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+async def ndjson_lines(
+    alert_ids: List[str],
+    concurrency: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[str]:
+    async for record in analyze_batch(alert_ids, concurrency, client=client):
+        yield json.dumps(record, default=str) + "\n"
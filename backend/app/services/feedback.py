@@ -85,6 +85,11 @@ def process_outcome(
     Returns:
         OutcomeResponse with graph updates and narrative
     """
+    # Outcome travels with the decision when it is retrieved as a precedent
+    # (persisted on the Decision node by the router)
+    from app.services.precedents import precedent_index
+    precedent_index.record_outcome(decision_id, outcome)
+
     # Determine pattern based on alert ID
     if "7823" in alert_id:
         pattern_id = "PAT-TRAVEL-001"
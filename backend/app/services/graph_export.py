@@ -0,0 +1,327 @@
+"""
+Graph Export — Stream the security graph as NDJSON or per-label CSV for offline analytics
+
+Walks each exported label (Alert, User, Asset, Decision, EvolutionEvent,
+ThreatIntel — DomainConfig.get_graph_export_labels) in pages of
+GRAPH_EXPORT_PAGE_SIZE nodes. Each page is a keyset range over the label's
+key property (key > last key of the previous page, ORDER BY key LIMIT n —
+an index range scan, no SKIP) and carries every returned node's outgoing
+relationships, so each edge is exported once, from its source node.
+Output is produced page by page: memory is bounded by one page no matter
+how large the graph is.
+
+Incremental export: with `since` (ISO 8601), only nodes that changed at or
+after it are exported, with their outgoing relationships:
+
+  Alert           created, ingested or status changed (the latest of
+                  timestamp, ingested_at, status_updated_at)
+  Decision        created or outcome recorded (outcome_at)
+  EvolutionEvent  created
+  ThreatIntel     refreshed
+  User, Asset     reference data, no change time — full exports only
+                  (listed under "skipped" in the header)
+
+The NDJSON header carries started_at. Pass it as the next run's `since`
+to pick up everything that changed during and after this export.
+
+NDJSON lines:
+  {"type": "export", "started_at", "since", "labels", "skipped"}
+  {"type": "node", "label", "key", "properties"}
+  {"type": "relationship", "rel_type", "source_label", "source", "target_label", "target", "properties"}
+  {"type": "export_complete", "nodes", "relationships", "elapsed_ms"}
+
+CSV: one nodes file and one relationships file per label. The nodes
+columns are `key` plus the properties seen on the label's first page.
+Properties that appear later go into a JSON `extra` column, so the header
+never needs a second pass.
+
+Temporal values are written as ISO 8601 strings.
+
+Configuration (env):
+  GRAPH_EXPORT_PAGE_SIZE   nodes per page (default 500)
+
+Endpoints:
+  GET /api/graph/export?labels=&since=               NDJSON stream
+  GET /api/graph/export/csv?label=&kind=&since=      one label's nodes / relationships CSV
+
+CLI:
+  python -m app.services.graph_export --out graph.ndjson [--since ISO] [--labels Alert,Decision]
+  python -m app.services.graph_export --format csv --out export_dir/
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+
+NODE_KIND = "nodes"
+RELATIONSHIP_KIND = "relationships"
+RELATIONSHIP_COLUMNS = ["rel_type", "source_label", "source", "target_label", "target", "properties"]
+
+
+def _page_size(page_size: Optional[int]) -> int:
+    return page_size or int(os.getenv("GRAPH_EXPORT_PAGE_SIZE", "500"))
+
+
+def _plain(value: Any) -> Any:
+    """JSON/CSV-safe copy of a graph value (temporal types -> ISO 8601)."""
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _client(client=None):
+    if client is None:
+        from app.db.neo4j import neo4j_client
+        client = neo4j_client
+    return client
+
+
+def export_labels(client=None, labels: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Spec of each requested label (all exported labels by default). ValueError for unknown ones."""
+    from app.core.domain_registry import get_domain_config
+
+    available = get_domain_config(_client(client).queries.domain).get_graph_export_labels()
+    if not labels:
+        return available
+    unknown = [label for label in labels if label not in available]
+    if unknown:
+        raise ValueError(f"Unknown export label(s) {unknown}; exported labels: {sorted(available)}")
+    return {label: available[label] for label in labels}
+
+
+def parse_since(since: Optional[str]) -> Optional[str]:
+    """Normalize an ISO 8601 `since` to UTC. ValueError if it does not parse."""
+    if not since:
+        return None
+    try:
+        parsed = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Invalid since timestamp: {since!r} (expected ISO 8601)") from None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+# ============================================================================
+# Paging
+# ============================================================================
+
+async def export_pages(
+    label: str,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield pages of {key, properties, relationships} for one label, in key order."""
+    client = _client(client)
+    limit = _page_size(page_size)
+    after = ""
+    while True:
+        page = await client.export_page(label, after=after, since=since, limit=limit)
+        if page:
+            yield page
+        if len(page) < limit:
+            return
+        after = page[-1]["key"]
+
+
+def _relationship_records(label: str, row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "rel_type":     rel["type"],
+            "source_label": label,
+            "source":       row["key"],
+            "target_label": rel["target_label"],
+            "target":       rel["target"],
+            "properties":   _plain(rel.get("properties") or {}),
+        }
+        for rel in row["relationships"]
+    ]
+
+
+# ============================================================================
+# NDJSON
+# ============================================================================
+
+async def export_records(
+    labels: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Header, then every node and relationship, then a completion record."""
+    client = _client(client)
+    specs = export_labels(client, labels)
+    since = parse_since(since)
+    skipped = [label for label, spec in specs.items() if since and not spec.get("changed")]
+    started = time.perf_counter()
+    yield {
+        "type":       "export",
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "since":      since,
+        "labels":     [label for label in specs if label not in skipped],
+        "skipped":    skipped,
+    }
+
+    nodes = relationships = 0
+    for label in specs:
+        if label in skipped:
+            continue
+        async for page in export_pages(label, since, page_size, client):
+            for row in page:
+                nodes += 1
+                yield {"type": "node", "label": label, "key": row["key"], "properties": _plain(row["properties"])}
+                for rel in _relationship_records(label, row):
+                    relationships += 1
+                    yield {"type": "relationship", **rel}
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    print(f"[EXPORT] {nodes} nodes, {relationships} relationships in {elapsed_ms}ms (since={since})")
+    yield {"type": "export_complete", "nodes": nodes, "relationships": relationships, "elapsed_ms": elapsed_ms}
+
+
+async def ndjson_lines(
+    labels: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[str]:
+    async for record in export_records(labels, since, page_size, client):
+        yield json.dumps(record, default=str) + "\n"
+
+
+# ============================================================================
+# CSV
+# ============================================================================
+
+async def csv_chunks(
+    label: str,
+    kind: str = NODE_KIND,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client=None,
+) -> AsyncIterator[str]:
+    """One label's nodes or relationships as CSV text, one chunk per page."""
+    client = _client(client)
+    spec = export_labels(client, [label])[label]
+    if kind not in (NODE_KIND, RELATIONSHIP_KIND):
+        raise ValueError(f"kind must be '{NODE_KIND}' or '{RELATIONSHIP_KIND}', got {kind!r}")
+    since = parse_since(since)
+
+    columns: Optional[List[str]] = RELATIONSHIP_COLUMNS if kind == RELATIONSHIP_KIND else None
+    if columns is not None:
+        yield _csv_row(columns)
+    if since and not spec.get("changed"):
+        if columns is None:
+            yield _csv_row(["key", "extra"])
+        return
+
+    async for page in export_pages(label, since, page_size, client):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if kind == RELATIONSHIP_KIND:
+            for row in page:
+                for rel in _relationship_records(label, row):
+                    rel["properties"] = json.dumps(rel["properties"], sort_keys=True, default=str)
+                    writer.writerow([rel[column] for column in columns])
+        else:
+            if columns is None:
+                names = sorted({name for row in page for name in row["properties"]})
+                columns = ["key"] + names + ["extra"]
+                writer.writerow(columns)
+            known = set(columns)
+            for row in page:
+                properties = _plain(row["properties"])
+                extra = {name: value for name, value in properties.items() if name not in known}
+                writer.writerow(
+                    [row["key"]]
+                    + [_csv_value(properties.get(name)) for name in columns[1:-1]]
+                    + [json.dumps(extra, sort_keys=True, default=str) if extra else ""]
+                )
+        yield buffer.getvalue()
+
+    if columns is None:
+        yield _csv_row(["key", "extra"])
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return "" if value is None else value
+
+
+def _csv_row(values: List[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+async def export_csv_directory(
+    directory: str,
+    labels: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    page_size: Optional[int] = None,
+    client=None,
+) -> Dict[str, str]:
+    """Write <Label>.nodes.csv and <Label>.relationships.csv per label. Returns {file: path}."""
+    client = _client(client)
+    since = parse_since(since)
+    os.makedirs(directory, exist_ok=True)
+    written = {}
+    for label in export_labels(client, labels):
+        for kind in (NODE_KIND, RELATIONSHIP_KIND):
+            filename = f"{label}.{kind}.csv"
+            path = os.path.join(directory, filename)
+            with open(path, "w", encoding="utf-8", newline="") as handle:
+                async for chunk in csv_chunks(label, kind, since, page_size, client):
+                    handle.write(chunk)
+            written[filename] = path
+    print(f"[EXPORT] Wrote {len(written)} CSV files to {directory}")
+    return written
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+async def _run_cli(args: argparse.Namespace) -> None:
+    from app.db.neo4j import neo4j_client
+
+    labels = [label.strip() for label in args.labels.split(",") if label.strip()] if args.labels else None
+    await neo4j_client.connect()
+    try:
+        if args.format == "csv":
+            await export_csv_directory(args.out, labels, args.since, args.page_size)
+        else:
+            with open(args.out, "w", encoding="utf-8") as handle:
+                async for line in ndjson_lines(labels, args.since, args.page_size):
+                    handle.write(line)
+    finally:
+        await neo4j_client.close()
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Load .env BEFORE the graph client is imported (it reads os.getenv at import time)
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Export the security graph for offline analytics")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--out", required=True, help="NDJSON file, or directory for CSV")
+    parser.add_argument("--since", help="ISO 8601 timestamp: only nodes changed since (incremental)")
+    parser.add_argument("--labels", help="Comma-separated labels (default: all exported labels)")
+    parser.add_argument("--page-size", type=int, help="Nodes per page (default GRAPH_EXPORT_PAGE_SIZE)")
+    asyncio.run(_run_cli(parser.parse_args()))
@@ -0,0 +1,273 @@
+"""
+Precedent Index — k nearest past decisions by factor vector
+
+Every decision is reduced to a factor vector, each value in [0, 1]:
+
+  travel_match            VPN origin matches travel destination (0.5: traveling, no match)
+  device_trust            device fingerprint matched
+  user_risk               user risk score
+  asset_criticality       low 0.25 / medium 0.5 / high 0.75 / critical 1.0
+  threat_intel_severity   highest severity of IOCs linked to the alert
+                          (same scale as the threat_intel_enrichment factor)
+
+The vector is stored on the DecisionContext node (factor_vector) and
+appended to an in-process index as Neo4jClient.create_decision_traces()
+writes each decision. That happens on flush for write-behind rows. On
+startup the index is rebuilt from the graph. search() answers "which
+prior decisions looked like this one, and how did they turn out" by exact
+brute-force Euclidean distance in NumPy.
+
+Layout: vectors live in fixed-size float32 blocks (PRECEDENT_BLOCK_ROWS
+rows each). An append writes one row into the last block and allocates a
+new block only when it is full — no reallocation or copying of existing
+rows. A search takes the top k of each block with argpartition and merges
+those candidates, so the cost stays linear in rows with small constants.
+Thousands of decisions search in well under a millisecond.
+
+Outcomes: analyst feedback (services/feedback.py) names the decision it is
+about. It is stored on the Decision node (Neo4jClient.record_decision_outcomes,
+via write-behind), read back by the rebuild, and returned with the decision
+as a precedent. Feedback that arrives before its decision is indexed (the
+trace is still queued) is held and applied when the decision is added.
+
+Configuration (env):
+  PRECEDENT_BLOCK_ROWS   rows per block (default 1024)
+
+Endpoints:
+  GET /api/alert/{alert_id}/precedents?k=5
+  GET /api/precedents/stats
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.services.triage import _SEVERITY_VALUE
+
+
+# Outcomes held for decisions not yet indexed (oldest dropped beyond this)
+_PENDING_OUTCOMES_KEPT = 1024
+
+PRECEDENT_FACTORS = ("travel_match", "device_trust", "user_risk", "asset_criticality", "threat_intel_severity")
+
+_CRITICALITY_VALUE: Dict[str, float] = {
+    "low":      0.25,
+    "medium":   0.5,
+    "high":     0.75,
+    "critical": 1.0,
+}
+
+
+# ============================================================================
+# Factor vectors
+# ============================================================================
+
+def precedent_factor_vector(context: Dict[str, Any], threat_intel_severity: float = 0.0) -> List[float]:
+    """Factor vector (PRECEDENT_FACTORS order) from a security context."""
+    if context.get("vpn_matches_location"):
+        travel = 1.0
+    elif context.get("user_traveling"):
+        travel = 0.5
+    else:
+        travel = 0.0
+    return [
+        travel,
+        1.0 if context.get("device_fingerprint_match") else 0.0,
+        float(context.get("user_risk_score") or 0.0),
+        _CRITICALITY_VALUE.get(str(context.get("asset_criticality") or "").lower(), 0.5),
+        float(threat_intel_severity),
+    ]
+
+
+def threat_intel_severity(rows: List[Dict[str, Any]]) -> float:
+    """Highest severity value among an alert's linked IOCs (0.0 if none)."""
+    return max((_SEVERITY_VALUE.get(str(row.get("severity") or "none").lower(), 0.0) for row in rows), default=0.0)
+
+
+async def alert_threat_intel_severity(alert_id: str) -> float:
+    """threat_intel_severity() of the alert's IOCs, read from the graph (0.0 if the lookup fails)."""
+    from app.db.neo4j import neo4j_client
+
+    try:
+        intel = await neo4j_client.get_threat_intel_for_alert(alert_id)
+    except Exception as exc:
+        print(f"[PRECEDENTS] Threat-intel lookup failed for {alert_id}: {exc}")
+        intel = []
+    return threat_intel_severity(intel)
+
+
+async def precedent_vector_for_alert(alert_id: str, context: Dict[str, Any]) -> List[float]:
+    """Factor vector for an alert being decided now (threat intel read from the graph)."""
+    return precedent_factor_vector(context, await alert_threat_intel_severity(alert_id))
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class PrecedentIndex:
+    """Exact k-NN over decision factor vectors, stored in fixed-size NumPy blocks."""
+
+    def __init__(self, dims: int = len(PRECEDENT_FACTORS), block_rows: int = 1024) -> None:
+        self.dims = dims
+        self.block_rows = block_rows
+        self.searches = 0
+        self._search_seconds = 0.0
+        self.clear()
+
+    def clear(self) -> None:
+        self._blocks: List[np.ndarray] = []
+        self._alert_codes: List[np.ndarray] = []  # per-row alert code, to exclude the alert itself
+        self._meta: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}            # decision_id -> row
+        self._alert_code: Dict[str, int] = {}
+        self._pending_outcomes: Dict[str, str] = {}  # decision_id -> outcome, not yet indexed
+
+    def __len__(self) -> int:
+        return len(self._meta)
+
+    def add(
+        self,
+        decision_id: str,
+        vector: Sequence[float],
+        alert_id: str,
+        action: Optional[str] = None,
+        confidence: Optional[float] = None,
+        timestamp: Optional[str] = None,
+        outcome: Optional[str] = None,
+    ) -> None:
+        """Index (or re-index) one decision."""
+        if len(vector) != self.dims:
+            raise ValueError(f"Precedent vector has {len(vector)} values, expected {self.dims}")
+        row = self._rows.get(decision_id)
+        if row is None:
+            row = len(self._meta)
+            if row % self.block_rows == 0:
+                self._blocks.append(np.zeros((self.block_rows, self.dims), dtype=np.float32))
+                self._alert_codes.append(np.full(self.block_rows, -1, dtype=np.int32))
+            self._meta.append({})
+            self._rows[decision_id] = row
+        code = self._alert_code.setdefault(alert_id, len(self._alert_code))
+        block, offset = divmod(row, self.block_rows)
+        self._blocks[block][offset] = vector
+        self._alert_codes[block][offset] = code
+        outcome = self._pending_outcomes.pop(decision_id, None) or outcome or self._meta[row].get("outcome")
+        self._meta[row] = {
+            "decision_id": decision_id,
+            "alert_id":    alert_id,
+            "action":      action,
+            "confidence":  confidence,
+            "timestamp":   timestamp,
+            "outcome":     outcome,
+        }
+
+    def record_outcome(self, decision_id: str, outcome: str) -> bool:
+        """
+        Attach analyst feedback to a decision. Returns False if the decision
+        is not indexed yet; the outcome is then applied when it is added.
+        """
+        row = self._rows.get(decision_id)
+        if row is None:
+            self._pending_outcomes[decision_id] = outcome
+            while len(self._pending_outcomes) > _PENDING_OUTCOMES_KEPT:
+                del self._pending_outcomes[next(iter(self._pending_outcomes))]
+            return False
+        self._meta[row]["outcome"] = outcome
+        return True
+
+    def search(self, vector: Sequence[float], k: int = 5, exclude_alert: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The k nearest decisions (Euclidean), closest first, excluding decisions on exclude_alert."""
+        started = time.perf_counter()
+        query = np.asarray(vector, dtype=np.float32)
+        excluded = self._alert_code.get(exclude_alert, -2) if exclude_alert is not None else -2
+        size = len(self._meta)
+
+        candidate_rows: List[np.ndarray] = []
+        candidate_distances: List[np.ndarray] = []
+        for index, block in enumerate(self._blocks):
+            filled = min(self.block_rows, size - index * self.block_rows)
+            diff = block[:filled] - query
+            distances = np.einsum("ij,ij->i", diff, diff)
+            distances[self._alert_codes[index][:filled] == excluded] = np.inf
+            if filled > k:
+                top = np.argpartition(distances, k)[:k]
+            else:
+                top = np.arange(filled)
+            candidate_rows.append(top + index * self.block_rows)
+            candidate_distances.append(distances[top])
+
+        results = []
+        if candidate_rows:
+            rows = np.concatenate(candidate_rows)
+            distances = np.concatenate(candidate_distances)
+            for position in np.argsort(distances, kind="stable")[:k]:
+                distance = float(distances[position])
+                if not np.isfinite(distance):
+                    break
+                distance = float(np.sqrt(distance))
+                results.append({
+                    **self._meta[int(rows[position])],
+                    "distance":   round(distance, 4),
+                    "similarity": round(1.0 / (1.0 + distance), 4),
+                })
+
+        self.searches += 1
+        self._search_seconds += time.perf_counter() - started
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        outcomes: Dict[str, int] = {}
+        for meta in self._meta:
+            if meta.get("outcome"):
+                outcomes[meta["outcome"]] = outcomes.get(meta["outcome"], 0) + 1
+        return {
+            "decisions":     len(self._meta),
+            "alerts":        len(self._alert_code),
+            "blocks":        len(self._blocks),
+            "block_rows":    self.block_rows,
+            "factors":       list(PRECEDENT_FACTORS),
+            "outcomes":      outcomes,
+            "searches":      self.searches,
+            "avg_search_us": round(self._search_seconds / self.searches * 1e6, 1) if self.searches else 0.0,
+        }
+
+    # ------------------------------------------------------------------------
+    # Graph sync
+    # ------------------------------------------------------------------------
+
+    def add_decision_rows(self, rows: List[Dict[str, Any]], created: List[str]) -> None:
+        """Index written decision_trace_row()s (called by Neo4jClient.create_decision_traces)."""
+        written = set(created)
+        for row in rows:
+            vector = row.get("factor_vector")
+            if vector and row["decision_id"] in written:
+                self.add(row["decision_id"], vector, row["alert_id"], row["action"], row["confidence"], row.get("timestamp"))
+
+    async def rebuild(self, client=None) -> int:
+        """Reload every decision that has a factor vector from the graph."""
+        if client is None:
+            from app.db.neo4j import neo4j_client
+            client = neo4j_client
+        self.clear()
+        async for record in client.stream_precedent_vectors():
+            timestamp = record.get("timestamp")
+            if hasattr(timestamp, "iso_format"):
+                timestamp = timestamp.iso_format()
+            elif hasattr(timestamp, "isoformat"):
+                timestamp = timestamp.isoformat()
+            self.add(
+                record["decision_id"], record["factor_vector"], record["alert_id"],
+                record.get("action"), record.get("confidence"), timestamp, record.get("outcome"),
+            )
+        print(f"[PRECEDENTS] Indexed {len(self)} decisions in {len(self._blocks)} block(s)")
+        return len(self)
+
+
+def create_precedent_index() -> PrecedentIndex:
+    """Build the index from PRECEDENT_* environment settings."""
+    return PrecedentIndex(block_rows=int(os.getenv("PRECEDENT_BLOCK_ROWS", "1024")))
+
+
+# Global index instance
+precedent_index = create_precedent_index()
@@ -2,8 +2,10 @@
 Neo4j Database Seeding Service
 Seeds the SOC Copilot Demo with canonical test data
 """
-from typing import Dict, Any, List
-from app.db.neo4j import neo4j_client
+import json
+from typing import Dict, Any, Iterable, List, Optional
+from app.db.neo4j import neo4j_client, decision_snapshot_properties, evolution_state_properties
+from app.services.precedents import precedent_factor_vector, precedent_index
 
 
 # =============================================================================
@@ -104,28 +106,127 @@ TRIGGERED_EVOLUTIONS = [
 ]
 
 
+def alert_business_units() -> Dict[str, Optional[str]]:
+    """Seed alert id -> business unit of the asset it was detected on (the partition key)."""
+    units = {asset["asset_id"]: asset.get("business_unit") for asset in ASSETS}
+    return {alert["alert_id"]: units.get(alert["asset_id"]) for alert in ALERTS}
+
+
+def seed_partition_rows(alert_ids: Optional[Iterable[str]] = None) -> Dict[str, List]:
+    """
+    The alert-owned seed rows for a set of alerts (all alerts when None):
+    alerts, their decisions, decision contexts, evolution events and
+    alert/evolution relationship mappings.
+    """
+    if alert_ids is None:
+        return {
+            "alerts": ALERTS, "decisions": DECISIONS, "contexts": CONTEXTS, "evolutions": EVOLUTIONS,
+            "alert_patterns": ALERT_PATTERN_MAPPINGS, "triggered_evolutions": TRIGGERED_EVOLUTIONS,
+        }
+    alert_ids = set(alert_ids)
+    decisions = [d for d in DECISIONS if d["alert_id"] in alert_ids]
+    decision_ids = {d["id"] for d in decisions}
+    return {
+        "alerts": [a for a in ALERTS if a["alert_id"] in alert_ids],
+        "decisions": decisions,
+        "contexts": [c for c in CONTEXTS if c["decision_id"] in decision_ids],
+        "evolutions": [e for e in EVOLUTIONS if e["triggered_by"] in decision_ids],
+        "alert_patterns": [(a, p) for a, p in ALERT_PATTERN_MAPPINGS if a in alert_ids],
+        "triggered_evolutions": [te for te in TRIGGERED_EVOLUTIONS if te["decision_id"] in decision_ids],
+    }
+
+
+def seed_context_properties(context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    DecisionContext properties for a seed context, with the typed user/asset
+    snapshot fields and the precedent factor vector derived from its
+    decision's alert (same shape as Neo4jClient.decision_trace_row).
+    """
+    decision = next(d for d in DECISIONS if d["id"] == context["decision_id"])
+    alert = next(a for a in ALERTS if a["alert_id"] == decision["alert_id"])
+    user = next((u for u in USERS if u["user_id"] == alert["user_id"]), {})
+    asset = next((a for a in ASSETS if a["asset_id"] == alert["asset_id"]), {})
+    travel = next((t for t in TRAVEL_RECORDS if t["user_id"] == alert["user_id"]), None)
+    factor_vector = precedent_factor_vector({
+        "user_traveling": travel is not None,
+        "vpn_matches_location": travel is not None and travel["destination"] == alert["source_location"],
+        "user_risk_score": user.get("risk_score"),
+        "asset_criticality": asset.get("criticality"),
+    })
+    return {
+        **context,
+        **decision_snapshot_properties({"user": user, "asset": asset}),
+        "factor_vector": factor_vector,
+    }
+
+
+def seed_evolution_properties(evolution: Dict[str, Any]) -> Dict[str, Any]:
+    """EvolutionEvent properties for a seed event, plus flattened before_*/after_* values."""
+    before = json.loads(evolution["before_state"])
+    after = json.loads(evolution["after_state"])
+    return {**evolution, **evolution_state_properties(before, after)}
+
+
 # =============================================================================
 # SEEDING FUNCTIONS
 # =============================================================================
 
-async def seed_neo4j_database() -> Dict[str, Any]:
+async def seed_neo4j_database(client=None, alert_ids: Optional[Iterable[str]] = None) -> Dict[str, Any]:
     """
     Seed Neo4j database with canonical test data.
     Clears existing data and creates all nodes and relationships.
+
+    client defaults to the global neo4j_client; alert_ids limits the alerts
+    (and the decisions / contexts / evolution events that hang off them) to
+    one partition's share. Reference data is always seeded in full.
+
+    Seeding the global client also rebuilds the precedent index from the
+    new graph, so /demo/seed and /demo/reset-all leave no stale precedents.
     """
+    client = client or neo4j_client
+    summary = await _seed_graph(client, alert_ids)
+    # A partition seeded on its own is indexed by the caller's rebuild
+    if client is neo4j_client:
+        summary["precedents_indexed"] = await precedent_index.rebuild(client)
+        print(f"[SEED] ✓ Precedent index rebuilt ({summary['precedents_indexed']} decisions)")
+    return summary
+
+
+async def _seed_graph(client, alert_ids: Optional[Iterable[str]]) -> Dict[str, Any]:
     print("[SEED] Starting Neo4j database seeding...")
     summary = {}
+    rows = seed_partition_rows(alert_ids)
+
+    if client.backend == "partitioned":
+        # Each partition seeded with its business units' alerts
+        from app.db.schema import apply_schema
+        summary = await client.seed_partitions()
+        schema = await apply_schema()
+        summary["schema_applied"] = len(schema["applied"])
+        print("[SEED] ✓ Partitioned graph seeded")
+        return summary
+
+    if client.backend == "memory":
+        # In-process graph: rebuild from the same lists without Cypher
+        from app.db.schema import apply_schema
+        summary = client.load_seed_data()
+        schema = await apply_schema()
+        summary["schema_applied"] = len(schema["applied"])
+        print("[SEED] ✓ In-memory graph seeded")
+        return summary
 
     try:
         # Step 1: Clear existing data
         print("[SEED] Step 1: Clearing existing data...")
-        await neo4j_client.run_query("MATCH (n) DETACH DELETE n")
+        await client.write("MATCH (n) DETACH DELETE n")
+        client.invalidate_security_context()
+        client.stale_results.clear()
         print("[SEED] ✓ Database cleared")
 
         # Step 2: Create Assets
         print("[SEED] Step 2: Creating Assets...")
         for asset in ASSETS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:Asset {id: $asset_id, hostname: $hostname, type: $type, os: $os, criticality: $criticality, business_unit: $business_unit, owner_id: $owner_id})",
                 asset
             )
@@ -135,7 +236,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 3: Create Users
         print("[SEED] Step 3: Creating Users...")
         for user in USERS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:User {id: $user_id, name: $name, title: $title, department: $department, risk_score: $risk_score, is_privileged: $is_privileged})",
                 user
             )
@@ -145,7 +246,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 4: Create AlertTypes
         print("[SEED] Step 4: Creating AlertTypes...")
         for alert_type in ALERT_TYPES:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:AlertType {id: $id, name: $name, severity: $severity, mitre_technique: $mitre})",
                 alert_type
             )
@@ -155,7 +256,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 5: Create AttackPatterns
         print("[SEED] Step 5: Creating AttackPatterns...")
         for pattern in PATTERNS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:AttackPattern {id: $pattern_id, name: $name, fp_rate: $fp_rate, occurrence_count: $occurrence_count, confidence: $confidence})",
                 pattern
             )
@@ -165,7 +266,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 6: Create Playbooks
         print("[SEED] Step 6: Creating Playbooks...")
         for playbook in PLAYBOOKS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:Playbook {id: $playbook_id, name: $name, sla_minutes: $sla_minutes})",
                 playbook
             )
@@ -175,7 +276,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 7: Create SLAs
         print("[SEED] Step 7: Creating SLAs...")
         for sla in SLAS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:SLA {id: $id, name: $name, response_time_minutes: $response_time_minutes, severity: $severity})",
                 sla
             )
@@ -185,7 +286,7 @@ async def seed_neo4j_database() -> Dict[str, Any]:
         # Step 8: Create TravelContext
         print("[SEED] Step 8: Creating TravelContext...")
         for travel in TRAVEL_RECORDS:
-            await neo4j_client.run_query(
+            await client.write(
                 "CREATE (:TravelContext {id: $travel_id, user_id: $user_id, destination: $destination, start_date: $start_date, end_date: $end_date})",
                 travel
             )
@@ -194,124 +295,132 @@ async def seed_neo4j_database() -> Dict[str, Any]:
 
         # Step 9: Create Alerts
         print("[SEED] Step 9: Creating Alerts...")
-        for alert in ALERTS:
-            await neo4j_client.run_query(
+        for alert in rows["alerts"]:
+            await client.write(
                 "CREATE (:Alert {id: $alert_id, alert_type: $alert_type, severity: $severity, source: $source, source_location: $source_location, status: $status, description: $description, timestamp: datetime()})",
                 alert
             )
-        summary["alerts"] = len(ALERTS)
-        print(f"[SEED] ✓ Created {len(ALERTS)} alerts")
+        summary["alerts"] = len(rows["alerts"])
+        print(f"[SEED] ✓ Created {len(rows['alerts'])} alerts")
 
         # Step 10: Create Decisions
         print("[SEED] Step 10: Creating Decisions...")
-        for decision in DECISIONS:
-            await neo4j_client.run_query(
+        for decision in rows["decisions"]:
+            await client.write(
                 "CREATE (:Decision {id: $id, type: $type, reasoning: $reasoning, confidence: $confidence, timestamp: datetime($timestamp), alert_id: $alert_id, action_taken: $action_taken})",
                 decision
             )
-        summary["decisions"] = len(DECISIONS)
-        print(f"[SEED] ✓ Created {len(DECISIONS)} decisions")
+        summary["decisions"] = len(rows['decisions'])
+        print(f"[SEED] ✓ Created {len(rows['decisions'])} decisions")
 
         # Step 11: Create DecisionContexts
         print("[SEED] Step 11: Creating DecisionContexts...")
-        for context in CONTEXTS:
-            await neo4j_client.run_query(
-                "CREATE (:DecisionContext {id: $id, decision_id: $decision_id, patterns_matched: $patterns_matched, nodes_consulted: $nodes_consulted})",
-                context
+        for context in rows["contexts"]:
+            await client.write(
+                "CREATE (ctx:DecisionContext) SET ctx = $props",
+                {"props": seed_context_properties(context)}
             )
-        summary["decision_contexts"] = len(CONTEXTS)
-        print(f"[SEED] ✓ Created {len(CONTEXTS)} decision contexts")
+        summary["decision_contexts"] = len(rows['contexts'])
+        print(f"[SEED] ✓ Created {len(rows['contexts'])} decision contexts")
 
         # Step 12: Create EvolutionEvents
         print("[SEED] Step 12: Creating EvolutionEvents...")
-        for evolution in EVOLUTIONS:
-            await neo4j_client.run_query(
-                "CREATE (:EvolutionEvent {id: $id, event_type: $event_type, triggered_by: $triggered_by, before_state: $before_state, after_state: $after_state, description: $description, timestamp: datetime($timestamp)})",
-                evolution
+        for evolution in rows["evolutions"]:
+            await client.write(
+                "CREATE (e:EvolutionEvent) SET e = $props SET e.timestamp = datetime($props.timestamp)",
+                {"props": seed_evolution_properties(evolution)}
             )
-        summary["evolution_events"] = len(EVOLUTIONS)
-        print(f"[SEED] ✓ Created {len(EVOLUTIONS)} evolution events")
+        summary["evolution_events"] = len(rows['evolutions'])
+        print(f"[SEED] ✓ Created {len(rows['evolutions'])} evolution events")
 
         # Step 13: Create relationships
         print("[SEED] Step 13: Creating relationships...")
 
         # User -[:ASSIGNED_TO]-> Asset
         for user_id, asset_id in USER_ASSET_MAPPINGS:
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (u:User {id: $user_id}), (a:Asset {id: $asset_id}) CREATE (u)-[:ASSIGNED_TO]->(a)",
                 {"user_id": user_id, "asset_id": asset_id}
             )
 
         # User -[:HAS_TRAVEL]-> TravelContext
         for travel in TRAVEL_RECORDS:
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (u:User {id: $user_id}), (t:TravelContext {id: $travel_id}) CREATE (u)-[:HAS_TRAVEL]->(t)",
                 {"user_id": travel["user_id"], "travel_id": travel["travel_id"]}
             )
 
         # AlertType -[:HANDLED_BY]-> Playbook
         for alert_type, playbook_id in ALERT_PLAYBOOK_MAPPINGS:
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (at:AlertType {id: $alert_type}), (pb:Playbook {id: $playbook_id}) CREATE (at)-[:HANDLED_BY]->(pb)",
                 {"alert_type": alert_type, "playbook_id": playbook_id}
             )
 
         # Asset -[:SUBJECT_TO]-> SLA
         for asset_id, sla_id in ASSET_SLA_MAPPINGS:
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (a:Asset {id: $asset_id}), (s:SLA {id: $sla_id}) CREATE (a)-[:SUBJECT_TO]->(s)",
                 {"asset_id": asset_id, "sla_id": sla_id}
             )
 
         # Alert relationships (DETECTED_ON, INVOLVES, CLASSIFIED_AS)
-        for alert in ALERTS:
+        for alert in rows["alerts"]:
             # Alert -[:DETECTED_ON]-> Asset
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (alert:Alert {id: $alert_id}), (asset:Asset {id: $asset_id}) CREATE (alert)-[:DETECTED_ON]->(asset)",
                 {"alert_id": alert["alert_id"], "asset_id": alert["asset_id"]}
             )
             # Alert -[:INVOLVES]-> User (only if user exists in User nodes)
             if alert["user_id"] in [u["user_id"] for u in USERS]:
-                await neo4j_client.run_query(
+                await client.write(
                     "MATCH (alert:Alert {id: $alert_id}), (user:User {id: $user_id}) CREATE (alert)-[:INVOLVES]->(user)",
                     {"alert_id": alert["alert_id"], "user_id": alert["user_id"]}
                 )
             # Alert -[:CLASSIFIED_AS]-> AlertType
-            await neo4j_client.run_query(
+            await client.write(
                 "MATCH (alert:Alert {id: $alert_id}), (type:AlertType {id: $alert_type}) CREATE (alert)-[:CLASSIFIED_AS]->(type)",
                 {"alert_id": alert["alert_id"], "alert_type": alert["alert_type"]}
             )
 
         # Alert -[:MATCHES]-> AttackPattern
-        for alert_id, pattern_id in ALERT_PATTERN_MAPPINGS:
-            await neo4j_client.run_query(
+        for alert_id, pattern_id in rows["alert_patterns"]:
+            await client.write(
                 "MATCH (alert:Alert {id: $alert_id}), (pattern:AttackPattern {id: $pattern_id}) CREATE (alert)-[:MATCHES]->(pattern)",
                 {"alert_id": alert_id, "pattern_id": pattern_id}
             )
 
         # Decision -[:FOR_ALERT]-> Alert
-        for decision in DECISIONS:
-            await neo4j_client.run_query(
+        for decision in rows["decisions"]:
+            await client.write(
                 "MATCH (d:Decision {id: $decision_id}), (a:Alert {id: $alert_id}) CREATE (d)-[:FOR_ALERT]->(a)",
                 {"decision_id": decision["id"], "alert_id": decision["alert_id"]}
             )
 
         # Decision -[:HAD_CONTEXT]-> DecisionContext
-        for context in CONTEXTS:
-            await neo4j_client.run_query(
+        for context in rows["contexts"]:
+            await client.write(
                 "MATCH (d:Decision {id: $decision_id}), (ctx:DecisionContext {id: $context_id}) CREATE (d)-[:HAD_CONTEXT]->(ctx)",
                 {"decision_id": context["decision_id"], "context_id": context["id"]}
             )
 
         # Decision -[:TRIGGERED_EVOLUTION]-> EvolutionEvent (THE KEY!)
-        for te in TRIGGERED_EVOLUTIONS:
-            await neo4j_client.run_query(
+        for te in rows["triggered_evolutions"]:
+            await client.write(
                 "MATCH (d:Decision {id: $decision_id}), (e:EvolutionEvent {id: $evolution_id}) CREATE (d)-[:TRIGGERED_EVOLUTION {impact: $impact, magnitude: $magnitude, timestamp: datetime()}]->(e)",
                 te
             )
 
         print(f"[SEED] ✓ Created all relationships")
 
+        # Step 14: Ensure constraints/indexes (idempotent). A partition seeded
+        # on its own gets them from the caller's apply_schema() fan-out.
+        if client is neo4j_client:
+            from app.db.schema import apply_schema
+            schema = await apply_schema()
+            summary["schema_applied"] = len(schema["applied"])
+            print(f"[SEED] ✓ Schema applied ({len(schema['applied'])} statements)")
+
         print("[SEED] ✓ Database seeding completed successfully!")
         return summary
 
@@ -332,22 +441,11 @@ async def verify_neo4j_seed() -> Dict[str, Any]:
 
     try:
         # Count nodes by label
-        node_counts_query = """
-        MATCH (n)
-        RETURN labels(n)[0] as label, count(n) as count
-        ORDER BY label
-        """
-        results = await neo4j_client.run_query(node_counts_query)
-        node_counts = {r["label"]: r["count"] for r in results}
+        node_counts = await neo4j_client.get_label_counts()
         verification["node_counts"] = node_counts
 
         # Count TRIGGERED_EVOLUTION relationships
-        te_query = """
-        MATCH ()-[r:TRIGGERED_EVOLUTION]->()
-        RETURN count(r) as count
-        """
-        te_result = await neo4j_client.run_query(te_query)
-        verification["triggered_evolution_count"] = te_result[0]["count"] if te_result else 0
+        verification["triggered_evolution_count"] = await neo4j_client.get_relationship_count("TRIGGERED_EVOLUTION")
 
         # Total counts
         total_nodes = sum(node_counts.values())
@@ -277,22 +277,9 @@ async def refresh_threat_intel() -> Dict[str, Any]:
     # Step 2 — MERGE :ThreatIntel nodes (idempotent)
     # =========================================================================
     indicators_ingested = 0
-    merge_query = """
-    MERGE (ti:ThreatIntel {value: $value})
-    SET ti.type         = $type,
-        ti.severity     = $severity,
-        ti.source       = $source,
-        ti.risk_factors = $risk_factors,
-        ti.first_seen   = $first_seen,
-        ti.last_updated = $last_updated,
-        ti.context      = $context,
-        ti.refreshed_at = datetime()
-    RETURN ti.value AS value
-    """
-
     for ioc in enriched:
         try:
-            await neo4j_client.run_query(merge_query, {
+            await neo4j_client.merge_threat_intel({
                 "value":        ioc["value"],
                 "type":         ioc.get("type", "unknown"),
                 "severity":     ioc.get("severity", "medium"),
@@ -310,22 +297,13 @@ async def refresh_threat_intel() -> Dict[str, Any]:
     # Step 3 — MERGE :ASSOCIATED_WITH relationships to :Alert nodes
     # =========================================================================
     relationships_created = 0
-    assoc_query = """
-    MATCH (ti:ThreatIntel {value: $ioc_value})
-    MATCH (alert:Alert {id: $alert_id})
-    MERGE (ti)-[r:ASSOCIATED_WITH]->(alert)
-    SET r.linked_at = datetime()
-    RETURN ti.value AS ioc, alert.id AS alert_id
-    """
 
     for alert_id, ioc_values in ALERT_IOC_MAP.items():
         for ioc_value in ioc_values:
             try:
-                result = await neo4j_client.run_query(assoc_query, {
-                    "ioc_value": ioc_value,
-                    "alert_id":  alert_id,
-                })
-                if result:
+                # Also drops the alert's cached security context
+                linked = await neo4j_client.link_threat_intel(ioc_value, alert_id)
+                if linked:
                     relationships_created += 1
                     print(f"[THREAT INTEL] Linked {ioc_value} -> {alert_id}")
             except Exception as exc:
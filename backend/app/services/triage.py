@@ -47,12 +47,8 @@ async def _build_threat_intel_factor(alert_id: str) -> Dict[str, Any]:
         (ThreatIntel)-[:ASSOCIATED_WITH]->(Alert)
     """
     from app.domains.soc.factors import _contribution
-    query = """
-    MATCH (t:ThreatIntel)-[:ASSOCIATED_WITH]->(a:Alert {id: $alert_id})
-    RETURN t.value AS ioc_value, t.severity AS severity, t.source AS source
-    """
     try:
-        results = await neo4j_client.run_query(query, {"alert_id": alert_id})
+        results = await neo4j_client.get_threat_intel_for_alert(alert_id)
     except Exception as exc:
         print(f"[TRIAGE] Neo4j threat-intel query failed for {alert_id}: {exc}")
         results = []
@@ -125,3 +121,9 @@ async def get_decision_factors(alert_id: str) -> Optional[Dict[str, Any]]:
         f"ti_contribution={ti_factor['contribution']}"
     )
     return result
+
+
+def decision_factor_names(alert_id: str) -> List[str]:
+    """Factor names of get_decision_factors(alert_id), in order, without the threat-intel query."""
+    from app.domains.soc.factors import compute_soc_factors
+    return [factor["name"] for factor in compute_soc_factors(alert_id)["factors"]]
@@ -0,0 +1,149 @@
+"""
+Tests for SIEM alert intake (app/services/alert_ingest.py).
+
+The queue runs its flusher over an in-memory graph; a flaky subclass makes
+ingest transactions fail to exercise retry, dead letters and requeue.
+
+Run from backend/:  python -m pytest -q test_alert_ingest.py
+"""
+import asyncio
+
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.models.schemas import Alert
+from app.services.alert_ingest import AlertIngestQueue, IngestWriteError
+
+
+class FlakyGraphClient(InMemoryGraphClient):
+    """Ingest transactions raise `error` for the next `failures` calls."""
+
+    def __init__(self, failures: int = 0, error: Exception = ServiceUnavailable("graph down")) -> None:
+        super().__init__()
+        self.failures = failures
+        self.error = error
+
+    async def _write_alert_ingest_chunk(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise self.error
+        return await super()._write_alert_ingest_chunk(rows)
+
+
+def alerts(*numbers: int):
+    return [
+        Alert(
+            id=f"ALERT-T-{number}", alert_type="phishing", severity="high",
+            timestamp="2026-01-15T10:00:00Z", description="", asset_id="ASSET-T", user_id="USER-T",
+        )
+        for number in numbers
+    ]
+
+
+def ingested_ids(client: InMemoryGraphClient):
+    ids = (client.graph.raw_props(nid)["id"] for nid in client.graph.nodes("Alert"))
+    return {alert_id for alert_id in ids if alert_id.startswith("ALERT-T-")}  # not the demo alerts
+
+
+async def started_queue(client: InMemoryGraphClient, **options) -> AlertIngestQueue:
+    await client.connect()
+    queue = AlertIngestQueue(client, flush_interval=60, retry_backoff=0.0, **options)
+    await queue.start()
+    return queue
+
+
+def test_admission_is_all_or_nothing_with_retry_after():
+    async def scenario():
+        client = InMemoryGraphClient()
+        queue = await started_queue(client, max_size=5, retry_after_seconds=2)
+
+        assert await queue.offer(alerts(1, 2, 3))
+        assert not await queue.offer(alerts(4, 5, 6))  # only room for two: none queued
+
+        stats = queue.stats()
+        assert stats["depth"] == 3 and stats["accepted"] == 3
+        assert stats["rejected_requests"] == 1 and stats["rejected_alerts"] == 3
+        assert queue.retry_after() >= 2
+
+        assert await queue.offer(alerts(4, 5))  # exactly fills the queue
+        await queue.stop()
+        assert ingested_ids(client) == {f"ALERT-T-{number}" for number in range(1, 6)}
+
+    asyncio.run(scenario())
+
+
+def test_stop_drains_everything_still_queued():
+    async def scenario():
+        client = InMemoryGraphClient()
+        queue = await started_queue(client, batch_size=2)
+        assert await queue.offer(alerts(*range(5)))
+        assert queue.stats()["depth"] == 5  # flush interval not reached
+
+        await queue.stop()
+
+        assert queue.stats()["created"] == 5
+        assert len(ingested_ids(client)) == 5
+
+    asyncio.run(scenario())
+
+
+def test_unavailable_graph_is_retried_with_backoff():
+    async def scenario():
+        client = FlakyGraphClient(failures=2)
+        queue = await started_queue(client, max_attempts=3)
+        await queue.offer(alerts(1, 2))
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["retries"] == 2
+        assert stats["created"] == 2 and stats["failed"] == 0 and stats["dead_letters"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_failed_flush_dead_letters_and_requeues_accepted_alerts():
+    async def scenario():
+        client = FlakyGraphClient(failures=2)
+        queue = await started_queue(client, max_attempts=2)
+        await queue.offer(alerts(1, 2))
+        await queue.flush()
+
+        # Every attempt failed: the 202'd alerts are held, not dropped
+        stats = queue.stats()
+        assert stats["dead_letters"] == 2 and stats["failed"] == 2 and stats["created"] == 0
+
+        # The next flush writes them ahead of its own alerts
+        await queue.offer(alerts(3))
+        await queue.stop()
+        assert queue.stats()["dead_letters"] == 0
+        assert ingested_ids(client) == {"ALERT-T-1", "ALERT-T-2", "ALERT-T-3"}
+
+    asyncio.run(scenario())
+
+
+def test_client_errors_are_kept_not_retried():
+    async def scenario():
+        client = FlakyGraphClient(failures=1, error=ClientError("bad row"))
+        queue = await started_queue(client, max_attempts=3)
+        await queue.offer(alerts(1))
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["retries"] == 0
+        assert stats["dead_letters"] == 1  # kept for inspection, not requeued
+
+    asyncio.run(scenario())
+
+
+def test_inline_write_failure_reaches_the_caller():
+    async def scenario():
+        client = FlakyGraphClient(failures=1, error=ClientError("bad row"))
+        await client.connect()
+        queue = AlertIngestQueue(client, enabled=False, retry_backoff=0.0)
+        with pytest.raises(IngestWriteError):
+            await queue.offer(alerts(1))
+        assert queue.stats()["dead_letters"] == 0
+
+    asyncio.run(scenario())
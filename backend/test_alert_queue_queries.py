@@ -0,0 +1,45 @@
+"""
+Tests for the per-filter alert queue queries (app/domains/soc/queries.py).
+
+Each combination of queue filters is a registered query with predicates for
+exactly those filters, and Neo4jClient picks the one matching the request.
+
+Run from backend/:  python -m pytest -q test_alert_queue_queries.py
+"""
+import asyncio
+
+from app.db.neo4j import Neo4jClient
+from app.db.query_registry import ALERT_QUEUE_FILTERS
+from app.domains.soc.queries import SOC_GRAPH_QUERIES, SOC_GRAPH_QUERY_WARMUP
+
+
+QUEUE_QUERIES = [name for name in SOC_GRAPH_QUERIES if name.split(":")[0] in ("alert_queue", "alert_queue_after", "alert_queue_count")]
+
+
+def test_every_filter_combination_is_registered_without_optional_predicates():
+    assert len(QUEUE_QUERIES) == 3 * 2 ** len(ALERT_QUEUE_FILTERS)
+    client = Neo4jClient(uri="bolt://unused")
+    for name in QUEUE_QUERIES:
+        assert "IS NULL OR" not in SOC_GRAPH_QUERIES[name]
+        client.queries.bind(name, SOC_GRAPH_QUERY_WARMUP[name])
+
+
+def test_get_alert_queue_sends_only_the_filters_in_use():
+    client = Neo4jClient(uri="bolt://unused")
+    calls = []
+
+    async def read_named(name, parameters=None, cache=False):
+        client.queries.bind(name, parameters)
+        calls.append((name, cache))
+        return []
+
+    client.read_named = read_named
+    asyncio.run(client.get_alert_queue(limit=5, severity="high", user="jsmith@company.com"))
+    asyncio.run(client.get_alert_queue(limit=5, cursor=None, asset_criticality="critical"))
+
+    assert calls == [
+        ("alert_queue:severity+user", True),
+        ("alert_queue_count:severity+user", True),
+        ("alert_queue:asset_criticality", True),
+        ("alert_queue_count:asset_criticality", True),
+    ]
@@ -0,0 +1,100 @@
+"""
+Tests for analysis tokens (app/services/analysis_store.py).
+
+execute_action reserves the token, redeems it once the decision trace is
+queued and releases it if execute fails before that. A lookup for the
+wrong alert leaves the token usable.
+
+Run from backend/:  python -m pytest -q test_analysis_store.py
+"""
+import asyncio
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.write_behind import WriteBehindQueue
+from app.services.analysis_store import AnalysisStore
+
+
+ALERT_ID = "ALERT-7823"
+
+
+async def execute(store: AnalysisStore, queue: WriteBehindQueue, token: str) -> bool:
+    """The token handling of /action/execute: reserve, queue the trace, redeem (or release on failure)."""
+    analysis = store.reserve(token, ALERT_ID)
+    if analysis is None:
+        return False  # 409
+    try:
+        await asyncio.sleep(0)  # the request yields before queueing, as the router does
+        await queue.submit_decision_trace(
+            decision_id=f"DEC-{token[-4:]}-{queue.submitted}", alert_id=ALERT_ID, action="false_positive_close",
+            confidence=0.9, reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1,
+            context_snapshot={},
+        )
+    except Exception:
+        store.release(token)
+        raise
+    store.redeem(token)
+    return True
+
+
+def test_reserve_is_exclusive_until_redeemed_or_released():
+    store = AnalysisStore()
+    token = store.put({"alert_id": ALERT_ID})
+
+    assert store.reserve(token, ALERT_ID) == {"alert_id": ALERT_ID}
+    assert store.reserve(token, ALERT_ID) is None  # in flight
+
+    store.release(token)  # execute failed before queueing anything
+    assert store.reserve(token, ALERT_ID) is not None
+
+    store.redeem(token)
+    assert store.reserve(token, ALERT_ID) is None
+    assert store.stats()["redeemed"] == 1
+    assert store.stats()["in_flight"] == 0
+
+
+def test_concurrent_executes_with_one_token_write_one_trace():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        queue = WriteBehindQueue(client, enabled=False)  # inline writes
+        store = AnalysisStore()
+        token = store.put({"alert_id": ALERT_ID})
+
+        results = await asyncio.gather(execute(store, queue, token), execute(store, queue, token))
+
+        assert sorted(results) == [False, True]
+        assert queue.submitted == 1
+        assert store.stats()["outstanding"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_wrong_alert_is_rejected_without_destroying_the_token():
+    store = AnalysisStore()
+    token = store.put({"alert_id": ALERT_ID})
+
+    assert store.reserve(token, "ALERT-7821") is None
+    assert store.reserve(token, ALERT_ID) is not None
+    assert store.stats()["rejected"] == 1
+
+
+def test_reserve_refreshes_lru_position():
+    store = AnalysisStore(max_entries=2)
+    first = store.put({"alert_id": ALERT_ID})
+    second = store.put({"alert_id": ALERT_ID})
+
+    assert store.reserve(first, ALERT_ID) is not None
+    store.release(first)
+    store.put({"alert_id": ALERT_ID})  # evicts the least recently used: second
+
+    assert store.reserve(first, ALERT_ID) is not None
+    assert store.reserve(second, ALERT_ID) is None
+
+
+def test_expired_token_is_rejected_and_dropped():
+    store = AnalysisStore(ttl_seconds=-1.0)
+    token = store.put({"alert_id": ALERT_ID})
+
+    assert store.reserve(token, ALERT_ID) is None
+    assert store.stats()["outstanding"] == 0
@@ -0,0 +1,85 @@
+"""
+Tests for batch triage (app/services/batch_triage.py) over the in-memory
+graph. The per-alert pipeline is replaced by a stub that records how many
+alerts are in flight and whether it was cancelled.
+
+Run from backend/:  python -m pytest -q test_batch_triage.py
+"""
+import asyncio
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.services import batch_triage
+
+
+class StubPipeline:
+    def __init__(self, delay: float = 0.01) -> None:
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started = 0
+        self.cancelled = 0
+
+    async def __call__(self, alert_id, context):
+        self.started += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        return {"type": "result", "alert_id": alert_id, "status": "analyzed"}
+
+
+async def seeded_alert_ids(client: InMemoryGraphClient):
+    return [client.graph.raw_props(nid)["id"] for nid in client.graph.nodes("Alert")]
+
+
+def test_results_respect_concurrency_and_report_unknown_alerts(monkeypatch):
+    pipeline = StubPipeline()
+    monkeypatch.setattr(batch_triage, "analyze_alert_context", pipeline)
+
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        alert_ids = await seeded_alert_ids(client)
+        records = [
+            record async for record in batch_triage.analyze_batch(
+                alert_ids + ["ALERT-MISSING", alert_ids[0]], concurrency=2, context_chunk=2, client=client,
+            )
+        ]
+        header, results, summary = records[0], records[1:-1], records[-1]
+
+        assert header["alerts"] == len(alert_ids) + 1  # duplicates collapsed
+        assert {result["alert_id"] for result in results} == set(alert_ids) | {"ALERT-MISSING"}
+        assert summary["not_found"] == 1
+        assert summary["analyzed"] == pipeline.started
+        assert pipeline.max_in_flight <= 2
+
+    asyncio.run(scenario())
+
+
+def test_closing_the_stream_cancels_work_in_flight(monkeypatch):
+    pipeline = StubPipeline(delay=0.05)
+    monkeypatch.setattr(batch_triage, "analyze_alert_context", pipeline)
+
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        alert_ids = await seeded_alert_ids(client)
+        stream = batch_triage.analyze_batch(alert_ids, concurrency=2, context_chunk=1, client=client)
+
+        assert (await stream.__anext__())["type"] == "batch"
+        assert (await stream.__anext__())["type"] == "result"
+        await stream.aclose()  # the client disconnected
+
+        assert pipeline.in_flight == 0
+        assert pipeline.cancelled >= 1
+        assert pipeline.started < len(alert_ids)
+        await asyncio.sleep(0.1)
+        assert pipeline.started < len(alert_ids)  # nothing was left running
+
+    asyncio.run(scenario())
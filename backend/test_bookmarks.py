@@ -0,0 +1,150 @@
+"""
+Tests for per-client causal bookmarks (app/db/bookmarks.py): the header
+token, driver bookmarks carried from a write to the next read, and reads
+waiting for the client's own write-behind rows.
+
+Run from backend/:  python -m pytest -q test_bookmarks.py
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from neo4j import Bookmarks
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.bookmarks import CausalSession, causal_session
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.neo4j import Neo4jClient
+from app.db.write_behind import WriteBehindQueue
+from app.services.precedents import precedent_index
+
+
+ALERT_ID = "ALERT-7823"
+
+
+class FakeResult:
+    async def data(self):
+        return []
+
+
+class FakeTransaction:
+    async def run(self, query, parameters):
+        return FakeResult()
+
+
+class FakeSession:
+    async def execute_read(self, work, query, parameters):
+        return await work(FakeTransaction(), query, parameters)
+
+    async def execute_write(self, work, query, parameters):
+        return await work(FakeTransaction(), query, parameters)
+
+    async def last_bookmarks(self):
+        return Bookmarks.from_raw_values(["FB:write-1"])
+
+
+class FakeDriverClient(Neo4jClient):
+    """Records the config of every session it opens."""
+
+    def __init__(self) -> None:
+        super().__init__(uri="bolt://fake:7687")
+        self.query_metrics.profile_sample_rate = 0
+        self.session_configs = []
+
+    @asynccontextmanager
+    async def session(self, **config):
+        self.session_configs.append(config)
+        yield FakeSession()
+
+
+async def submit_decision(queue: WriteBehindQueue, decision_id: str) -> None:
+    await queue.submit_decision_trace(
+        decision_id=decision_id, alert_id=ALERT_ID, action="false_positive_close", confidence=0.9,
+        reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1, context_snapshot={},
+    )
+
+
+def test_token_round_trips_and_malformed_tokens_are_ignored():
+    causal = CausalSession()
+    causal.add_bookmarks(["FB:1", "FB:2"])
+    causal.add_ticket("epoch-a", 7)
+
+    restored = CausalSession.from_token(causal.token())
+    assert (restored.bookmarks, restored.epoch, restored.ticket) == ({"FB:1", "FB:2"}, "epoch-a", 7)
+
+    empty = CausalSession.from_token("%%% not a token")
+    assert (empty.bookmarks, empty.ticket) == (set(), 0)
+
+
+def test_ticket_from_a_new_epoch_replaces_the_old_one():
+    causal = CausalSession(epoch="old", ticket=50)
+    causal.add_ticket("new", 3)
+    assert (causal.epoch, causal.ticket, causal.changed) == ("new", 3, True)
+
+
+def test_write_bookmarks_are_passed_to_the_next_read():
+    async def scenario():
+        client = FakeDriverClient()
+        with causal_session(CausalSession()) as causal:
+            await client.write("MATCH (alert:Alert {id: $id}) SET alert.status = 'closed'", {"id": ALERT_ID})
+            assert causal.changed and causal.bookmarks == {"FB:write-1"}
+
+            await client.read_named("threat_intel_counts")
+
+        read_config = client.session_configs[-1]
+        assert read_config["bookmarks"].raw_values == frozenset({"FB:write-1"})
+
+        await client.read_named("threat_intel_counts")  # another client: no bookmarks
+        assert client.session_configs[-1] == {}
+
+    asyncio.run(scenario())
+
+
+def test_read_waits_for_the_clients_queued_write():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        queue = WriteBehindQueue(client, flush_interval=0.05)
+        await queue.start()
+        with causal_session(CausalSession()) as causal:
+            await submit_decision(queue, "DEC-T-RYW")
+
+        # The next request carries the token back
+        next_request = CausalSession.from_token(causal.token(), waiter=queue.wait_for)
+        resolving = asyncio.create_task(next_request.resolve())
+        await asyncio.sleep(0)
+        assert not resolving.done()  # waiting for the flusher, not reading stale state
+
+        await resolving
+        assert client.graph.find_one("Decision", "id", "DEC-T-RYW") is not None
+        assert queue.stats()["causal_waits"] == 1
+        await queue.stop()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        precedent_index.clear()
+
+
+def test_wait_gives_up_after_the_timeout_or_for_another_epoch(monkeypatch):
+    monkeypatch.setenv("GRAPH_BOOKMARK_WAIT_TIMEOUT_MS", "10")
+
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        queue = WriteBehindQueue(client, flush_interval=60)
+        await queue.start()
+        with causal_session(CausalSession()) as causal:
+            await submit_decision(queue, "DEC-T-SLOW")
+
+        assert await CausalSession.from_token(causal.token(), waiter=queue.wait_for).resolve() == []
+        assert queue.stats()["causal_timeouts"] == 1
+
+        restarted = CausalSession(epoch="before-restart", ticket=1, waiter=queue.wait_for)
+        assert await restarted.resolve() == []
+        assert queue.stats()["causal_waits"] == 1  # no wait for a stale epoch
+        await queue.stop()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        precedent_index.clear()
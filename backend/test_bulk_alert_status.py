@@ -0,0 +1,89 @@
+"""
+Tests for chunked bulk alert status transitions
+(Neo4jClient.set_alert_statuses) over the in-memory graph.
+
+Run from backend/:  python -m pytest -q test_bulk_alert_status.py
+"""
+import asyncio
+
+from neo4j.exceptions import ServiceUnavailable
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+
+
+class ChunkFailingGraphClient(InMemoryGraphClient):
+    """The `fail_chunk`-th status transaction (1-based) raises."""
+
+    def __init__(self, fail_chunk: int) -> None:
+        super().__init__()
+        self.fail_chunk = fail_chunk
+        self.chunks = 0
+
+    async def _write_alert_status_chunk(self, alert_ids, status, from_statuses):
+        self.chunks += 1
+        if self.chunks == self.fail_chunk:
+            raise ServiceUnavailable("graph down")
+        return await super()._write_alert_status_chunk(alert_ids, status, from_statuses)
+
+
+async def pending_alert_ids(client: InMemoryGraphClient, count: int):
+    page = await client.get_alert_queue(limit=count)
+    return [record["alert"]["id"] for record in page["alerts"]]
+
+
+def status_of(client: InMemoryGraphClient, alert_id: str) -> str:
+    return client.graph.raw_props(client.graph.find_one("Alert", "id", alert_id))["status"]
+
+
+def test_statuses_change_in_chunks_with_one_result_per_distinct_id():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        alert_ids = await pending_alert_ids(client, 3)
+        assert len(alert_ids) == 3
+
+        request = alert_ids + [alert_ids[0], "ALERT-MISSING"]
+        results = await client.set_alert_statuses(request, "escalated", chunk_size=2)
+
+        assert [row["alert_id"] for row in results] == alert_ids + ["ALERT-MISSING"]
+        assert all(row["updated"] and row["previous_status"] == "pending" for row in results[:3])
+        assert results[3]["found"] is False and results[3]["updated"] is False
+        assert {status_of(client, alert_id) for alert_id in alert_ids} == {"escalated"}
+
+    asyncio.run(scenario())
+
+
+def test_from_statuses_guards_the_transition():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        first, second = await pending_alert_ids(client, 2)
+        await client.set_alert_statuses([first], "closed")
+
+        results = await client.set_alert_statuses([first, second], "escalated", from_statuses=["pending"])
+
+        assert [(row["previous_status"], row["updated"]) for row in results] == [("closed", False), ("pending", True)]
+        assert status_of(client, first) == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_failed_chunk_is_reported_and_committed_chunks_stay():
+    async def scenario():
+        client = ChunkFailingGraphClient(fail_chunk=2)
+        await client.connect()
+        alert_ids = await pending_alert_ids(client, 4)
+        for alert_id in alert_ids:
+            await client.get_security_context(alert_id)  # warm the context cache
+
+        results = await client.set_alert_statuses(alert_ids, "escalated", chunk_size=2)
+
+        assert [row["updated"] for row in results] == [True, True, False, False]
+        assert all("error" in row for row in results[2:])
+        assert [status_of(client, alert_id) for alert_id in alert_ids] == ["escalated", "escalated", "pending", "pending"]
+        # Only the alerts that changed lose their cached context
+        assert client.context_cache.get(alert_ids[0]) is None
+        assert client.context_cache.get(alert_ids[2]) is not None
+
+    asyncio.run(scenario())
@@ -0,0 +1,127 @@
+"""
+Tests for the graph circuit breaker and stale-result cache
+(app/db/circuit_breaker.py).
+
+Time is driven through a fake monotonic clock, so no test sleeps.
+
+Run from backend/:  python -m pytest -q test_circuit_breaker.py
+"""
+import pytest
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+from app.db import circuit_breaker
+from app.db.circuit_breaker import (
+    STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN,
+    CircuitBreaker, CircuitOpenError, StaleResultCache, is_availability_error,
+)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def tripped(threshold: int = 3, reset_timeout: float = 30.0) -> CircuitBreaker:
+    breaker = CircuitBreaker(failure_threshold=threshold, reset_timeout=reset_timeout)
+    for _ in range(threshold):
+        breaker.check()
+        breaker.record_failure(ServiceUnavailable("graph down"))
+    return breaker
+
+
+def test_opens_after_consecutive_failures_and_fails_fast(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    for _ in range(2):
+        breaker.record_failure(ServiceUnavailable("graph down"))
+    assert breaker.state == STATE_CLOSED
+
+    breaker.record_failure(ServiceUnavailable("graph down"))
+    assert breaker.state == STATE_OPEN
+
+    clock.now += 10
+    with pytest.raises(CircuitOpenError) as raised:
+        breaker.check()
+    assert raised.value.retry_in == pytest.approx(20.0)
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    breaker.record_failure(ServiceUnavailable("graph down"))
+    breaker.record_failure(ServiceUnavailable("graph down"))
+    breaker.record_success()
+    breaker.record_failure(ServiceUnavailable("graph down"))
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.consecutive_failures == 1
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = tripped()
+    clock.now += 30
+
+    breaker.check()  # the probe
+    assert breaker.state == STATE_HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()  # one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    breaker.check()
+    assert breaker.stats()["state_changes"] == 3  # closed -> open -> half_open -> closed
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = tripped()
+    clock.now += 30
+    breaker.check()
+
+    breaker.record_failure(ServiceUnavailable("still down"))  # one failure is enough
+    assert breaker.state == STATE_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_lost_probe_allows_another_after_the_timeout(clock):
+    breaker = tripped()
+    clock.now += 30
+    breaker.check()  # probe never reports back
+
+    clock.now += 30
+    breaker.check()
+    assert breaker.state == STATE_HALF_OPEN
+
+
+def test_only_availability_errors_count():
+    assert is_availability_error(ServiceUnavailable("graph down"))
+    assert is_availability_error(TimeoutError())
+    assert not is_availability_error(ClientError("bad cypher"))
+    assert not is_availability_error(CircuitOpenError(1.0))  # the breaker's own refusal
+
+
+def test_stale_cache_serves_copies_and_evicts_least_recently_used():
+    cache = StaleResultCache(max_entries=2, max_rows=2)
+    first = StaleResultCache.key("alert_queue", {"limit": 10})
+    second = StaleResultCache.key("alert_queue", {"limit": 20})
+    cache.put(first, [{"id": "ALERT-1"}])
+    cache.put(second, [{"id": "ALERT-2"}])
+    cache.put("too_big", [{}, {}, {}])  # above max_rows: not kept
+
+    rows, _ = cache.get(first)
+    rows[0]["id"] = "changed"
+    assert cache.get(first)[0] == [{"id": "ALERT-1"}]
+
+    cache.put("third", [])  # evicts `second`, the least recently read
+    assert cache.get(second) is None
+    assert cache.get("too_big") is None
+    assert cache.stats()["size"] == 2
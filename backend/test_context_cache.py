@@ -0,0 +1,69 @@
+"""
+Tests for the security-context cache (app/db/context_cache.py) in front of
+Neo4jClient.get_security_context(s), over the in-memory graph.
+
+Run from backend/:  python -m pytest -q test_context_cache.py
+"""
+import asyncio
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db import context_cache
+from app.db.context_cache import SecurityContextCache
+from app.db.memory_graph import InMemoryGraphClient
+
+
+ALERT_ID = "ALERT-7823"
+
+
+def test_repeat_reads_are_served_from_the_cache_as_copies():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        client.context_cache = SecurityContextCache()
+
+        first = await client.get_security_context(ALERT_ID)
+        first["simulated"] = True  # callers mutate what they get back
+        second = await client.get_security_context(ALERT_ID)
+
+        assert "simulated" not in second
+        assert client.context_cache.stats()["hits"] == 1
+
+        await client.get_security_contexts([ALERT_ID, "ALERT-7821"])  # only the miss is read
+        assert client.context_cache.stats()["misses"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_linking_threat_intel_invalidates_the_alert():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        client.context_cache = SecurityContextCache()
+        await client.get_security_context(ALERT_ID)
+
+        await client.merge_threat_intel({
+            "value": "203.0.113.7", "ioc_type": "ip", "severity": "high", "source": "test",
+            "description": "", "refreshed_at": "2026-01-15T10:00:00+00:00",
+        })
+        assert await client.link_threat_intel("203.0.113.7", ALERT_ID)
+
+        assert client.context_cache.get(ALERT_ID) is None
+
+    asyncio.run(scenario())
+
+
+def test_entries_expire_and_the_least_recently_used_is_evicted(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(context_cache.time, "monotonic", lambda: now[0])
+    cache = SecurityContextCache(max_entries=2, ttl_seconds=300)
+    cache.put("ALERT-1", {"alert_id": "ALERT-1"})
+    cache.put("ALERT-2", {"alert_id": "ALERT-2"})
+
+    assert cache.get("ALERT-1") is not None  # ALERT-2 is now least recently used
+    cache.put("ALERT-3", {"alert_id": "ALERT-3"})
+    assert cache.get("ALERT-2") is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] += 301
+    assert cache.get("ALERT-1") is None
+    assert cache.stats()["size"] == 1  # the expired entry was dropped
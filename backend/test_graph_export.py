@@ -0,0 +1,88 @@
+"""
+Tests for the graph export (app/services/graph_export.py) over the
+in-memory graph.
+
+Run from backend/:  python -m pytest -q test_graph_export.py
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.models.schemas import Alert
+from app.services.graph_export import export_pages, export_records
+
+
+async def connected_client() -> InMemoryGraphClient:
+    client = InMemoryGraphClient()
+    await client.connect()
+    return client
+
+
+async def exported_keys(client: InMemoryGraphClient, label: str, since=None, page_size=None):
+    return [row["key"] async for page in export_pages(label, since, page_size, client) for row in page]
+
+
+def test_incremental_export_includes_backdated_alerts_ingested_since():
+    async def scenario():
+        client = await connected_client()
+        since = datetime.now(timezone.utc) - timedelta(minutes=1)
+        # A SIEM redelivering an old alert: its timestamp predates `since`, its ingestion does not
+        alert = Alert(
+            id="ALERT-T-LATE", alert_type="phishing", severity="high", timestamp="2020-01-01T00:00:00Z",
+            description="", asset_id="ASSET-T", user_id="USER-T",
+        )
+        await client.ingest_alerts([client.alert_ingest_row(alert.model_dump(), "siem")])
+
+        assert "ALERT-T-LATE" in await exported_keys(client, "Alert", since=since.isoformat())
+
+    asyncio.run(scenario())
+
+
+def test_incremental_export_includes_decisions_given_an_outcome_since():
+    async def scenario():
+        client = await connected_client()
+        row = client.decision_trace_row(
+            decision_id="DEC-T-FB", alert_id="ALERT-7823", action="false_positive_close", confidence=0.9,
+            reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1, context_snapshot={},
+        )
+        await client.create_decision_traces([row])
+        since = datetime.now(timezone.utc) + timedelta(minutes=1)
+        assert "DEC-T-FB" not in await exported_keys(client, "Decision", since=since.isoformat())
+
+        # Analyst feedback after `since` changes the decision
+        feedback_at = (since + timedelta(minutes=1)).isoformat()
+        await client.record_decision_outcomes([client.decision_outcome_row("DEC-T-FB", "ALERT-7823", "correct", feedback_at)])
+
+        assert "DEC-T-FB" in await exported_keys(client, "Decision", since=since.isoformat())
+
+    asyncio.run(scenario())
+
+
+def test_export_pages_walk_every_node_once_in_key_order():
+    async def scenario():
+        client = await connected_client()
+        full = await exported_keys(client, "Alert", page_size=1000)
+        assert len(full) > 2
+
+        pages = [page async for page in export_pages("Alert", page_size=2, client=client)]
+        assert all(len(page) <= 2 for page in pages)
+        assert [row["key"] for page in pages for row in page] == sorted(full)
+
+    asyncio.run(scenario())
+
+
+def test_ndjson_records_count_nodes_and_skip_unchanging_labels_when_incremental():
+    async def scenario():
+        client = await connected_client()
+        records = [
+            record async for record in export_records(["Alert", "User"], since="2000-01-01T00:00:00Z", client=client)
+        ]
+        header, complete = records[0], records[-1]
+        nodes = [record for record in records if record["type"] == "node"]
+
+        assert header["labels"] == ["Alert"] and header["skipped"] == ["User"]
+        assert complete["nodes"] == len(nodes) > 0
+        assert {record["label"] for record in nodes} == {"Alert"}
+
+    asyncio.run(scenario())
@@ -0,0 +1,48 @@
+"""
+Tests for keyset pagination (app/db/pagination.py) and the evolution
+timeline that pages with it, over the in-memory graph.
+
+Run from backend/:  python -m pytest -q test_pagination.py
+"""
+import asyncio
+
+import pytest
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_sort_key_values():
+    cursor = encode_cursor("2026-01-15T10:00:00+00:00", "EVO-001")
+
+    assert "=" not in cursor  # URL-safe, padding stripped
+    assert decode_cursor(cursor, 2) == ["2026-01-15T10:00:00+00:00", "EVO-001"]
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor!", encode_cursor("only-one"), encode_cursor({"a": 1}, "b")[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, 2)
+
+
+def test_timeline_pages_cover_every_event_once_newest_first():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        everything = (await client.get_evolution_timeline(limit=1000))["events"]
+        assert len(everything) > 2
+
+        paged, cursor = [], None
+        while True:
+            page = await client.get_evolution_timeline(limit=2, cursor=cursor)
+            paged.extend(page["events"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert [event["id"] for event in paged] == [event["id"] for event in everything]
+        timestamps = [event["timestamp"] for event in paged]
+        assert timestamps == sorted(timestamps, reverse=True)
+
+    asyncio.run(scenario())
@@ -0,0 +1,154 @@
+"""
+Tests for business-unit partitioned graph routing (app/db/partitioned.py).
+
+Two in-memory partitions stand in for separate graph instances: "ops" (the
+default) and "finance" (Finance assets). Results are checked against one
+unpartitioned in-memory graph seeded with the same data.
+
+Run from backend/:  python -m pytest -q test_partitioned_graph.py
+"""
+import asyncio
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph / partitioned subclass Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.partitioned import PartitionedGraphClient
+from app.models.schemas import Alert
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def partitioned_client() -> PartitionedGraphClient:
+    client = PartitionedGraphClient(
+        {"ops": InMemoryGraphClient(alert_ids=[]), "finance": InMemoryGraphClient(alert_ids=[])},
+        routes={"Finance": "finance"},
+    )
+    await client.connect()
+    return client
+
+
+async def reference_client() -> InMemoryGraphClient:
+    client = InMemoryGraphClient()
+    await client.connect()
+    return client
+
+
+async def all_pages(fetch, key: str):
+    items, cursor = [], None
+    while True:
+        page = await fetch(cursor)
+        items.extend(page[key])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items
+
+
+def ingest_row(client, alert_id: str, asset_id: str) -> dict:
+    alert = Alert(
+        id=alert_id, alert_type="anomalous_login", severity="low", timestamp="2026-02-01T00:00:00Z",
+        description="test", asset_id=asset_id, user_id="jsmith@company.com",
+    )
+    return client.alert_ingest_row(alert.model_dump(), "test")
+
+
+def test_seed_alerts_are_split_across_both_partitions():
+    async def scenario():
+        client = await partitioned_client()
+        owned = {name: await part.get_label_counts() for name, part in client.partitions.items()}
+        assert owned["ops"].get("Alert", 0) > 0
+        assert owned["finance"].get("Alert", 0) > 0
+
+    run(scenario())
+
+
+def test_alert_queue_merges_partitions_in_keyset_order():
+    async def scenario():
+        client, reference = await partitioned_client(), await reference_client()
+        records = await all_pages(lambda cursor: client.get_alert_queue(limit=2, cursor=cursor), "alerts")
+        expected = await all_pages(lambda cursor: reference.get_alert_queue(limit=50, cursor=cursor), "alerts")
+
+        ids = [record["alert"]["id"] for record in records]
+        assert len(ids) == len(set(ids))
+        assert sorted(ids) == sorted(record["alert"]["id"] for record in expected)
+        keys = [(record["alert"]["timestamp"], record["alert"]["id"]) for record in records]
+        assert keys == sorted(keys, reverse=True)
+
+        page = await client.get_alert_queue(limit=1)
+        assert page["total_estimate"] == len(expected)
+
+    run(scenario())
+
+
+def test_evolution_timeline_merges_partitions():
+    async def scenario():
+        client, reference = await partitioned_client(), await reference_client()
+        events = await all_pages(lambda cursor: client.get_evolution_timeline(limit=2, cursor=cursor), "events")
+        expected = await all_pages(lambda cursor: reference.get_evolution_timeline(limit=2, cursor=cursor), "events")
+        assert [event["id"] for event in events] == [event["id"] for event in expected]
+
+    run(scenario())
+
+
+def test_set_alert_statuses_returns_results_in_request_order():
+    async def scenario():
+        client = await partitioned_client()
+        # Empty directory: unknown ids are resolved by one concurrent lookup
+        client._alert_partition.clear()
+        lookups = client.directory_lookups
+
+        request = ["ALERT-7823", "ALERT-NOPE", "ALERT-7821", "ALERT-7819", "ALERT-7823", "ALERT-7822"]
+        results = await client.set_alert_statuses(request, "resolved")
+
+        assert [row["alert_id"] for row in results] == ["ALERT-7823", "ALERT-NOPE", "ALERT-7821", "ALERT-7819", "ALERT-7822"]
+        assert [row["updated"] for row in results] == [True, False, True, True, True]
+        assert results[1]["found"] is False
+        assert client.directory_lookups == lookups + 1
+        assert (await client.get_alert("ALERT-7823"))["status"] == "resolved"
+
+        again = await client.set_alert_statuses(["ALERT-7821", "ALERT-7823"], "pending", from_statuses=["resolved"])
+        assert [(row["alert_id"], row["previous_status"]) for row in again] == [
+            ("ALERT-7821", "resolved"), ("ALERT-7823", "resolved"),
+        ]
+
+    run(scenario())
+
+
+def test_ingest_alerts_routes_by_asset_business_unit():
+    async def scenario():
+        client = await partitioned_client()
+        rows = [
+            ingest_row(client, "ALERT-T-FIN", "LAPTOP-JSMITH"),   # Finance -> finance
+            ingest_row(client, "ALERT-T-IT", "SRV-DB-PROD-01"),   # IT (unmapped) -> default
+            ingest_row(client, "ALERT-T-NONE", "NO-SUCH-ASSET"),  # unknown asset -> default
+        ]
+        results = await client.ingest_alerts(rows)
+
+        assert [row["alert_id"] for row in results] == ["ALERT-T-FIN", "ALERT-T-IT", "ALERT-T-NONE"]
+        assert all(row["created"] for row in results)
+        assert results[2]["asset_found"] is False
+        assert await client.partition("finance").get_alert("ALERT-T-FIN") is not None
+        assert await client.partition("ops").get_alert("ALERT-T-FIN") is None
+        assert await client.partition("ops").get_alert("ALERT-T-IT") is not None
+        assert await client.partition("ops").get_alert("ALERT-T-NONE") is not None
+
+        before = await client.get_label_counts()
+        redelivered = await client.ingest_alerts(rows[:1])
+        assert redelivered[0]["created"] is False
+        assert (await client.get_label_counts())["Alert"] == before["Alert"]
+
+    run(scenario())
+
+
+def test_label_counts_count_replicated_labels_once():
+    async def scenario():
+        client, reference = await partitioned_client(), await reference_client()
+        counts = await client.get_label_counts()
+        expected = await reference.get_label_counts()
+
+        assert counts == expected
+        # Reference data really is on both partitions
+        for part in client.partitions.values():
+            assert (await part.get_label_counts())["User"] == expected["User"]
+
+    run(scenario())
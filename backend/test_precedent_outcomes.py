@@ -0,0 +1,112 @@
+"""
+Tests for decision outcomes in the precedent index (app/services/precedents.py).
+
+Outcomes are keyed by decision id, stored on the Decision node and read back
+when the index is rebuilt from the graph.
+
+Run from backend/:  python -m pytest -q test_precedent_outcomes.py
+"""
+import asyncio
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.write_behind import WriteBehindQueue
+from app.services.precedents import PrecedentIndex, precedent_index
+
+
+ALERT_ID = "ALERT-7823"
+VECTOR = [1.0, 1.0, 0.2, 0.5, 0.0]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def decision_row(client, decision_id: str, alert_id: str = ALERT_ID) -> dict:
+    return client.decision_trace_row(
+        decision_id=decision_id, alert_id=alert_id, action="false_positive_close", confidence=0.9,
+        reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1,
+        context_snapshot={}, factor_vector=VECTOR,
+    )
+
+
+def test_outcome_before_indexing_is_applied_when_the_decision_is_added():
+    index = PrecedentIndex()
+    index.add("DEC-OLD", VECTOR, ALERT_ID)
+
+    assert index.record_outcome("DEC-NEW", "incorrect") is False
+    index.add("DEC-NEW", VECTOR, ALERT_ID)
+
+    outcomes = {row["decision_id"]: row["outcome"] for row in index.search(VECTOR, k=5)}
+    assert outcomes == {"DEC-OLD": None, "DEC-NEW": "incorrect"}
+
+
+def test_outcome_is_persisted_and_survives_rebuild():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        await client.create_decision_traces([decision_row(client, "DEC-T-1"), decision_row(client, "DEC-T-2")])
+
+        rows = [
+            client.decision_outcome_row("DEC-T-1", ALERT_ID, "correct"),
+            client.decision_outcome_row("DEC-T-2", "ALERT-7821", "incorrect"),  # wrong alert: no match
+        ]
+        assert await client.record_decision_outcomes(rows) == ["DEC-T-1"]
+
+        index = PrecedentIndex()
+        await index.rebuild(client)
+        outcomes = {row["decision_id"]: row["outcome"] for row in index.search(VECTOR, k=len(index))}
+        assert outcomes["DEC-T-1"] == "correct"
+        assert outcomes["DEC-T-2"] is None
+
+    try:
+        run(scenario())
+    finally:
+        precedent_index.clear()
+
+
+def test_outcome_queued_right_after_its_decision_finds_it():
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        queue = WriteBehindQueue(client, flush_interval=60)
+        await queue.start()
+
+        # Same batch: the outcome is written after the decision trace
+        decision_id = await queue.submit_decision_trace(
+            decision_id="DEC-T-3", alert_id=ALERT_ID, action="false_positive_close", confidence=0.9,
+            reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1,
+            context_snapshot={}, factor_vector=VECTOR,
+        )
+        await queue.submit_decision_outcome(decision_id=decision_id, alert_id=ALERT_ID, outcome="correct")
+        await queue.stop()
+
+        assert queue.stats()["written"] == 2
+        records = [record async for record in client.stream_precedent_vectors()]
+        assert {r["decision_id"]: r["outcome"] for r in records}[decision_id] == "correct"
+
+    try:
+        run(scenario())
+    finally:
+        precedent_index.clear()
+
+
+def test_reseeding_rebuilds_the_index_from_the_new_graph(monkeypatch):
+    from app.services import seed_neo4j
+
+    async def scenario():
+        client = InMemoryGraphClient()
+        await client.connect()
+        monkeypatch.setattr(seed_neo4j, "neo4j_client", client)  # seed it as the global client
+        precedent_index.add("DEC-T-STALE", VECTOR, ALERT_ID)  # a decision the re-seed removes
+
+        summary = await seed_neo4j.seed_neo4j_database(client)
+
+        indexed = {row["decision_id"] for row in precedent_index.search(VECTOR, k=len(precedent_index))}
+        assert "DEC-T-STALE" not in indexed
+        assert summary["precedents_indexed"] == len(precedent_index) > 0
+
+    try:
+        run(scenario())
+    finally:
+        precedent_index.clear()
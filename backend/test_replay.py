@@ -0,0 +1,177 @@
+"""
+Tests for the record/replay graph driver (app/db/replay.py).
+
+An analyze -> execute flow is recorded through RecordingDriver over a stub
+driver (answering from the in-memory seed graph), then replayed twice.
+Execute generates a fresh decision id and "now" timestamps on every run,
+so replay must match those writes with their volatile values masked.
+
+Run from backend/:  python -m pytest -q test_replay.py
+"""
+import asyncio
+import uuid
+
+import pytest
+from neo4j import Bookmarks
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph / replay subclass Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.neo4j import Neo4jClient
+from app.db.replay import RecordingDriver, ReplayGraphClient, ReplayMissError, diff_recordings
+
+
+ALERT_ID = "ALERT-7823"
+
+
+# ============================================================================
+# Stub database for recording
+# ============================================================================
+
+class _StubResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    async def data(self):
+        return self._rows
+
+    async def consume(self):
+        return type("Summary", (), {"profile": None})()
+
+
+class _StubSession:
+    def __init__(self, answer):
+        self._answer = answer
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def run(self, query, parameters=None, **kwargs):
+        return _StubResult(await self._answer(query, parameters or {}))
+
+    async def execute_read(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    async def execute_write(self, work, *args, **kwargs):
+        return await work(self, *args, **kwargs)
+
+    async def last_bookmarks(self):
+        return Bookmarks()
+
+
+class StubDriver:
+    """Answers the named queries the flow runs, using the in-memory seed graph."""
+
+    def __init__(self, client: Neo4jClient, graph: InMemoryGraphClient) -> None:
+        self._names = {client.queries.get(name).cypher: name for name in client.queries.names()}
+        self._graph = graph
+
+    def session(self, **config):
+        return _StubSession(self._answer)
+
+    async def close(self):
+        pass
+
+    async def _answer(self, query, parameters):
+        name = self._names.get(query.removeprefix("PROFILE "))
+        if name == "alert_bundle":
+            return [await self._graph._fetch_alert_record(parameters["alert_id"])]
+        if name == "threat_intel_for_alert":
+            return await self._graph.get_threat_intel_for_alert(parameters["alert_id"])
+        if name == "create_decision_traces":
+            return [{"decision_id": row["decision_id"]} for row in parameters["rows"]]
+        if name == "decisions_by_asset_criticality":
+            return await self._graph.get_decisions_by_asset_criticality(parameters["asset_criticality"])
+        return []
+
+
+# ============================================================================
+# Flow
+# ============================================================================
+
+async def analyze_then_execute(client: Neo4jClient, alert_id: str = ALERT_ID):
+    """The graph statements of /alert/analyze then /action/execute, with their generated values."""
+    # /alert/analyze: alert bundle, threat intel for the precedent vector
+    bundle = await client.get_alert_bundle(alert_id)
+    intel = await client.get_threat_intel_for_alert(alert_id)
+    context = bundle["context"]
+
+    # /action/execute: decision trace with a new id and clock, then the status change
+    row = client.decision_trace_row(
+        decision_id=f"DEC-{uuid.uuid4().hex[:4].upper()}",
+        alert_id=alert_id,
+        action="false_positive_close",
+        confidence=0.92,
+        reasoning=f"narrated {uuid.uuid4().hex}",
+        pattern_id=context.get("pattern_id"),
+        playbook_id=context.get("playbook_id"),
+        nodes_consulted=context.get("nodes_consulted", 47),
+        context_snapshot={
+            "user": {"name": context.get("user_name"), "risk_score": context.get("user_risk_score")},
+            "asset": {"hostname": context.get("asset_hostname"), "criticality": context.get("asset_criticality")},
+        },
+    )
+    created = await client.create_decision_traces([row])
+    await client.set_alert_status(alert_id, "resolved")
+    recent = await client.get_decisions_by_asset_criticality(context["asset_criticality"])
+
+    return {
+        "alert": bundle["alert"]["id"],
+        "context": context,
+        "intel": intel,
+        "decisions_written": len(created),
+        "recent_decisions": [decision["decision_id"] for decision in recent],
+    }
+
+
+async def record(path: str):
+    graph = InMemoryGraphClient()
+    await graph.connect()
+    client = Neo4jClient(uri="bolt://recording-stub")
+    client._driver = RecordingDriver(StubDriver(client, graph), path)
+    return await analyze_then_execute(client)
+
+
+async def replay(path: str):
+    client = ReplayGraphClient(path)
+    await client.connect()
+    result = await analyze_then_execute(client)
+    return result, client.recording.stats()
+
+
+# ============================================================================
+# Tests
+# ============================================================================
+
+def test_analyze_execute_flow_replays_deterministically(tmp_path):
+    path = str(tmp_path / "flow.jsonl")
+    recorded = asyncio.run(record(path))
+
+    first, first_stats = asyncio.run(replay(path))
+    second, second_stats = asyncio.run(replay(path))
+
+    assert first == second == recorded
+    assert first["decisions_written"] == 1
+    assert first_stats["misses"] == second_stats["misses"] == 0
+
+
+def test_recordings_of_the_same_flow_diff_cleanly(tmp_path):
+    path_a, path_b = str(tmp_path / "a.jsonl"), str(tmp_path / "b.jsonl")
+    asyncio.run(record(path_a))
+    asyncio.run(record(path_b))
+    assert diff_recordings(path_a, path_b) == []
+
+
+def test_unrecorded_statement_still_misses(tmp_path):
+    path = str(tmp_path / "flow.jsonl")
+    asyncio.run(record(path))
+
+    async def other_alert():
+        client = ReplayGraphClient(path)
+        await client.connect()
+        await client.get_alert_bundle("ALERT-7821")
+
+    with pytest.raises(ReplayMissError):
+        asyncio.run(other_alert())
@@ -0,0 +1,125 @@
+"""
+Tests for the named-query result cache (app/db/result_cache.py) as used by
+Neo4jClient.read_named(..., cache=True).
+
+A fake driver session stands in for Neo4j: reads return `rows` and count
+round trips, writes return nothing.
+
+Run from backend/:  python -m pytest -q test_result_cache.py
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from app.db.neo4j import Neo4jClient
+from app.db.result_cache import QueryResultCache
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def data(self):
+        return [dict(row) for row in self.rows]
+
+
+class FakeTransaction:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def run(self, query, parameters):
+        return FakeResult(self.rows)
+
+
+class FakeSession:
+    def __init__(self, client: "FakeDriverClient") -> None:
+        self.client = client
+
+    async def execute_read(self, work, query, parameters):
+        self.client.reads += 1
+        await self.client.read_gate.wait()
+        return await work(FakeTransaction(self.client.rows), query, parameters)
+
+    async def execute_write(self, work, query, parameters):
+        return await work(FakeTransaction([]), query, parameters)
+
+    async def last_bookmarks(self):
+        raise AssertionError("no causal session in these tests")
+
+
+class FakeDriverClient(Neo4jClient):
+    def __init__(self) -> None:
+        super().__init__(uri="bolt://fake:7687")
+        self.result_cache = QueryResultCache()
+        self.query_metrics.profile_sample_rate = 0
+        self.rows = [{"total": 3, "high_sev": 1}]
+        self.reads = 0
+        self.read_gate = asyncio.Event()
+        self.read_gate.set()
+
+    @asynccontextmanager
+    async def session(self, **config):
+        yield FakeSession(self)
+
+
+IOC = {
+    "value": "203.0.113.7", "type": "ip", "severity": "high", "source": "test", "risk_factors": [],
+    "first_seen": None, "last_updated": None, "context": "",
+}
+
+
+def test_repeat_reads_are_served_from_the_cache():
+    async def scenario():
+        client = FakeDriverClient()
+        assert await client.get_threat_intel_counts() == {"total": 3, "high_sev": 1}
+        client.rows = [{"total": 4, "high_sev": 1}]
+
+        assert await client.get_threat_intel_counts() == {"total": 3, "high_sev": 1}
+        assert client.reads == 1
+
+    asyncio.run(scenario())
+
+
+def test_write_to_a_read_label_invalidates_other_labels_do_not():
+    async def scenario():
+        client = FakeDriverClient()
+        await client.get_threat_intel_counts()
+
+        await client.write("MATCH (alert:Alert {id: $id}) SET alert.status = 'closed'", {"id": "ALERT-1"})
+        await client.get_threat_intel_counts()
+        assert client.reads == 1  # Alert is not read by the counts query
+
+        await client.merge_threat_intel(IOC)
+        client.rows = [{"total": 4, "high_sev": 2}]
+        assert await client.get_threat_intel_counts() == {"total": 4, "high_sev": 2}
+        assert client.reads == 2
+
+    asyncio.run(scenario())
+
+
+def test_read_overlapping_a_write_is_not_stored():
+    async def scenario():
+        client = FakeDriverClient()
+        client.read_gate.clear()
+        read = asyncio.create_task(client.get_threat_intel_counts())
+        await asyncio.sleep(0)  # the read is in flight
+
+        await client.merge_threat_intel(IOC)
+        client.read_gate.set()
+        await read
+
+        assert client.result_cache.stats()["skipped_puts"] == 1
+        await client.get_threat_intel_counts()
+        assert client.reads == 2
+
+    asyncio.run(scenario())
+
+
+def test_uncached_reads_always_reach_the_graph():
+    async def scenario():
+        client = FakeDriverClient()
+        await client.read_named("threat_intel_counts")
+        await client.read_named("threat_intel_counts")
+        assert client.reads == 2
+        assert client.result_cache.stats()["size"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+"""
+Tests for the write-behind queue (app/db/write_behind.py).
+
+The queue runs its flusher over an in-memory graph; a flaky subclass makes
+decision-trace writes fail to exercise retry, dead letters and requeue.
+
+Run from backend/:  python -m pytest -q test_write_behind.py
+"""
+import asyncio
+
+from neo4j.exceptions import ClientError, ServiceUnavailable
+
+import app.db.neo4j  # noqa: F401  (import order: memory_graph subclasses Neo4jClient)
+from app.db.memory_graph import InMemoryGraphClient
+from app.db.write_behind import WriteBehindQueue
+from app.services.precedents import precedent_index
+
+
+ALERT_ID = "ALERT-7823"
+
+
+class FlakyGraphClient(InMemoryGraphClient):
+    """Decision-trace writes raise `error` for the next `failures` calls."""
+
+    def __init__(self, failures: int = 0, error: Exception = ServiceUnavailable("graph down")) -> None:
+        super().__init__()
+        self.failures = failures
+        self.error = error
+
+    async def create_decision_traces(self, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise self.error
+        return await super().create_decision_traces(rows)
+
+
+def run(coro):
+    try:
+        return asyncio.run(coro)
+    finally:
+        precedent_index.clear()
+
+
+async def started_queue(client: InMemoryGraphClient, **options) -> WriteBehindQueue:
+    await client.connect()
+    queue = WriteBehindQueue(client, flush_interval=60, retry_backoff=0.0, **options)
+    await queue.start()
+    return queue
+
+
+async def submit_decision_with_event(queue: WriteBehindQueue, decision_id: str) -> None:
+    await queue.submit_decision_trace(
+        decision_id=decision_id, alert_id=ALERT_ID, action="false_positive_close", confidence=0.9,
+        reasoning="", pattern_id=None, playbook_id=None, nodes_consulted=1, context_snapshot={},
+    )
+    await queue.submit_evolution_event(
+        event_id=f"EVO-{decision_id}", event_type="pattern_confidence", triggered_by=decision_id,
+        before_state={"confidence": 0.9}, after_state={"confidence": 0.91},
+        description="", impact="", magnitude=0.01,
+    )
+
+
+def event_ids(client: InMemoryGraphClient):
+    return {client.graph.raw_props(nid)["id"] for nid in client.graph.nodes("EvolutionEvent")}
+
+
+def test_stop_drains_everything_still_queued():
+    async def scenario():
+        client = InMemoryGraphClient()
+        queue = await started_queue(client)
+        for number in range(5):
+            await submit_decision_with_event(queue, f"DEC-T-{number}")
+        assert queue.stats()["depth"] == 10  # flush interval not reached
+
+        await queue.stop()
+
+        assert queue.stats()["written"] == 10
+        assert {f"EVO-DEC-T-{number}" for number in range(5)} <= event_ids(client)
+
+    run(scenario())
+
+
+def test_unavailable_graph_is_retried_with_backoff():
+    async def scenario():
+        client = FlakyGraphClient(failures=2)
+        queue = await started_queue(client, max_attempts=3)
+        await submit_decision_with_event(queue, "DEC-T-R")
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["retries"] == 2
+        assert stats["written"] == 2 and stats["dead_letters"] == 0
+        assert "EVO-DEC-T-R" in event_ids(client)
+
+    run(scenario())
+
+
+def test_failed_trace_dead_letters_its_event_and_requeues_both():
+    async def scenario():
+        client = FlakyGraphClient(failures=2)
+        queue = await started_queue(client, max_attempts=2)
+        await submit_decision_with_event(queue, "DEC-T-D")
+        await queue.flush()
+
+        # Trace failed every attempt; its event was held back rather than written without it
+        stats = queue.stats()
+        assert stats["dead_letters"] == 2 and stats["written"] == 0
+        assert "EVO-DEC-T-D" not in event_ids(client)
+
+        # The next flush writes the requeued rows ahead of its own
+        await submit_decision_with_event(queue, "DEC-T-E")
+        await queue.stop()
+        assert queue.stats()["dead_letters"] == 0
+        assert {"EVO-DEC-T-D", "EVO-DEC-T-E"} <= event_ids(client)
+
+    run(scenario())
+
+
+def test_client_errors_are_kept_not_retried():
+    async def scenario():
+        client = FlakyGraphClient(failures=1, error=ClientError("bad row"))
+        queue = await started_queue(client, max_attempts=3)
+        await submit_decision_with_event(queue, "DEC-T-C")
+        await queue.stop()
+
+        stats = queue.stats()
+        assert stats["retries"] == 0
+        assert stats["dead_letters"] == 2  # kept for inspection, not requeued
+
+    run(scenario())
@@ -15,7 +15,7 @@ import {
   TrendingDown,
   RefreshCw,
 } from 'lucide-react'
-import { getAlerts, analyzeAlert, executeAction, resetAlerts, checkPolicyConflict, refreshThreatIntel, getDecisionFactors } from '../../lib/api'
+import { ApiError, getAlerts, analyzeAlert, executeAction, resetAlerts, checkPolicyConflict, refreshThreatIntel, getDecisionFactors } from '../../lib/api'
 import { domainConfig } from '../../lib/domain'
 import OutcomeFeedback from '../OutcomeFeedback'
 import PolicyConflict from '../PolicyConflict'
@@ -67,6 +67,7 @@ interface AnalysisResult {
     nodes: GraphNode[]
     relationships: GraphRelationship[]
   }
+  analysis_token?: string
   situation_analysis?: {
     situation_type: string
     situation_confidence: number
@@ -160,6 +161,7 @@ export default function AlertTriageTab() {
   const [closedLoop, setClosedLoop] = useState<ClosedLoopResult | null>(null)
   const [loading, setLoading] = useState(false)
   const [executing, setExecuting] = useState(false)
+  const [executeError, setExecuteError] = useState<string | null>(null)
   const [activeStep, setActiveStep] = useState(0)
   const [resetting, setResetting] = useState(false)
   const [policyResolution, setPolicyResolution] = useState<PolicyResolutionData | null>(null)
@@ -251,6 +253,7 @@ export default function AlertTriageTab() {
     setLoading(true)
     setAnalysis(null)
     setClosedLoop(null)
+    setExecuteError(null)
     setActiveStep(0)
     setPolicyResolution(null)
     setDecisionFactors(null)
@@ -282,9 +285,10 @@ export default function AlertTriageTab() {
 
     setExecuting(true)
     setClosedLoop(null)
+    setExecuteError(null)
 
     try {
-      const data = await executeAction(selectedAlert.id)
+      const data = await executeAction(selectedAlert.id, analysis.analysis_token)
       setClosedLoop(data)
 
       // Preserve feedback panel visibility when queue reloads
@@ -299,6 +303,13 @@ export default function AlertTriageTab() {
       timerIdsRef.current.push(setTimeout(loadAlertQueue, 3200))
     } catch (error) {
       console.error('Failed to execute action:', error)
+      if (error instanceof ApiError && error.status === 409) {
+        // Analysis token expired or already used: re-analyze so the next click commits a fresh one
+        await analyzeAlertHandler(selectedAlert)
+        setExecuteError('This analysis expired or was already applied. The alert was re-analyzed — review and apply again.')
+      } else {
+        setExecuteError(error instanceof Error ? error.message : 'Failed to execute action')
+      }
     } finally {
       timerIdsRef.current.push(setTimeout(() => setExecuting(false), 3200))
     }
@@ -897,6 +908,13 @@ export default function AlertTriageTab() {
                     ? 'Apply Policy Resolution'
                     : 'Apply Recommendation'}
                 </button>
+
+                {executeError && (
+                  <div className="flex items-start gap-2 text-sm text-red-300 bg-red-500/10 border border-red-500/50 rounded-lg p-3">
+                    <AlertCircle className="w-4 h-4 mt-0.5 flex-shrink-0" />
+                    <span>{executeError}</span>
+                  </div>
+                )}
               </div>
             </div>
           )}
@@ -5,6 +5,17 @@
 
 const API_BASE = '/api'
 
+// Non-2xx response; status lets callers react to specific codes (e.g. 409)
+export class ApiError extends Error {
+  constructor(message: string, public status: number) {
+    super(message)
+    this.name = 'ApiError'
+  }
+}
+
+// Causal bookmark token: echoed back so reads after our own writes see them
+let graphBookmark: string | null = null
+
 async function fetchJSON<T>(url: string, options?: RequestInit): Promise<T> {
   const fullUrl = `${API_BASE}${url}`
   console.log(`[API] Fetching: ${fullUrl}`)
@@ -13,14 +24,16 @@ async function fetchJSON<T>(url: string, options?: RequestInit): Promise<T> {
     ...options,
     headers: {
       'Content-Type': 'application/json',
+      ...(graphBookmark ? { 'X-Graph-Bookmark': graphBookmark } : {}),
       ...options?.headers,
     },
   })
 
   console.log(`[API] Response status: ${response.status} ${response.statusText}`)
+  graphBookmark = response.headers.get('X-Graph-Bookmark') ?? graphBookmark
 
   if (!response.ok) {
-    throw new Error(`API error: ${response.statusText}`)
+    throw new ApiError(`API error: ${response.statusText}`, response.status)
   }
 
   const data = await response.json()
@@ -96,10 +109,10 @@ export async function analyzeAlert(alertId: string) {
   })
 }
 
-export async function executeAction(alertId: string) {
+export async function executeAction(alertId: string, analysisToken?: string) {
   return fetchJSON('/action/execute', {
     method: 'POST',
-    body: JSON.stringify({ alert_id: alertId }),
+    body: JSON.stringify({ alert_id: alertId, analysis_token: analysisToken }),
   })
 }
 